@@ -1,105 +1,307 @@
 import argparse
-import csv
-from functools import partial
-import re
+import random
+import tempfile
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
-import sys
 import time
-from typing import Iterable, List, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+import attr
+from alignment.sequence import EncodedSequence
 from alignment.vocabulary import Vocabulary
+from pydash import chunk
 from tqdm import tqdm
 
-from ebl.alignment.application.align import align
+from ebl.alignment.application.align import (
+    ALIGNMENT_FIELDS,
+    align_fragment_and_chapter,
+    align_pair,
+    has_clear_signs,
+    load_chapters,
+    to_dict,
+)
+from ebl.alignment.application.alignment_job import (
+    AlignmentStatistics,
+    Checkpoint,
+    Shard,
+    create_writer,
+)
+from ebl.alignment.domain.global_aligner import AffineGlobalAligner, find_diagonal
 from ebl.alignment.domain.result import AlignmentResult
-from ebl.alignment.domain.sequence import NamedSequence
+from ebl.alignment.domain.scoring import EblScoring
+from ebl.alignment.domain.seed_index import SeedIndex
+from ebl.alignment.domain.sequence import NamedSequence, make_sequence
+from ebl.alignment.domain.sequence_table import SequenceTable
 from ebl.app import create_context
 from ebl.context import Context
-from ebl.corpus.domain.chapter import ChapterId, Chapter
+from ebl.corpus.domain.chapter import Chapter
 from ebl.corpus.domain.text import Text
 from ebl.fragmentarium.domain.fragment import Fragment
 from ebl.transliteration.domain.museum_number import MuseumNumber
 
+ManuscriptKey = Tuple[int, int]
 
-def has_clear_signs(signs: str) -> bool:
-    return not re.fullmatch(r"[X\\n\s]*", signs)
 
+@attr.s(auto_attribs=True, frozen=True)
+class Prefilter:
+    index: SeedIndex[ManuscriptKey]
+    min_seeds: int
+    top: Optional[int] = None
 
-def align_fragment_and_chapter(
-    fragment: Fragment, chapter: Chapter
-) -> List[AlignmentResult]:
-    vocabulary = Vocabulary()
-    fragment_sequence = NamedSequence.of_fragment(fragment, vocabulary)
+    @staticmethod
+    def create(
+        chapters: Sequence[Tuple[Text, Chapter]],
+        seed_length: int,
+        min_seeds: int,
+        top: Optional[int] = None,
+    ) -> "Prefilter":
+        index: SeedIndex[ManuscriptKey] = SeedIndex(seed_length)
+        for chapter_index, (_, chapter) in enumerate(chapters):
+            for manuscript_index, signs in enumerate(chapter.signs):
+                if signs is not None and has_clear_signs(signs):
+                    index.add((chapter_index, manuscript_index), signs)
+        return Prefilter(index, min_seeds, top)
 
-    pairs = [
-        (
-            fragment_sequence,
-            NamedSequence.of_signs(
-                chapter.manuscripts[index].siglum, signs, vocabulary
+    def select(self, signs: str) -> Dict[int, Set[int]]:
+        candidates: Dict[int, Set[int]] = {}
+        for chapter_index, manuscript_index in self.index.find_candidates(
+            signs, self.min_seeds, self.top
+        ):
+            candidates.setdefault(chapter_index, set()).add(manuscript_index)
+        return candidates
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class EncodedCorpus:
+    vocabulary: Vocabulary
+    keys: Sequence[ManuscriptKey]
+    sequences: SequenceTable
+    aligner: AffineGlobalAligner
+
+    @staticmethod
+    def create(
+        chapters: Sequence[Tuple[Text, Chapter]], fragment_signs: Iterable[str]
+    ) -> "EncodedCorpus":
+        vocabulary = Vocabulary()
+        for signs in fragment_signs:
+            vocabulary.encodeSequence(make_sequence(signs))
+        keys = [
+            (chapter_index, manuscript_index)
+            for chapter_index, (_, chapter) in enumerate(chapters)
+            for manuscript_index, signs in enumerate(chapter.signs)
+            if signs is not None and has_clear_signs(signs)
+        ]
+        sequences = SequenceTable.of_sequences(
+            vocabulary.encodeSequence(
+                make_sequence(chapters[chapter_index][1].signs[manuscript_index])
+            )
+            for chapter_index, manuscript_index in keys
+        )
+        aligner = AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
+        return EncodedCorpus(vocabulary, keys, sequences, aligner)
+
+    @staticmethod
+    def load(
+        directory: Path, vocabulary: Vocabulary, keys: Sequence[ManuscriptKey]
+    ) -> "EncodedCorpus":
+        return EncodedCorpus(
+            vocabulary,
+            keys,
+            SequenceTable.load(directory),
+            AffineGlobalAligner.load(directory),
+        )
+
+    def save(self, directory: Path) -> None:
+        self.sequences.save(directory)
+        self.aligner.save(directory)
+
+    def encode(self, signs: str) -> Optional[EncodedSequence]:
+        sequence = make_sequence(signs)
+        return (
+            self.vocabulary.encodeSequence(sequence)
+            if all(self.vocabulary.has(element) for element in sequence)
+            else None
+        )
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class FragmentAligner:
+    chapters: Sequence[Tuple[Text, Chapter]]
+    corpus: EncodedCorpus
+    max_lines: int
+    min_score: int
+    prefilter: Optional[Prefilter] = None
+    band_width: Optional[int] = None
+
+    def align(self, fragment: Fragment) -> List[dict]:
+        return self.align_with_statistics(fragment)[0]
+
+    def align_with_statistics(
+        self, fragment: Fragment
+    ) -> Tuple[List[dict], AlignmentStatistics]:
+        if fragment.text.number_of_lines > self.max_lines:
+            return [], AlignmentStatistics()
+
+        sequence = self.corpus.encode(fragment.signs)
+        candidates = (
+            None if self.prefilter is None else self.prefilter.select(fragment.signs)
+        )
+        results, statistics = (
+            (self._align_unencoded(fragment, candidates), AlignmentStatistics())
+            if sequence is None
+            else self._align_encoded(
+                NamedSequence(fragment.number, sequence), candidates
+            )
+        )
+        return [
+            to_dict(fragment, *self.chapters[chapter_index], result)
+            for chapter_index, result in sorted(
+                results, key=lambda entry: (entry[0], -entry[1].score)
+            )
+            if result.score >= self.min_score
+        ], statistics
+
+    def _align_encoded(
+        self, fragment: NamedSequence, candidates: Optional[Dict[int, Set[int]]]
+    ) -> Tuple[List[Tuple[int, AlignmentResult]], AlignmentStatistics]:
+        results = []
+        statistics = AlignmentStatistics()
+        for index, (chapter_index, manuscript_index) in enumerate(self.corpus.keys):
+            if candidates is None or manuscript_index in candidates.get(
+                chapter_index, set()
+            ):
+                manuscript = NamedSequence(
+                    self.chapters[chapter_index][1]
+                    .manuscripts[manuscript_index]
+                    .siglum,
+                    self.corpus.sequences[index],
+                )
+                result, pair_statistics = self._score_pair(fragment, manuscript)
+                statistics = statistics + pair_statistics
+                if result is not None:
+                    results.append((chapter_index, result))
+        return results, statistics
+
+    def _score_pair(
+        self, fragment: NamedSequence, manuscript: NamedSequence
+    ) -> Tuple[Optional[AlignmentResult], AlignmentStatistics]:
+        aligner = self.corpus.aligner
+        cells = len(fragment.sequence) * len(manuscript.sequence)
+        if aligner.upper_bound(fragment.sequence, manuscript.sequence) < self.min_score:
+            return None, AlignmentStatistics(pairs=1, skipped=1, cells=cells)
+
+        banded = self._create_band(fragment, manuscript)
+        target = banded or manuscript
+        start = time.perf_counter()
+        score = aligner.score_above(fragment.sequence, target.sequence, self.min_score)
+        seconds = time.perf_counter() - start
+        statistics = AlignmentStatistics(
+            pairs=1,
+            terminated=int(score is None),
+            banded=int(banded is not None),
+            cells=cells,
+            aligned_cells=(
+                0 if score is None else len(fragment.sequence) * len(target.sequence)
             ),
+            aligned_seconds=0.0 if score is None else seconds,
+            seconds=seconds,
+        )
+        return (
+            None
+            if score is None
+            else align_pair(fragment, target, self.corpus.vocabulary, aligner)
+        ), statistics
+
+    def _create_band(
+        self, fragment: NamedSequence, manuscript: NamedSequence
+    ) -> Optional[NamedSequence]:
+        if self.band_width is None or self.prefilter is None:
+            return None
+        diagonal = find_diagonal(
+            fragment.sequence, manuscript.sequence, self.prefilter.index.length
+        )
+        if diagonal is None:
+            return None
+        start = max(0, diagonal - self.band_width)
+        end = diagonal + len(fragment.sequence) + self.band_width
+        return (
+            NamedSequence(
+                manuscript.name, EncodedSequence(manuscript.sequence[start:end])
+            )
+            if start > 0 or end < len(manuscript.sequence)
+            else None
         )
-        for index, signs in enumerate(chapter.signs)
-        if signs is not None and has_clear_signs(signs)
-    ]
 
-    return align(pairs, vocabulary)
+    def _align_unencoded(
+        self, fragment: Fragment, candidates: Optional[Dict[int, Set[int]]]
+    ) -> List[Tuple[int, AlignmentResult]]:
+        return [
+            (index, result)
+            for index, (_, chapter) in enumerate(self.chapters)
+            if candidates is None or index in candidates
+            for result in align_fragment_and_chapter(
+                fragment,
+                chapter,
+                self.min_score,
+                None if candidates is None else candidates[index],
+            )
+        ]
 
 
-def to_dict(
-    fragment: Fragment, text: Text, chapter: Chapter, result: AlignmentResult
-) -> dict:
-    common = {
-        "fragment": result.a.name,
-        "manuscript": result.b.name,
-        "text id": text.id,
-        "text name": text.name,
-        "chapter": f"{chapter.stage.abbreviation} {chapter.name}",
-        "notes": fragment.notes,
-    }
-    if not result.alignments:
-        return {**common, "score": result.score}
-    alignment = result.alignments[0]
-    return {
-        **common,
-        "score": alignment.score,
-        "preserved identity": round(alignment.percentPreservedIdentity(), 2),
-        "preserved similarity": round(alignment.percentPreservedSimilarity(), 2),
-    }
+_context: Optional[Context] = None
+_fragment_aligner: Optional[FragmentAligner] = None
 
 
-def align_fragment(
-    number: MuseumNumber,
-    chapters: Iterable[Tuple[Text, Chapter]],
+def initialize_worker(
+    directory: str,
+    vocabulary: Vocabulary,
+    keys: Sequence[ManuscriptKey],
+    chapters: Sequence[Tuple[Text, Chapter]],
     max_lines: int,
     min_score: int,
-) -> List[dict]:
-    sys.setrecursionlimit(50000)
-    context = create_context()
-    fragment = context.fragment_repository.query_by_museum_number(number)
-
-    return (
-        [
-            to_dict(fragment, text, chapter, result)
-            for (text, chapter) in chapters
-            for result in align_fragment_and_chapter(fragment, chapter)
-            if result.score >= min_score
-        ]
-        if fragment.text.number_of_lines <= max_lines
-        else []
+    prefilter: Optional[Prefilter],
+    band_width: Optional[int],
+) -> None:
+    global _context, _fragment_aligner
+    _context = create_context()
+    _fragment_aligner = FragmentAligner(
+        chapters,
+        EncodedCorpus.load(Path(directory), vocabulary, keys),
+        max_lines,
+        min_score,
+        prefilter,
+        band_width,
     )
 
 
-def load_chapters(context: Context) -> List[Tuple[Text, Chapter]]:
-    texts = context.text_repository
-    return [
-        (text, chapter)
-        for (text, chapter) in (
-            (text, texts.find_chapter(ChapterId(text.id, listing.stage, listing.name)))
-            for text in texts.list()
-            for listing in text.chapters
+def align_fragments(
+    numbers: Sequence[MuseumNumber],
+) -> Tuple[List[dict], AlignmentStatistics]:
+    if _context is None or _fragment_aligner is None:
+        raise RuntimeError("The worker has not been initialized.")
+    rows: List[dict] = []
+    statistics = AlignmentStatistics()
+    for fragment in _context.fragment_repository.query_by_museum_numbers(
+        numbers, ALIGNMENT_FIELDS
+    ):
+        fragment_rows, fragment_statistics = _fragment_aligner.align_with_statistics(
+            fragment
         )
-        if any(chapter.signs)
-    ]
+        rows.extend(fragment_rows)
+        statistics = statistics + fragment_statistics
+    return rows, statistics
+
+
+def measure_recall(fragments: Sequence[Fragment], aligner: FragmentAligner) -> float:
+    def to_keys(aligner: FragmentAligner) -> Set[Tuple[str, ...]]:
+        return {
+            (row["fragment"], row["text id"], row["chapter"], row["manuscript"])
+            for fragment in fragments
+            for row in aligner.align(fragment)
+        }
+
+    exhaustive = to_keys(attr.evolve(aligner, prefilter=None))
+    return len(exhaustive & to_keys(aligner)) / len(exhaustive) if exhaustive else 1
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -124,6 +326,45 @@ def parse_arguments() -> argparse.Namespace:
         default=10,
         help="Maximum size of fragment to align.",
     )
+    parser.add_argument(
+        "--seedLength",
+        dest="seed_length",
+        type=int,
+        default=3,
+        help="Length of the sign n-grams used to prefilter manuscripts. "
+        "Use 0 to align against all manuscripts.",
+    )
+    parser.add_argument(
+        "--minSeeds",
+        dest="min_seeds",
+        type=int,
+        default=2,
+        help="Minimum number of shared n-grams to align a manuscript.",
+    )
+    parser.add_argument(
+        "--topN",
+        dest="top",
+        type=int,
+        default=5,
+        help="Number of best prefiltered manuscripts to align regardless of "
+        "--minSeeds.",
+    )
+    parser.add_argument(
+        "--recallSample",
+        dest="recall_sample",
+        type=int,
+        default=0,
+        help="Number of fragments used to measure the recall of the prefilter "
+        "against aligning all manuscripts.",
+    )
+    parser.add_argument(
+        "--bandWidth",
+        dest="band_width",
+        type=int,
+        default=None,
+        help="Align only within this distance of the diagonal of the shared "
+        "n-grams. Aligns the full manuscripts if not given.",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -132,13 +373,43 @@ def parse_arguments() -> argparse.Namespace:
         help="Filename for saving the results.",
     )
     parser.add_argument(
-        "-w", "--workers", default=None, help="Number of parallel workers."
+        "-f",
+        "--format",
+        dest="output_format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Format of the results. Parquet results are saved as a directory "
+        "of part files and require pyarrow.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=Shard.of,
+        default=Shard(0, 1),
+        help="Align only the fragments of shard INDEX/COUNT, e.g. 0/4.",
+    )
+    parser.add_argument(
+        "-r",
+        "--resume",
+        action="store_true",
+        default=False,
+        help="Continue from the checkpoint of an interrupted run.",
+    )
+    parser.add_argument(
+        "-b",
+        "--batchSize",
+        dest="batch_size",
+        type=int,
+        default=50,
+        help="Number of fragments fetched and aligned in one task.",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Number of parallel workers."
     )
     parser.add_argument(
         "-t",
         "--threads",
         action="store_true",
-        default=True,
+        default=False,
         help="Use threads instead of processes.",
     )
 
@@ -155,44 +426,96 @@ if __name__ == "__main__":
 
     t0 = time.time()
 
-    fragment_numbers = fragments.query_transliterated_numbers()[start:end]
-    chapters = load_chapters(context)
+    output = Path(args.output)
+    checkpoint_path = output.with_name(f"{output.name}.checkpoint.json")
+    job = {
+        "skip": args.skip,
+        "limit": args.limit,
+        "shard": str(args.shard),
+        "minScore": args.min_score,
+        "maxLines": args.max_lines,
+        "seedLength": args.seed_length,
+        "minSeeds": args.min_seeds,
+        "topN": args.top,
+        "bandWidth": args.band_width,
+        "format": args.output_format,
+    }
+    checkpoint = (Checkpoint.load(checkpoint_path) if args.resume else None) or (
+        Checkpoint(job)
+    )
+    if checkpoint.job != job:
+        raise SystemExit(
+            f"The checkpoint {checkpoint_path} was created with {checkpoint.job}."
+        )
 
-    Executor = ThreadPoolExecutor if args.threads else ProcessPoolExecutor
+    fragment_numbers = [
+        number
+        for number in fragments.query_transliterated_numbers()[start:end]
+        if args.shard.contains(number) and not checkpoint.is_done(number)
+    ]
+    chapters = load_chapters(context.text_repository)
+    prefilter = (
+        Prefilter.create(chapters, args.seed_length, args.min_seeds, args.top)
+        if args.seed_length > 0
+        else None
+    )
 
-    with Executor(max_workers=args.workers) as executor, open(
-        args.output, "w", encoding="utf-8"
-    ) as file:
-        results = tqdm(
-            executor.map(
-                partial(
-                    align_fragment,
-                    chapters=chapters,
-                    max_lines=args.max_lines,
-                    min_score=args.min_score,
-                ),
-                fragment_numbers,
-            ),
-            total=len(fragment_numbers),
-        )
+    corpus = EncodedCorpus.create(
+        chapters, (fragment["signs"] for fragment in fragments.fetch_fragment_signs())
+    )
+    batches = chunk(fragment_numbers, args.batch_size)
+    writer = create_writer(args.output_format, output)
+    writer.resume(checkpoint.position)
 
-        fieldnames = [
-            "fragment",
-            "text id",
-            "text name",
-            "chapter",
-            "manuscript",
-            "score",
-            "preserved identity",
-            "preserved similarity",
-            "notes",
-        ]
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
+    Executor = ThreadPoolExecutor if args.threads else ProcessPoolExecutor
 
-        for fragment_results in results:
-            for result in fragment_results:
-                writer.writerow(result)
+    with tempfile.TemporaryDirectory() as directory:
+        corpus.save(Path(directory))
+        with Executor(
+            max_workers=args.workers,
+            initializer=initialize_worker,
+            initargs=(
+                directory,
+                corpus.vocabulary,
+                corpus.keys,
+                chapters,
+                args.max_lines,
+                args.min_score,
+                prefilter,
+                args.band_width,
+            ),
+        ) as executor:
+            results = tqdm(
+                executor.map(align_fragments, batches),
+                total=len(batches),
+            )
+            statistics = AlignmentStatistics()
+            for batch, (batch_results, batch_statistics) in zip(batches, results):
+                checkpoint = checkpoint.add(batch, writer.write(batch_results))
+                checkpoint.save(checkpoint_path)
+                statistics = statistics + batch_statistics
 
     t = time.time()
     print(f"\nTime: {round((t-t0)/60, 2)} min")
+    print(
+        f"Pairs: {statistics.pairs}, skipped by upper bound: {statistics.skipped}, "
+        f"stopped early: {statistics.terminated}, banded: {statistics.banded}"
+    )
+    print(f"Estimated alignment time saved: {round(statistics.time_saved/60, 2)} min")
+
+    if prefilter is not None and args.recall_sample > 0:
+        sample = random.Random(0).sample(
+            fragment_numbers, min(args.recall_sample, len(fragment_numbers))
+        )
+        recall = measure_recall(
+            fragments.query_by_museum_numbers(sample, ALIGNMENT_FIELDS),
+            FragmentAligner(
+                chapters,
+                corpus,
+                args.max_lines,
+                args.min_score,
+                prefilter,
+                args.band_width,
+            ),
+        )
+        print(f"Prefilter recall ({len(sample)} fragments): {round(recall, 3)}")
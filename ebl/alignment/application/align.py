@@ -1,21 +1,28 @@
-from typing import List, Tuple
+import re
+from typing import Collection, List, Optional, Tuple
 
-from alignment.sequencealigner import GlobalSequenceAligner
 from alignment.vocabulary import Vocabulary
 
+from ebl.alignment.domain.global_aligner import AffineGlobalAligner
 from ebl.alignment.domain.sequence import NamedSequence
 from ebl.alignment.domain.scoring import EblScoring
 from ebl.alignment.domain.result import AlignmentResult
+from ebl.corpus.application.text_repository import TextRepository
+from ebl.corpus.domain.chapter import Chapter, ChapterId
+from ebl.corpus.domain.text import Text
+from ebl.fragmentarium.domain.fragment import Fragment
+
+ALIGNMENT_FIELDS = ("signs", "text", "notes")
 
 
 def align_pair(
     first: NamedSequence,
     second: NamedSequence,
     vocabulary: Vocabulary,
+    aligner: Optional[AffineGlobalAligner] = None,
 ) -> AlignmentResult:
-    scoring = EblScoring(vocabulary)
-    aligner = GlobalSequenceAligner(scoring, True)
-    score, alignments = aligner.align(first.sequence, second.sequence, backtrace=True)
+    aligner = aligner or AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
+    score, alignments = aligner.align(first.sequence, second.sequence)
     return AlignmentResult(
         score,
         first,
@@ -24,11 +31,99 @@ def align_pair(
     )
 
 
+def score_pair(
+    first: NamedSequence,
+    second: NamedSequence,
+    vocabulary: Vocabulary,
+    aligner: AffineGlobalAligner,
+    min_score: int,
+) -> AlignmentResult:
+    score = aligner.score(first.sequence, second.sequence)
+    return (
+        align_pair(first, second, vocabulary, aligner)
+        if score >= min_score
+        else AlignmentResult(score, first, second, [])
+    )
+
+
 def align(
-    pairs: List[Tuple[NamedSequence, NamedSequence]], vocabulary: Vocabulary
+    pairs: List[Tuple[NamedSequence, NamedSequence]],
+    vocabulary: Vocabulary,
+    min_score: Optional[int] = None,
 ) -> List[AlignmentResult]:
+    aligner = AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
     return sorted(
-        (align_pair(first, second, vocabulary) for (first, second) in pairs),
+        (
+            (
+                align_pair(first, second, vocabulary, aligner)
+                if min_score is None
+                else score_pair(first, second, vocabulary, aligner, min_score)
+            )
+            for (first, second) in pairs
+        ),
         key=lambda result: result.score,
         reverse=True,
     )
+
+
+def has_clear_signs(signs: str) -> bool:
+    return not re.fullmatch(r"[X\\n\s]*", signs)
+
+
+def align_fragment_and_chapter(
+    fragment: Fragment,
+    chapter: Chapter,
+    min_score: Optional[int] = None,
+    manuscripts: Optional[Collection[int]] = None,
+) -> List[AlignmentResult]:
+    vocabulary = Vocabulary()
+    fragment_sequence = NamedSequence.of_fragment(fragment, vocabulary)
+
+    pairs = [
+        (
+            fragment_sequence,
+            NamedSequence.of_signs(
+                chapter.manuscripts[index].siglum, signs, vocabulary
+            ),
+        )
+        for index, signs in enumerate(chapter.signs)
+        if signs is not None
+        and has_clear_signs(signs)
+        and (manuscripts is None or index in manuscripts)
+    ]
+
+    return align(pairs, vocabulary, min_score)
+
+
+def to_dict(
+    fragment: Fragment, text: Text, chapter: Chapter, result: AlignmentResult
+) -> dict:
+    common = {
+        "fragment": result.a.name,
+        "manuscript": result.b.name,
+        "text id": text.id,
+        "text name": text.name,
+        "chapter": f"{chapter.stage.abbreviation} {chapter.name}",
+        "notes": fragment.notes,
+    }
+    if not result.alignments:
+        return {**common, "score": result.score}
+    alignment = result.alignments[0]
+    return {
+        **common,
+        "score": alignment.score,
+        "preserved identity": round(alignment.percentPreservedIdentity(), 2),
+        "preserved similarity": round(alignment.percentPreservedSimilarity(), 2),
+    }
+
+
+def load_chapters(texts: TextRepository) -> List[Tuple[Text, Chapter]]:
+    return [
+        (text, chapter)
+        for (text, chapter) in (
+            (text, texts.find_chapter(ChapterId(text.id, listing.stage, listing.name)))
+            for text in texts.list()
+            for listing in text.chapters
+        )
+        if any(chapter.signs)
+    ]
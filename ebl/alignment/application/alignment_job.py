@@ -0,0 +1,171 @@
+import csv
+import json
+import os
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import FrozenSet, Iterable, Optional, Sequence
+
+import attr
+
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+FIELDNAMES = [
+    "fragment",
+    "text id",
+    "text name",
+    "chapter",
+    "manuscript",
+    "score",
+    "preserved identity",
+    "preserved similarity",
+    "notes",
+]
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Shard:
+    index: int = attr.ib()
+    count: int = 1
+
+    @index.validator
+    def _check_index(self, _attribute, value) -> None:
+        if not 0 <= value < self.count:
+            raise ValueError(f"Invalid shard {value}/{self.count}.")
+
+    @staticmethod
+    def of(value: str) -> "Shard":
+        index, count = value.split("/")
+        return Shard(int(index), int(count))
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def contains(self, number: MuseumNumber) -> bool:
+        return zlib.crc32(str(number).encode()) % self.count == self.index
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Checkpoint:
+    job: dict
+    done: FrozenSet[str] = frozenset()
+    position: int = 0
+
+    @staticmethod
+    def load(path: Path) -> Optional["Checkpoint"]:
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return Checkpoint(data["job"], frozenset(data["done"]), data["position"])
+
+    def save(self, path: Path) -> None:
+        temporary = path.with_name(f"{path.name}.tmp")
+        temporary.write_text(
+            json.dumps(
+                {
+                    "job": self.job,
+                    "done": sorted(self.done),
+                    "position": self.position,
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(temporary, path)
+
+    def is_done(self, number: MuseumNumber) -> bool:
+        return str(number) in self.done
+
+    def add(self, numbers: Iterable[MuseumNumber], position: int) -> "Checkpoint":
+        return attr.evolve(
+            self,
+            done=self.done | {str(number) for number in numbers},
+            position=position,
+        )
+
+
+class ResultWriter(ABC):
+    @abstractmethod
+    def resume(self, position: int) -> None: ...
+
+    @abstractmethod
+    def write(self, rows: Sequence[dict]) -> int: ...
+
+
+class CsvResultWriter(ResultWriter):
+    def __init__(self, path: Path):
+        self._path = path
+
+    def resume(self, position: int) -> None:
+        with open(self._path, "a+", encoding="utf-8") as file:
+            file.truncate(position)
+        if position == 0:
+            self.write([])
+
+    def write(self, rows: Sequence[dict]) -> int:
+        with open(self._path, "a", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
+            if file.tell() == 0:
+                writer.writeheader()
+            writer.writerows(rows)
+            file.flush()
+            os.fsync(file.fileno())
+            return file.tell()
+
+
+class ParquetResultWriter(ResultWriter):
+    def __init__(self, path: Path):
+        self._path = path
+
+    def resume(self, position: int) -> None:
+        self._path.mkdir(parents=True, exist_ok=True)
+        for part in self._path.glob("part-*.parquet"):
+            if int(part.stem.split("-")[1]) >= position:
+                part.unlink()
+
+    def write(self, rows: Sequence[dict]) -> int:
+        import pyarrow
+        import pyarrow.parquet
+
+        position = len(list(self._path.glob("part-*.parquet")))
+        if rows:
+            table = pyarrow.table(
+                {name: [row.get(name) for row in rows] for name in FIELDNAMES}
+            )
+            part = self._path / f"part-{position:05d}.parquet"
+            temporary = part.with_name(f"{part.name}.tmp")
+            pyarrow.parquet.write_table(table, temporary)
+            os.replace(temporary, part)
+            position += 1
+        return position
+
+
+def create_writer(output_format: str, path: Path) -> ResultWriter:
+    return {"csv": CsvResultWriter, "parquet": ParquetResultWriter}[output_format](path)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class AlignmentStatistics:
+    pairs: int = 0
+    skipped: int = 0
+    terminated: int = 0
+    banded: int = 0
+    cells: int = 0
+    aligned_cells: int = 0
+    aligned_seconds: float = 0.0
+    seconds: float = 0.0
+
+    def __add__(self, other: "AlignmentStatistics") -> "AlignmentStatistics":
+        return AlignmentStatistics(
+            *(
+                first + second
+                for first, second in zip(attr.astuple(self), attr.astuple(other))
+            )
+        )
+
+    @property
+    def time_saved(self) -> float:
+        return (
+            self.cells * self.aligned_seconds / self.aligned_cells - self.seconds
+            if self.aligned_cells
+            else 0.0
+        )
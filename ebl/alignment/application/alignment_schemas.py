@@ -0,0 +1,31 @@
+from marshmallow import Schema, fields, post_load
+
+from ebl.alignment.domain.alignment_job import AlignmentJobStatus
+from ebl.alignment.domain.result import ChapterAlignment
+from ebl.corpus.application.id_schemas import ChapterIdSchema
+from ebl.schemas import ValueEnumField
+
+
+class ChapterAlignmentSchema(Schema):
+    chapter_id = fields.Nested(ChapterIdSchema, required=True, data_key="chapterId")
+    text_name = fields.String(required=True, data_key="textName")
+    manuscript = fields.String(required=True)
+    score = fields.Integer(required=True)
+    preserved_identity = fields.Float(
+        load_default=None, allow_none=True, data_key="preservedIdentity"
+    )
+    preserved_similarity = fields.Float(
+        load_default=None, allow_none=True, data_key="preservedSimilarity"
+    )
+
+    @post_load
+    def make_alignment(self, data, **kwargs) -> ChapterAlignment:
+        return ChapterAlignment(**data)
+
+
+class AlignmentJobSchema(Schema):
+    id = fields.String(required=True)
+    number = fields.String(required=True)
+    status = ValueEnumField(AlignmentJobStatus, required=True)
+    results = fields.Nested(ChapterAlignmentSchema, many=True, required=True)
+    error = fields.String(allow_none=True)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+import attr
+
+from ebl.alignment.application.align import (
+    ALIGNMENT_FIELDS,
+    align_fragment_and_chapter,
+    load_chapters,
+)
+from ebl.alignment.application.alignment_schemas import ChapterAlignmentSchema
+from ebl.alignment.domain.alignment_job import AlignmentJob, AlignmentJobStatus
+from ebl.alignment.domain.result import ChapterAlignment
+from ebl.cache.application.custom_cache import CustomCache
+from ebl.common.domain.scopes import Scope
+from ebl.corpus.application.text_repository import TextRepository
+from ebl.corpus.domain.chapter import Chapter
+from ebl.corpus.domain.text import Text
+from ebl.errors import NotFoundError
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.domain.fragment import Fragment
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+MAX_JOBS = 1000
+MAX_WORKERS = 2
+MIN_SCORE = 100
+
+
+def create_fingerprint(data) -> str:
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class AlignmentService:
+    def __init__(
+        self,
+        fragments: FragmentRepository,
+        texts: TextRepository,
+        cache: CustomCache,
+        executor: Executor,
+        min_score: int = MIN_SCORE,
+    ):
+        self._fragments = fragments
+        self._texts = texts
+        self._cache = cache
+        self._executor = executor
+        self._min_score = min_score
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, AlignmentJob]" = OrderedDict()
+        self._pending: Dict[str, str] = {}
+        self._corpus_lock = threading.Lock()
+        self._corpus: Tuple[Optional[int], List[Tuple[Text, Chapter]]] = (None, [])
+
+    def enqueue(self, number: MuseumNumber) -> AlignmentJob:
+        fragment = self._fragments.query_fields_by_museum_number(
+            number, ALIGNMENT_FIELDS
+        )
+        generation = self._texts.get_chapters_generation()
+        cache_key = (
+            f"alignment {number} {create_fingerprint(fragment.signs)} {generation}"
+        )
+
+        with self._lock:
+            pending = self._jobs.get(self._pending.get(cache_key, ""))
+            if pending is not None:
+                return pending
+
+            job = AlignmentJob(str(uuid.uuid4()), number)
+            if cached := self._cache.get_or_none(cache_key):
+                job = attr.evolve(
+                    job,
+                    status=AlignmentJobStatus.DONE,
+                    results=ChapterAlignmentSchema().load(cached["results"], many=True),
+                )
+            else:
+                self._pending[cache_key] = job.id
+            self._set_job(job)
+
+        if job.status == AlignmentJobStatus.QUEUED:
+            self._executor.submit(self._run, job, fragment, generation, cache_key)
+        return job
+
+    def fetch_scopes(self, number: MuseumNumber) -> List[Scope]:
+        return self._fragments.fetch_scopes(number)
+
+    def find(self, job_id: str) -> AlignmentJob:
+        with self._lock:
+            if job_id in self._jobs:
+                return self._jobs[job_id]
+        raise NotFoundError(f"Alignment job {job_id} not found.")
+
+    def _run(
+        self,
+        job: AlignmentJob,
+        fragment: Fragment,
+        generation: int,
+        cache_key: str,
+    ) -> None:
+        with self._lock:
+            self._set_job(attr.evolve(job, status=AlignmentJobStatus.RUNNING))
+        try:
+            results = self._align(fragment, generation)
+            tag = f"alignment {fragment.number}"
+            self._cache.delete_by_tag(tag)
+            self._cache.set(
+                cache_key,
+                {"results": ChapterAlignmentSchema().dump(results, many=True)},
+                [tag],
+            )
+            finished = attr.evolve(job, status=AlignmentJobStatus.DONE, results=results)
+        except Exception as error:
+            finished = attr.evolve(
+                job, status=AlignmentJobStatus.FAILED, error=str(error)
+            )
+        with self._lock:
+            self._pending.pop(cache_key, None)
+            self._set_job(finished)
+
+    def _align(self, fragment: Fragment, generation: int) -> List[ChapterAlignment]:
+        return sorted(
+            (
+                ChapterAlignment.of(text, chapter, result)
+                for text, chapter in self._load_chapters(generation)
+                for result in align_fragment_and_chapter(
+                    fragment, chapter, self._min_score
+                )
+                if result.score >= self._min_score
+            ),
+            key=lambda alignment: alignment.score,
+            reverse=True,
+        )
+
+    def _load_chapters(self, generation: int) -> List[Tuple[Text, Chapter]]:
+        with self._corpus_lock:
+            loaded_generation, chapters = self._corpus
+            if loaded_generation != generation:
+                chapters = load_chapters(self._texts)
+                self._corpus = (generation, chapters)
+            return chapters
+
+    def _set_job(self, job: AlignmentJob) -> None:
+        self._jobs[job.id] = job
+        self._jobs.move_to_end(job.id)
+        while len(self._jobs) > MAX_JOBS:
+            self._jobs.popitem(last=False)
@@ -0,0 +1,23 @@
+from enum import Enum
+from typing import Optional, Sequence
+
+import attr
+
+from ebl.alignment.domain.result import ChapterAlignment
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+
+class AlignmentJobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class AlignmentJob:
+    id: str
+    number: MuseumNumber
+    status: AlignmentJobStatus = AlignmentJobStatus.QUEUED
+    results: Sequence[ChapterAlignment] = tuple()
+    error: Optional[str] = None
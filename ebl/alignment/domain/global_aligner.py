@@ -0,0 +1,256 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy
+from alignment.sequence import EncodedSequence
+from alignment.sequencealigner import SequenceAlignment
+
+from ebl.alignment.domain.scoring import EblScoring
+
+Matrix = numpy.ndarray
+
+NEGATIVE_INFINITY = numpy.iinfo(numpy.int64).min // 2
+NGRAM_BASE = 1_000_003
+ARRAYS = ("substitution_matrix", "gap_start", "gap_extension")
+
+
+class AffineGlobalAligner:
+    """Global alignment with free end gaps and affine gap penalties.
+
+    A gap of length n costs `gapStart` of its first element plus `gapExtension`
+    of every element in the gap. Leading and trailing gaps are free. The matrix
+    is filled row by row, each row being computed with NumPy vector operations.
+    """
+
+    def __init__(
+        self,
+        substitution_matrix: Matrix,
+        gap_start: numpy.ndarray,
+        gap_extension: numpy.ndarray,
+    ):
+        self.substitution_matrix = substitution_matrix
+        self.gap_start = gap_start
+        self.gap_extension = gap_extension
+
+    @staticmethod
+    def of_scoring(scoring: EblScoring) -> "AffineGlobalAligner":
+        codes = range(len(scoring.substitution_matrix))
+        return AffineGlobalAligner(
+            scoring.substitution_matrix,
+            numpy.array([scoring.gapStart(code) for code in codes], dtype=numpy.int64),
+            numpy.array(
+                [scoring.gapExtension(code) for code in codes], dtype=numpy.int64
+            ),
+        )
+
+    @staticmethod
+    def load(directory: Path) -> "AffineGlobalAligner":
+        return AffineGlobalAligner(
+            *(numpy.load(directory / f"{name}.npy", mmap_mode="r") for name in ARRAYS)
+        )
+
+    def save(self, directory: Path) -> None:
+        for name in ARRAYS:
+            numpy.save(directory / f"{name}.npy", getattr(self, name))
+
+    def score(self, first: EncodedSequence, second: EncodedSequence) -> int:
+        return self._score(_to_array(first), _to_array(second))
+
+    def score_above(
+        self, first: EncodedSequence, second: EncodedSequence, min_score: int
+    ) -> Optional[int]:
+        """Return the score or None if it cannot reach `min_score`.
+
+        The pair is rejected before the matrix is filled if the upper bound of
+        the score is too low and the filling is stopped as soon as no path can
+        reach `min_score` anymore.
+        """
+        first_codes, second_codes = _to_array(first), _to_array(second)
+        if self._upper_bound(first_codes, second_codes) < min_score:
+            return None
+        score = self._score(first_codes, second_codes, min_score)
+        return score if score >= min_score else None
+
+    def upper_bound(self, first: EncodedSequence, second: EncodedSequence) -> int:
+        return self._upper_bound(_to_array(first), _to_array(second))
+
+    def _upper_bound(
+        self, first_codes: numpy.ndarray, second_codes: numpy.ndarray
+    ) -> int:
+        if len(first_codes) == 0 or len(second_codes) == 0:
+            return 0
+        substitutions = self.substitution_matrix[numpy.ix_(first_codes, second_codes)]
+        return int(
+            min(
+                numpy.maximum(substitutions.max(axis=1), 0).sum(),
+                numpy.maximum(substitutions.max(axis=0), 0).sum(),
+            )
+        )
+
+    def _score(
+        self,
+        first_codes: numpy.ndarray,
+        second_codes: numpy.ndarray,
+        min_score: Optional[int] = None,
+    ) -> int:
+        if len(first_codes) == 0 or len(second_codes) == 0:
+            return 0
+
+        best_remaining = numpy.maximum(
+            self.substitution_matrix[first_codes].max(axis=1), 0
+        )[::-1].cumsum()[::-1]
+        vertical = numpy.full(len(second_codes) + 1, NEGATIVE_INFINITY)
+        row = numpy.zeros(len(second_codes) + 1, dtype=numpy.int64)
+        for index in range(len(first_codes)):
+            if min_score is not None and row.max() + best_remaining[index] < min_score:
+                return int(row.max() + best_remaining[index])
+            row, vertical, _ = self._compute_row(
+                first_codes, second_codes, index, row, vertical
+            )
+        return int(row[-1])
+
+    def align(
+        self, first: EncodedSequence, second: EncodedSequence
+    ) -> Tuple[int, List[SequenceAlignment]]:
+        first_codes, second_codes = _to_array(first), _to_array(second)
+        shape = (len(first_codes) + 1, len(second_codes) + 1)
+        best = numpy.zeros(shape, dtype=numpy.int64)
+        vertical = numpy.full(shape, NEGATIVE_INFINITY)
+        horizontal = numpy.full(shape, NEGATIVE_INFINITY)
+
+        for index in range(len(first_codes)):
+            (
+                best[index + 1],
+                vertical[index + 1],
+                horizontal[index + 1],
+            ) = self._compute_row(
+                first_codes, second_codes, index, best[index], vertical[index]
+            )
+
+        alignment = self._backtrace(
+            first, second, first_codes, second_codes, best, vertical, horizontal
+        )
+        return int(best[-1, -1]), [alignment]
+
+    def _compute_row(
+        self,
+        first_codes: numpy.ndarray,
+        second_codes: numpy.ndarray,
+        index: int,
+        previous: numpy.ndarray,
+        previous_vertical: numpy.ndarray,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        element = first_codes[index]
+        is_last_row = index == len(first_codes) - 1
+
+        diagonal = previous[:-1] + self.substitution_matrix[element, second_codes]
+
+        vertical = numpy.full_like(previous, NEGATIVE_INFINITY)
+        vertical[1:] = numpy.maximum(
+            previous[1:] + self.gap_start[element] + self.gap_extension[element],
+            previous_vertical[1:] + self.gap_extension[element],
+        )
+        vertical[-1] = previous[-1]
+
+        without_horizontal = numpy.zeros_like(previous)
+        without_horizontal[1:] = numpy.maximum(diagonal, vertical[1:])
+
+        horizontal = numpy.full_like(previous, NEGATIVE_INFINITY)
+        if is_last_row:
+            horizontal[1:] = numpy.maximum.accumulate(without_horizontal[:-1])
+        else:
+            extensions = numpy.zeros_like(previous)
+            numpy.cumsum(self.gap_extension[second_codes], out=extensions[1:])
+            horizontal[1:] = extensions[1:] + numpy.maximum.accumulate(
+                without_horizontal[:-1] + self.gap_start[second_codes] - extensions[:-1]
+            )
+
+        row = numpy.maximum(without_horizontal, horizontal)
+        row[0] = 0
+        return row, vertical, horizontal
+
+    def _backtrace(
+        self,
+        first: EncodedSequence,
+        second: EncodedSequence,
+        first_codes: numpy.ndarray,
+        second_codes: numpy.ndarray,
+        best: Matrix,
+        vertical: Matrix,
+        horizontal: Matrix,
+    ) -> SequenceAlignment:
+        last_row, last_column = best.shape[0] - 1, best.shape[1] - 1
+        alignment = SequenceAlignment(
+            EncodedSequence(last_row + last_column, id=first.id),
+            EncodedSequence(last_row + last_column, id=second.id),
+        )
+        i, j, state = last_row, last_column, best
+        while i > 0 and j > 0:
+            a = int(first_codes[i - 1])
+            b = int(second_codes[j - 1])
+            current = int(state[i, j])
+            if state is best:
+                substitution = int(self.substitution_matrix[a, b])
+                if current == best[i - 1, j - 1] + substitution:
+                    alignment.push(a, b, substitution)
+                    i, j = i - 1, j - 1
+                elif current == horizontal[i, j]:
+                    state = horizontal
+                else:
+                    state = vertical
+            elif state is horizontal:
+                extended = j > 1 and current == horizontal[i, j - 1] + (
+                    0 if i == last_row else self.gap_extension[b]
+                )
+                if i != last_row:
+                    previous = horizontal if extended else best
+                    alignment.push(alignment.gap, b, current - int(previous[i, j - 1]))
+                state = horizontal if extended else best
+                j = j - 1
+            else:
+                extended = (
+                    j != last_column
+                    and i > 1
+                    and current == vertical[i - 1, j] + self.gap_extension[a]
+                )
+                if j != last_column:
+                    previous = vertical if extended else best
+                    alignment.push(a, alignment.gap, current - int(previous[i - 1, j]))
+                state = vertical if extended else best
+                i = i - 1
+
+        return alignment.reversed()
+
+
+def find_diagonal(
+    first: EncodedSequence, second: EncodedSequence, length: int
+) -> Optional[int]:
+    """Return the most common offset of the n-grams shared by the sequences."""
+    first_codes, second_codes = _to_array(first), _to_array(second)
+    if len(first_codes) < length or len(second_codes) < length:
+        return None
+
+    first_ngrams = _hash_ngrams(first_codes, length)
+    second_ngrams = _hash_ngrams(second_codes, length)
+    order = numpy.argsort(second_ngrams, kind="stable")
+    sorted_ngrams = second_ngrams[order]
+    starts = numpy.searchsorted(sorted_ngrams, first_ngrams, side="left")
+    counts = numpy.searchsorted(sorted_ngrams, first_ngrams, side="right") - starts
+    total = int(counts.sum())
+    if total == 0:
+        return None
+
+    first_positions = numpy.repeat(numpy.arange(len(first_ngrams)), counts)
+    offsets = numpy.arange(total) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    second_positions = order[numpy.repeat(starts, counts) + offsets]
+    diagonals = second_positions - first_positions + len(first_codes)
+    return int(numpy.bincount(diagonals).argmax()) - len(first_codes)
+
+
+def _hash_ngrams(codes: numpy.ndarray, length: int) -> numpy.ndarray:
+    windows = numpy.lib.stride_tricks.sliding_window_view(codes, length)
+    return (windows * (NGRAM_BASE ** numpy.arange(length))).sum(axis=1)
+
+
+def _to_array(sequence: EncodedSequence) -> numpy.ndarray:
+    return numpy.fromiter(sequence, dtype=numpy.int64, count=len(sequence))
@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Optional
 
 import attr
 from alignment.sequencealigner import SequenceAlignment
 
 from ebl.alignment.domain.sequence import NamedSequence
+from ebl.corpus.domain.chapter import Chapter, ChapterId
+from ebl.corpus.domain.text import Text
 
 
 @attr.s(auto_attribs=True, frozen=True)
@@ -12,3 +14,27 @@ class AlignmentResult:
     a: NamedSequence
     b: NamedSequence
     alignments: List[SequenceAlignment]
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ChapterAlignment:
+    chapter_id: ChapterId
+    text_name: str
+    manuscript: str
+    score: int
+    preserved_identity: Optional[float] = None
+    preserved_similarity: Optional[float] = None
+
+    @staticmethod
+    def of(text: Text, chapter: Chapter, result: AlignmentResult) -> "ChapterAlignment":
+        if not result.alignments:
+            return ChapterAlignment(chapter.id_, text.name, result.b.name, result.score)
+        alignment = result.alignments[0]
+        return ChapterAlignment(
+            chapter.id_,
+            text.name,
+            result.b.name,
+            alignment.score,
+            round(alignment.percentPreservedIdentity(), 2),
+            round(alignment.percentPreservedSimilarity(), 2),
+        )
@@ -1,4 +1,6 @@
-from typing import Callable, Generator, Tuple
+from typing import Dict, List
+
+import numpy
 from alignment.sequencealigner import Scoring, GapScoring
 from alignment.vocabulary import Vocabulary
 
@@ -54,26 +56,15 @@ curated_substitutions = frozenset(
 )
 
 
-def is_curated(first_sign: str, second_sign: str) -> bool:
-    return frozenset([first_sign, second_sign]) in curated_substitutions
-
-
-def is_variant(first_decoded: str, second_decoded: str) -> bool:
-    return VARIANT_SEPARATOR in first_decoded or VARIANT_SEPARATOR in second_decoded
-
-
 class EblScoring(GapScoring, Scoring):
     def __init__(self, vocabulary: Vocabulary):
         self.vocabulary = vocabulary
         self.line_break = vocabulary.encode(LINE_BREAK)
         self.x = vocabulary.encode(UNCLEAR_OR_UNKNOWN_SIGN)
+        self.substitution_matrix = self._create_substitution_matrix()
 
     def __call__(self, firstElement, secondElement) -> int:
-        return next(
-            score()
-            for (predicate, score) in self._get_scores(firstElement, secondElement)
-            if predicate
-        )
+        return int(self.substitution_matrix[firstElement, secondElement])
 
     def gapStart(self, element) -> int:
         return gap_start
@@ -81,47 +72,56 @@ class EblScoring(GapScoring, Scoring):
     def gapExtension(self, element) -> int:
         return break_gap_extension if element == self.line_break else gap_extension
 
-    def _get_scores(
-        self, firstElement, secondElement
-    ) -> Generator[Tuple[bool, Callable[[], int]], None, None]:
-        first_decoded = self.vocabulary.decode(firstElement)
-        second_decoded = self.vocabulary.decode(secondElement)
-
-        yield (
-            self._is_break(firstElement, secondElement),
-            lambda: self._get_break_score(firstElement, secondElement),
-        )
-        yield (
-            self._is_x(firstElement, secondElement),
-            lambda: self._get_x_score(firstElement, secondElement),
-        )
-        yield (is_curated(first_decoded, second_decoded), lambda: common_mismatch)
-        yield (
-            is_variant(first_decoded, second_decoded),
-            lambda: self._get_variant_score(first_decoded, second_decoded),
-        )
-        yield (True, lambda: match if firstElement == secondElement else mismatch)
-
-    def _is_break(self, first_element, second_element) -> bool:
-        return first_element == self.line_break or second_element == self.line_break
-
-    def _is_x(self, first_element, second_element) -> bool:
-        return first_element == self.x or second_element == self.x
-
-    def _get_break_score(self, first_element, second_element) -> int:
-        return break_match if first_element == second_element else break_mismatch
-
-    def _get_x_score(self, first_element, second_element) -> int:
-        return x_match if first_element == second_element else x_mismatch
-
-    def _get_variant_score(self, first_decoded: str, second_decoded: str) -> int:
-        result = []
-        for first_part in first_decoded.split(VARIANT_SEPARATOR):
-            for second_part in second_decoded.split(VARIANT_SEPARATOR):
-                result.append(
-                    self(
-                        self.vocabulary.encode(first_part),
-                        self.vocabulary.encode(second_part),
-                    )
-                )
-        return max(result)
+    def _create_substitution_matrix(self) -> numpy.ndarray:
+        variants = self._encode_variant_parts()
+        size = len(self.vocabulary)
+
+        matrix = numpy.full((size, size), mismatch, dtype=numpy.int32)
+        numpy.fill_diagonal(matrix, match)
+        self._set_curated_scores(matrix)
+        self._set_special_scores(matrix)
+        self._set_variant_scores(matrix, variants)
+        self._set_special_scores(matrix)
+
+        return matrix
+
+    def _encode_variant_parts(self) -> Dict[int, List[int]]:
+        return {
+            self.vocabulary.encode(element): [
+                self.vocabulary.encode(part)
+                for part in element.split(VARIANT_SEPARATOR)
+            ]
+            for element in list(self.vocabulary)
+            if VARIANT_SEPARATOR in element
+        }
+
+    def _set_curated_scores(self, matrix: numpy.ndarray) -> None:
+        for first_sign, second_sign in map(tuple, curated_substitutions):
+            if self.vocabulary.has(first_sign) and self.vocabulary.has(second_sign):
+                first = self.vocabulary.encode(first_sign)
+                second = self.vocabulary.encode(second_sign)
+                matrix[first, second] = common_mismatch
+                matrix[second, first] = common_mismatch
+
+    def _set_special_scores(self, matrix: numpy.ndarray) -> None:
+        for element, match_score, mismatch_score in [
+            (self.x, x_match, x_mismatch),
+            (self.line_break, break_match, break_mismatch),
+        ]:
+            matrix[element, :] = mismatch_score
+            matrix[:, element] = mismatch_score
+            matrix[element, element] = match_score
+
+    @staticmethod
+    def _set_variant_scores(
+        matrix: numpy.ndarray, variants: Dict[int, List[int]]
+    ) -> None:
+        if variants:
+            codes = list(variants)
+            rows = numpy.stack(
+                [matrix[parts].max(axis=0) for parts in variants.values()]
+            )
+            for code, parts in variants.items():
+                rows[:, code] = rows[:, parts].max(axis=1)
+            matrix[codes, :] = rows
+            matrix[:, codes] = rows.T
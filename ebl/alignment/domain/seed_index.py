@@ -0,0 +1,40 @@
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Generic, Hashable, Optional, Set, Tuple, TypeVar
+
+from ebl.alignment.domain.sequence import LINE_BREAK, make_sequence
+
+Seed = Tuple[str, ...]
+K = TypeVar("K", bound=Hashable)
+
+
+def create_seeds(signs: str, length: int) -> FrozenSet[Seed]:
+    elements = [element for element in make_sequence(signs) if element != LINE_BREAK]
+    return frozenset(
+        tuple(elements[index : index + length])
+        for index in range(len(elements) - length + 1)
+    )
+
+
+class SeedIndex(Generic[K]):
+    def __init__(self, length: int):
+        self.length = length
+        self._index: Dict[Seed, Set[K]] = defaultdict(set)
+
+    def add(self, key: K, signs: str) -> None:
+        for seed in create_seeds(signs, self.length):
+            self._index[seed].add(key)
+
+    def count_shared_seeds(self, signs: str) -> "Counter[K]":
+        return Counter(
+            key
+            for seed in create_seeds(signs, self.length)
+            for key in self._index.get(seed, set())
+        )
+
+    def find_candidates(
+        self, signs: str, min_seeds: int, top: Optional[int] = None
+    ) -> Set[K]:
+        counts = self.count_shared_seeds(signs)
+        return {key for key, count in counts.items() if count >= min_seeds} | {
+            key for key, _ in counts.most_common(top or 0)
+        }
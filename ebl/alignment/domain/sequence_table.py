@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import Iterable
+
+import attr
+import numpy
+from alignment.sequence import EncodedSequence
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SequenceTable:
+    codes: numpy.ndarray
+    offsets: numpy.ndarray
+
+    @staticmethod
+    def of_sequences(sequences: Iterable[EncodedSequence]) -> "SequenceTable":
+        arrays = [
+            numpy.fromiter(sequence, dtype=numpy.int32, count=len(sequence))
+            for sequence in sequences
+        ]
+        offsets = numpy.zeros(len(arrays) + 1, dtype=numpy.int64)
+        offsets[1:] = numpy.cumsum([len(array) for array in arrays])
+        codes = numpy.concatenate(arrays) if arrays else numpy.zeros(0, numpy.int32)
+        return SequenceTable(codes, offsets)
+
+    @staticmethod
+    def load(directory: Path) -> "SequenceTable":
+        return SequenceTable(
+            numpy.load(directory / "codes.npy", mmap_mode="r"),
+            numpy.load(directory / "offsets.npy", mmap_mode="r"),
+        )
+
+    def save(self, directory: Path) -> None:
+        numpy.save(directory / "codes.npy", self.codes)
+        numpy.save(directory / "offsets.npy", self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> EncodedSequence:
+        return EncodedSequence(
+            self.codes[self.offsets[index] : self.offsets[index + 1]]
+        )
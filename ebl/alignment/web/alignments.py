@@ -0,0 +1,43 @@
+import falcon
+from falcon import Request, Response
+
+from ebl.alignment.application.alignment_schemas import AlignmentJobSchema
+from ebl.alignment.application.alignment_service import AlignmentService
+from ebl.errors import NotFoundError
+from ebl.fragmentarium.web.dtos import parse_museum_number
+from ebl.users.domain.user import User
+from ebl.users.web.require_scope import require_scope
+
+
+def require_alignment_read_scope(req: Request, _resp, resource, params):
+    user: User = req.context.user
+
+    if not user.can_read_fragment(
+        resource._alignment_service.fetch_scopes(parse_museum_number(params["number"]))
+    ):
+        raise falcon.HTTPForbidden()
+
+
+class AlignmentJobsResource:
+    def __init__(self, alignment_service: AlignmentService):
+        self._alignment_service = alignment_service
+
+    @falcon.before(require_scope, "transliterate:fragments")
+    @falcon.before(require_alignment_read_scope)
+    def on_post(self, _req: Request, resp: Response, number: str) -> None:
+        job = self._alignment_service.enqueue(parse_museum_number(number))
+        resp.status = falcon.HTTP_ACCEPTED
+        resp.location = f"/fragments/{number}/alignments/{job.id}"
+        resp.media = AlignmentJobSchema().dump(job)
+
+
+class AlignmentJobResource:
+    def __init__(self, alignment_service: AlignmentService):
+        self._alignment_service = alignment_service
+
+    @falcon.before(require_alignment_read_scope)
+    def on_get(self, _req: Request, resp: Response, number: str, job_id: str) -> None:
+        job = self._alignment_service.find(job_id)
+        if job.number != parse_museum_number(number):
+            raise NotFoundError(f"Alignment job {job_id} not found.")
+        resp.media = AlignmentJobSchema().dump(job)
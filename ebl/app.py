@@ -12,11 +12,15 @@ import althaia
 import ebl.error_handler
 from ebl.bibliography.infrastructure.bibliography import MongoBibliographyRepository
 from ebl.bibliography.web.bootstrap import create_bibliography_routes
-from ebl.cache.application.cache import create_cache
+from ebl.cache.application.cache import create_cache, create_middleware
+from ebl.cache.application.cache_codec import CompressedJsonCodec
 from ebl.cache.application.custom_cache import ChapterCache
+from ebl.cache.application.lru_cache import LruCache
 from ebl.cache.infrastructure.mongo_cache_repository import MongoCacheRepository
+from ebl.cache.web.bootstrap import create_cache_routes
 from ebl.cdli.web.bootstrap import create_cdli_routes
 from ebl.changelog import Changelog
+from ebl.conditional_requests import ConditionalRequestMiddleware
 from ebl.context import Context
 from ebl.corpus.infrastructure.mongo_text_repository import MongoTextRepository
 from ebl.corpus.web.bootstrap import create_corpus_routes
@@ -52,6 +56,7 @@ from ebl.afo_register.infrastructure.mongo_afo_register_repository import (
 )
 from ebl.users.domain.user import Guest
 from ebl.users.infrastructure.auth0 import Auth0Backend
+from ebl.versions import Versions
 from ebl.fragmentarium.infrastructure.mongo_findspot_repository import (
     MongoFindspotRepository,
 )
@@ -81,7 +86,11 @@ def create_context():
     )
     guest_backend = NoneAuthBackend(Guest)
     cache = create_cache()
-    custom_cache = ChapterCache(MongoCacheRepository(database))
+    custom_cache = ChapterCache(
+        MongoCacheRepository(database),
+        LruCache(namespace="chapter_local"),
+        codec=CompressedJsonCodec(),
+    )
     return Context(
         ebl_ai_client=ebl_ai_client,
         auth_backend=MultiAuthBackend(auth_backend, guest_backend),
@@ -103,13 +112,19 @@ def create_context():
         custom_cache=custom_cache,
         cache=cache,
         parallel_line_injector=ParallelLineInjector(MongoParallelRepository(database)),
+        versions=Versions(database),
     )
 
 
 def create_api(context: Context) -> falcon.App:
     auth_middleware = FalconAuthMiddleware(context.auth_backend)
     api = falcon.App(
-        cors_enable=True, middleware=[auth_middleware, context.cache.middleware]
+        cors_enable=True,
+        middleware=[
+            auth_middleware,
+            ConditionalRequestMiddleware(context.versions),
+            create_middleware(context.cache),
+        ],
     )
     ebl.error_handler.set_up(api)
     return api
@@ -120,6 +135,7 @@ def create_app(context: Context, issuer: str = "", audience: str = ""):
 
     create_signs_routes(api, context)
     create_bibliography_routes(api, context)
+    create_cache_routes(api)
     create_cdli_routes(api)
     create_corpus_routes(api, context)
     create_dictionary_routes(api, context)
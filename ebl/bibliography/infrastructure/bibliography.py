@@ -1,60 +1,88 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set
 
 from ebl.bibliography.application.bibliography_repository import BibliographyRepository
 from ebl.bibliography.application.serialization import (
     create_mongo_entry,
     create_object_entry,
 )
+from ebl.cache.application.lru_cache import DEFAULT_GENERATION_TTL, LruCache
 from ebl.mongo_collection import MongoCollection
+from ebl.versions import Versions
 
 COLLECTION = "bibliography"
-
-
-def join_reference_documents() -> Sequence[dict]:
-    return [
-        {"$unwind": {"path": "$references", "preserveNullAndEmptyArrays": True}},
-        {
-            "$lookup": {
-                "from": "bibliography",
-                "localField": "references.id",
-                "foreignField": "_id",
-                "as": "references.document",
-            }
-        },
-        {
-            "$set": {
-                "references.document": {"$arrayElemAt": ["$references.document", 0]}
-            }
-        },
-        {
-            "$group": {
-                "_id": "$_id",
-                "references": {"$push": "$references"},
-                "root": {"$first": "$$ROOT"},
-            }
-        },
-        {
-            "$replaceRoot": {
-                "newRoot": {"$mergeObjects": ["$root", {"references": "$references"}]}
-            }
-        },
-        {
-            "$set": {
-                "references": {
-                    "$filter": {
-                        "input": "$references",
-                        "as": "reference",
-                        "cond": {"$ne": ["$$reference", {}]},
-                    }
-                }
+GENERATION_ID = "all"
+MAX_BYTES = 8 * 1024 * 1024
+
+
+def resolve_references(document: dict, entries: Mapping[str, dict]) -> dict:
+    return {
+        **document,
+        "references": [
+            (
+                {**reference, "document": entries[reference["id"]]}
+                if reference["id"] in entries
+                else reference
+            )
+            for reference in document.get("references", [])
+        ],
+    }
+
+
+class ReferenceResolver:
+    """Adds the bibliography entries to the references of documents.
+
+    The entries for a batch of documents are fetched with a single query and
+    kept in a bounded in-process cache, which is discarded whenever an entry
+    is updated. The generation of the bibliography is read at most once per
+    `generation_ttl` seconds, so updates become visible after that delay.
+    """
+
+    def __init__(
+        self,
+        database,
+        max_bytes: int = MAX_BYTES,
+        generation_ttl: float = DEFAULT_GENERATION_TTL,
+    ):
+        self._collection = MongoCollection(database, COLLECTION)
+        self._versions = Versions(database)
+        self._cache = LruCache(
+            max_bytes, namespace=COLLECTION, generation_ttl=generation_ttl
+        )
+
+    def resolve(self, documents: Iterable[dict]) -> List[dict]:
+        documents = list(documents)
+        entries = self._find_entries(
+            {
+                reference["id"]
+                for document in documents
+                for reference in document.get("references", [])
             }
-        },
-    ]
+        )
+        return [resolve_references(document, entries) for document in documents]
+
+    def resolve_one(self, document: dict) -> dict:
+        return self.resolve([document])[0]
+
+    def _find_entries(self, ids: Set[str]) -> Dict[str, dict]:
+        generation = self._cache.current_generation(
+            lambda: self._versions.find(COLLECTION, GENERATION_ID).version
+        )
+        entries = {
+            id_: entry
+            for id_ in ids
+            if (entry := self._cache.get(id_, generation)) is not None
+        }
+        if missing := [id_ for id_ in ids if id_ not in entries]:
+            for entry in self._collection.find_many({"_id": {"$in": missing}}):
+                self._cache.set(entry["_id"], entry, generation)
+                entries[entry["_id"]] = entry
+        return entries
 
 
 class MongoBibliographyRepository(BibliographyRepository):
     def __init__(self, database):
         self._collection = MongoCollection(database, COLLECTION)
+        self._versions = Versions(database)
 
     def create(self, entry) -> str:
         mongo_entry = create_mongo_entry(entry)
@@ -71,6 +99,7 @@ class MongoBibliographyRepository(BibliographyRepository):
     def update(self, entry) -> None:
         mongo_entry = create_mongo_entry(entry)
         self._collection.replace_one(mongo_entry)
+        self._versions.increment(COLLECTION, GENERATION_ID)
 
     def query_by_author_year_and_title(
         self, author: Optional[str], year: Optional[int], title: Optional[str]
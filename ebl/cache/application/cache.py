@@ -1,9 +1,13 @@
 import json
 import os
+import time
 from typing import Callable, Sequence
 
 from falcon import after, Request, Response
 from falcon_caching import Cache
+from falcon_caching.middleware import Middleware
+
+from ebl.cache.application.cache_metrics import cache_metrics
 
 
 DEFAULT_TIMEOUT: int = 600
@@ -20,6 +24,32 @@ def create_cache() -> Cache:
     return Cache(config=load_config())
 
 
+class InstrumentedMiddleware(Middleware):
+    NAMESPACE = "http"
+
+    def process_resource(self, req, resp, resource, params):
+        req.context.cache_started = time.perf_counter()
+        super().process_resource(req, resp, resource, params)
+        if getattr(req.context, "cached", False):
+            cache_metrics.hit(self.NAMESPACE)
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        is_cached = getattr(req.context, "cache", False) and not getattr(
+            req.context, "cached", False
+        )
+        if is_cached and hasattr(req.context, "cache_started"):
+            cache_metrics.miss(self.NAMESPACE)
+            cache_metrics.compute(
+                self.NAMESPACE, time.perf_counter() - req.context.cache_started
+            )
+            cache_metrics.set(self.NAMESPACE, len(resp.text or ""))
+        super().process_response(req, resp, resource, req_succeeded)
+
+
+def create_middleware(cache: Cache) -> Middleware:
+    return InstrumentedMiddleware(cache.cache, cache.config)
+
+
 def cache_control(
     directives: Sequence[str],
     when: Callable[[Request, Response], bool] = lambda _req, _resp: True,
@@ -0,0 +1,61 @@
+import json
+import zlib
+from abc import ABC, abstractmethod
+
+from ebl.cache.application.cache_metrics import get_size
+
+ENCODING = "cache_encoding"
+DATA = "cache_data"
+JSON_ZLIB = "json+zlib"
+DEFAULT_THRESHOLD = 16 * 1024
+
+
+def dump_json(item: dict) -> bytes:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class CacheCodec(ABC):
+    """Converts cached items to the documents stored by the repository."""
+
+    @abstractmethod
+    def encode(self, item: dict) -> dict: ...
+
+    def decode(self, document: dict) -> dict:
+        return (
+            json.loads(zlib.decompress(document[DATA]))
+            if document.get(ENCODING) == JSON_ZLIB
+            else document
+        )
+
+    def to_json(self, document: dict) -> bytes:
+        return (
+            zlib.decompress(document[DATA])
+            if document.get(ENCODING) == JSON_ZLIB
+            else dump_json(document)
+        )
+
+    def size(self, document: dict) -> int:
+        return (
+            len(document[DATA])
+            if document.get(ENCODING) == JSON_ZLIB
+            else get_size(document)
+        )
+
+
+class DocumentCodec(CacheCodec):
+    def encode(self, item: dict) -> dict:
+        return item
+
+
+class CompressedJsonCodec(CacheCodec):
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, level: int = 6):
+        self._threshold = threshold
+        self._level = level
+
+    def encode(self, item: dict) -> dict:
+        data = dump_json(item)
+        return (
+            {ENCODING: JSON_ZLIB, DATA: zlib.compress(data, self._level)}
+            if len(data) >= self._threshold
+            else item
+        )
@@ -0,0 +1,120 @@
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import attr
+
+
+def get_size(item: Any) -> int:
+    if isinstance(item, (bytes, str)):
+        return len(item)
+    try:
+        return len(json.dumps(item, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+@attr.s(auto_attribs=True)
+class NamespaceMetrics:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    set_bytes: int = 0
+    size_bytes: int = 0
+    computes: int = 0
+    compute_seconds: float = 0.0
+    saved_seconds: float = 0.0
+
+    @property
+    def average_compute_seconds(self) -> float:
+        return self.compute_seconds / self.computes if self.computes else 0.0
+
+
+METRICS = [
+    ("hits_total", "counter", "Cache lookups that found a value.", "hits"),
+    ("misses_total", "counter", "Cache lookups that found nothing.", "misses"),
+    ("sets_total", "counter", "Values written to the cache.", "sets"),
+    ("evictions_total", "counter", "Values evicted from the cache.", "evictions"),
+    ("set_bytes_total", "counter", "Bytes written to the cache.", "set_bytes"),
+    ("size_bytes", "gauge", "Bytes currently held by the cache.", "size_bytes"),
+    (
+        "compute_seconds_total",
+        "counter",
+        "Seconds spent computing missing values.",
+        "compute_seconds",
+    ),
+    (
+        "saved_seconds_total",
+        "counter",
+        "Estimated compute seconds saved by hits.",
+        "saved_seconds",
+    ),
+]
+
+
+class CacheMetrics:
+    """Thread-safe cache counters labelled by namespace."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, NamespaceMetrics] = defaultdict(NamespaceMetrics)
+
+    def hit(self, namespace: str) -> None:
+        with self._lock:
+            metrics = self._namespaces[namespace]
+            metrics.hits += 1
+            metrics.saved_seconds += metrics.average_compute_seconds
+
+    def miss(self, namespace: str) -> None:
+        with self._lock:
+            self._namespaces[namespace].misses += 1
+
+    def set(self, namespace: str, size: int) -> None:
+        with self._lock:
+            metrics = self._namespaces[namespace]
+            metrics.sets += 1
+            metrics.set_bytes += size
+
+    def evict(self, namespace: str, count: int = 1) -> None:
+        with self._lock:
+            self._namespaces[namespace].evictions += count
+
+    def size(self, namespace: str, size: int) -> None:
+        with self._lock:
+            self._namespaces[namespace].size_bytes = size
+
+    def compute(self, namespace: str, seconds: float) -> None:
+        with self._lock:
+            metrics = self._namespaces[namespace]
+            metrics.computes += 1
+            metrics.compute_seconds += seconds
+
+    def get(self, namespace: str) -> NamespaceMetrics:
+        with self._lock:
+            return attr.evolve(self._namespaces[namespace])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._namespaces.clear()
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            namespaces = {
+                namespace: attr.evolve(metrics)
+                for namespace, metrics in sorted(self._namespaces.items())
+            }
+        lines: List[str] = []
+        for name, type_, help_, field in METRICS:
+            lines.append(f"# HELP ebl_cache_{name} {help_}")
+            lines.append(f"# TYPE ebl_cache_{name} {type_}")
+            lines.extend(
+                f'ebl_cache_{name}{{namespace="{namespace}"}} '
+                f"{getattr(metrics, field)}"
+                for namespace, metrics in namespaces.items()
+            )
+        return "\n".join(lines) + "\n"
+
+
+cache_metrics = CacheMetrics()
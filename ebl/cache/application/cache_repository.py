@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Dict, Optional, Sequence
 
 
 class CacheRepository(ABC):
+    @abstractmethod
+    def create_indexes(self) -> None: ...
+
     @abstractmethod
     def has(self, cache_key: str) -> bool: ...
 
@@ -9,10 +13,37 @@ class CacheRepository(ABC):
     def get(self, cache_key: str) -> dict: ...
 
     @abstractmethod
-    def set(self, cache_key: str, item: dict) -> None: ...
+    def get_or_none(self, cache_key: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    def get_many(self, cache_keys: Sequence[str]) -> Dict[str, dict]: ...
+
+    @abstractmethod
+    def set(
+        self,
+        cache_key: str,
+        item: dict,
+        tags: Sequence[str] = (),
+        timeout: Optional[int] = None,
+    ) -> None: ...
+
+    @abstractmethod
+    def count(self) -> int: ...
 
     @abstractmethod
     def delete(self, cache_key: str) -> None: ...
 
     @abstractmethod
-    def delete_all(self, pattern: str) -> None: ...
+    def delete_by_tag(self, tag: str) -> None: ...
+
+    @abstractmethod
+    def get_generation(self) -> int: ...
+
+    @abstractmethod
+    def increment_generation(self) -> None: ...
+
+    @abstractmethod
+    def acquire_lease(self, cache_key: str, seconds: int) -> bool: ...
+
+    @abstractmethod
+    def release_lease(self, cache_key: str) -> None: ...
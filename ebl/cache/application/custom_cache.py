@@ -1,30 +1,266 @@
+import time
+from typing import Callable, Dict, Optional, Sequence
+
 import attr
 
+from ebl.cache.application.cache_codec import CacheCodec, DocumentCodec, dump_json
+from ebl.cache.application.cache_metrics import cache_metrics
 from ebl.cache.application.cache_repository import CacheRepository
+from ebl.cache.application.lru_cache import LruCache
+from ebl.cache.application.single_flight import SingleFlight
 from ebl.corpus.domain.chapter import ChapterId
 
+LEASE_SECONDS = 30
+LEASE_POLL_INTERVAL = 0.1
+JSON_SUFFIX = " json"
+
+_flight = SingleFlight()
+
 
 @attr.attrs(auto_attribs=True, frozen=True)
 class CustomCache:
+    NAMESPACE = "custom"
+
     _mongo_cache_repository: CacheRepository
+    _codec: CacheCodec = attr.ib(factory=DocumentCodec, kw_only=True)
+
+    def create_indexes(self) -> None:
+        self._mongo_cache_repository.create_indexes()
 
     def has(self, key: str) -> bool:
         return self._mongo_cache_repository.has(key)
 
     def get(self, key: str) -> dict:
-        return self._mongo_cache_repository.get(key)
+        return self._codec.decode(self._mongo_cache_repository.get(key))
+
+    def get_or_none(self, key: str) -> Optional[dict]:
+        document = self._find(key)
+        return None if document is None else self._codec.decode(document)
+
+    def get_json_or_none(self, key: str) -> Optional[bytes]:
+        document = self._find(key)
+        return None if document is None else self._codec.to_json(document)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, dict]:
+        documents = self._mongo_cache_repository.get_many(keys) if keys else {}
+        for key in keys:
+            if key in documents:
+                cache_metrics.hit(self.NAMESPACE)
+            else:
+                cache_metrics.miss(self.NAMESPACE)
+        return {
+            key: self._codec.decode(document) for key, document in documents.items()
+        }
+
+    def _find(self, key: str) -> Optional[dict]:
+        document = self._mongo_cache_repository.get_or_none(key)
+        if document is None:
+            cache_metrics.miss(self.NAMESPACE)
+        else:
+            cache_metrics.hit(self.NAMESPACE)
+        return document
+
+    def _load(self, key: str) -> Optional[dict]:
+        document = self._mongo_cache_repository.get_or_none(key)
+        return None if document is None else self._codec.decode(document)
+
+    def set(
+        self,
+        key: str,
+        item: dict,
+        tags: Sequence[str] = (),
+        timeout: Optional[int] = None,
+    ) -> None:
+        document = self._codec.encode(item)
+        self._mongo_cache_repository.set(key, document, tags, timeout)
+        cache_metrics.set(self.NAMESPACE, self._codec.size(document))
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], dict],
+        tags: Sequence[str] = (),
+        timeout: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+    ) -> dict:
+        """Return the cached item or compute and cache it.
+
+        Concurrent misses in this process compute the item only once. With
+        `lease_seconds` other processes wait for the process holding the
+        lease instead of computing the item too.
+        """
+        item = self.get_or_none(key)
+        if item is None:
+            item = self._compute_once(key, compute, tags, timeout, lease_seconds)
+        return item
+
+    def get_or_set_json(
+        self,
+        key: str,
+        compute: Callable[[], dict],
+        tags: Sequence[str] = (),
+        timeout: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+    ) -> bytes:
+        """Like `get_or_set` but return the item as encoded JSON."""
+        data = self.get_json_or_none(key)
+        if data is None:
+            data = dump_json(
+                self._compute_once(key, compute, tags, timeout, lease_seconds)
+            )
+        return data
+
+    def _compute_once(
+        self,
+        key: str,
+        compute: Callable[[], dict],
+        tags: Sequence[str],
+        timeout: Optional[int],
+        lease_seconds: Optional[int],
+    ) -> dict:
+        return _flight.do(
+            key, lambda: self._compute(key, compute, tags, timeout, lease_seconds)
+        )
 
-    def set(self, key: str, item: dict) -> None:
-        self._mongo_cache_repository.set(key, item)
+    def _compute(
+        self,
+        key: str,
+        compute: Callable[[], dict],
+        tags: Sequence[str],
+        timeout: Optional[int],
+        lease_seconds: Optional[int],
+    ) -> dict:
+        if lease_seconds is None:
+            return self._compute_and_set(key, compute, tags, timeout)
+
+        deadline = time.monotonic() + lease_seconds
+        while not (
+            has_lease := self._mongo_cache_repository.acquire_lease(key, lease_seconds)
+        ):
+            if item := self._load(key):
+                return item
+            if time.monotonic() > deadline:
+                break
+            time.sleep(LEASE_POLL_INTERVAL)
+        try:
+            item = self._load(key)
+            return item or self._compute_and_set(key, compute, tags, timeout)
+        finally:
+            if has_lease:
+                self._mongo_cache_repository.release_lease(key)
+
+    def _compute_and_set(
+        self,
+        key: str,
+        compute: Callable[[], dict],
+        tags: Sequence[str],
+        timeout: Optional[int],
+    ) -> dict:
+        start = time.perf_counter()
+        item = compute()
+        cache_metrics.compute(self.NAMESPACE, time.perf_counter() - start)
+        self.set(key, item, tags, timeout)
+        return item
+
+    def count(self) -> int:
+        return self._mongo_cache_repository.count()
 
     def delete(self, key: str) -> None:
         self._mongo_cache_repository.delete(key)
 
-    def delete_all(self, pattern: str) -> None:
-        self._mongo_cache_repository.delete_all(pattern)
+    def delete_by_tag(self, tag: str) -> None:
+        self._mongo_cache_repository.delete_by_tag(tag)
 
 
 @attr.attrs(auto_attribs=True, frozen=True)
 class ChapterCache(CustomCache):
+    NAMESPACE = "chapter"
+
+    _local_cache: Optional[LruCache] = None
+
+    def get_or_none(self, key: str) -> Optional[dict]:
+        if self._local_cache is None:
+            return super().get_or_none(key)
+
+        generation = self._local_cache.current_generation(
+            self._mongo_cache_repository.get_generation
+        )
+        item = self._local_cache.get(key, generation)
+        if item is None:
+            item = super().get_or_none(key)
+            if item is not None:
+                self._local_cache.set(key, item, generation)
+        return item
+
+    def get_json_or_none(self, key: str) -> Optional[bytes]:
+        if self._local_cache is None:
+            return super().get_json_or_none(key)
+
+        generation = self._local_cache.current_generation(
+            self._mongo_cache_repository.get_generation
+        )
+        local_key = f"{key}{JSON_SUFFIX}"
+        data = self._local_cache.get(local_key, generation)
+        if data is None:
+            data = super().get_json_or_none(key)
+            if data is not None:
+                self._local_cache.set(local_key, data, generation)
+        return data
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, dict]:
+        if self._local_cache is None:
+            return super().get_many(keys)
+
+        generation = self._local_cache.current_generation(
+            self._mongo_cache_repository.get_generation
+        )
+        items = {
+            key: item
+            for key in keys
+            if (item := self._local_cache.get(key, generation)) is not None
+        }
+        missing = super().get_many([key for key in keys if key not in items])
+        for key, item in missing.items():
+            self._local_cache.set(key, item, generation)
+        return {**items, **missing}
+
+    def set_chapter(
+        self,
+        chapter_id: ChapterId,
+        key: str,
+        item: dict,
+        tags: Sequence[str] = (),
+    ) -> None:
+        self.set(key, item, [str(chapter_id), *tags])
+
+    def get_or_set_chapter(
+        self,
+        chapter_id: ChapterId,
+        key: str,
+        compute: Callable[[], dict],
+        tags: Sequence[str] = (),
+    ) -> dict:
+        return self.get_or_set(
+            key, compute, [str(chapter_id), *tags], None, LEASE_SECONDS
+        )
+
+    def get_or_set_chapter_json(
+        self,
+        chapter_id: ChapterId,
+        key: str,
+        compute: Callable[[], dict],
+        tags: Sequence[str] = (),
+    ) -> bytes:
+        return self.get_or_set_json(
+            key, compute, [str(chapter_id), *tags], None, LEASE_SECONDS
+        )
+
     def delete_chapter(self, chapter_id: ChapterId) -> None:
-        self.delete_all(pattern=rf"^{str(chapter_id)}(\sline-\d+)?$")
+        self.delete_tags([str(chapter_id)])
+
+    def delete_tags(self, tags: Sequence[str]) -> None:
+        for tag in tags:
+            self.delete_by_tag(tag)
+        if self._local_cache is not None:
+            self._mongo_cache_repository.increment_generation()
+            self._local_cache.clear()
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from ebl.cache.application.cache_metrics import cache_metrics, get_size
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_GENERATION_TTL = 1.0
+
+
+class LruCache:
+    """An in-process cache of items bounded by their size in bytes.
+
+    The items are tagged with the generation of the shared cache. When the
+    generation changes the local items are discarded. The shared generation
+    is fetched at most once per `generation_ttl` seconds, so changes made by
+    other processes become visible after that delay.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        namespace: str = "local",
+        generation_ttl: float = DEFAULT_GENERATION_TTL,
+    ):
+        self._max_bytes = max_bytes
+        self._namespace = namespace
+        self._generation_ttl = generation_ttl
+        self._items: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._generation: Optional[int] = None
+        self._fetched: Optional[Tuple[int, float]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def current_generation(self, fetch: Callable[[], int]) -> int:
+        now = time.monotonic()
+        fetched = self._fetched
+        if fetched is None or now - fetched[1] >= self._generation_ttl:
+            fetched = (fetch(), now)
+            self._fetched = fetched
+        return fetched[0]
+
+    def get(self, key: str, generation: int) -> Optional[Any]:
+        with self._lock:
+            self._check_generation(generation)
+            if key not in self._items:
+                cache_metrics.miss(self._namespace)
+                return None
+            cache_metrics.hit(self._namespace)
+            self._items.move_to_end(key)
+            return self._items[key][0]
+
+    def set(self, key: str, item: Any, generation: int) -> None:
+        size = get_size(item)
+        with self._lock:
+            self._check_generation(generation)
+            self._remove(key)
+            if size <= self._max_bytes:
+                self._items[key] = (item, size)
+                self._size += size
+            while self._size > self._max_bytes:
+                self._remove(next(iter(self._items)))
+                cache_metrics.evict(self._namespace)
+            cache_metrics.size(self._namespace, self._size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+            self._generation = None
+            self._fetched = None
+            cache_metrics.size(self._namespace, 0)
+
+    def _check_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            cache_metrics.evict(self._namespace, len(self._items))
+            self._items.clear()
+            self._size = 0
+            self._generation = generation
+            cache_metrics.size(self._namespace, 0)
+
+    def _remove(self, key: str) -> None:
+        if key in self._items:
+            self._size -= self._items.pop(key)[1]
@@ -0,0 +1,95 @@
+import functools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from falcon_caching import Cache
+
+from ebl.cache.application.cache_metrics import cache_metrics, get_size
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs only one call per key at a time. Concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        future, is_leader = self._join(key)
+        if is_leader:
+            self._run(key, function, future)
+        return future.result()
+
+    def do_in_background(self, key: Hashable, function: Callable[[], Any]) -> None:
+        future, is_leader = self._join(key)
+        if is_leader:
+            threading.Thread(
+                target=self._run, args=(key, function, future), daemon=True
+            ).start()
+
+    def _join(self, key: Hashable):
+        with self._lock:
+            if key in self._calls:
+                return self._calls[key], False
+            future: Future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, function: Callable[[], T], future: Future) -> None:
+        try:
+            future.set_result(function())
+        except Exception as error:
+            future.set_exception(error)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+def memoize(
+    cache: Cache,
+    timeout: int,
+    stale_timeout: int = 0,
+    namespace: Optional[str] = None,
+):
+    """Memoize the function in the cache computing each missing value only once.
+
+    Values older than `timeout` are served for `stale_timeout` more seconds
+    while they are recomputed in the background.
+    """
+
+    def decorator(function: Callable[..., T]) -> Callable[..., T]:
+        flight = SingleFlight()
+        name = f"{function.__module__}.{function.__qualname__}"
+        metrics_namespace = namespace or function.__name__
+
+        def compute(key: str, *args, **kwargs) -> T:
+            start = time.perf_counter()
+            value = function(*args, **kwargs)
+            cache_metrics.compute(metrics_namespace, time.perf_counter() - start)
+            cache.set(
+                key,
+                {"value": value, "fresh_until": time.time() + timeout},
+                timeout=timeout + stale_timeout,
+            )
+            cache_metrics.set(metrics_namespace, get_size(value))
+            return value
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs) -> T:
+            key = f"{name}{args!r}{sorted(kwargs.items())!r}"
+            entry = cache.get(key)
+            if entry is None:
+                cache_metrics.miss(metrics_namespace)
+                return flight.do(key, lambda: compute(key, *args, **kwargs))
+            cache_metrics.hit(metrics_namespace)
+            if entry["fresh_until"] < time.time():
+                flight.do_in_background(key, lambda: compute(key, *args, **kwargs))
+            return entry["value"]
+
+        return wrapper
+
+    return decorator
@@ -1,33 +1,142 @@
+import datetime
+from contextlib import suppress
+from typing import Dict, Optional, Sequence
+
+import pymongo
 from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
 
 from ebl.cache.application.cache_repository import CacheRepository
+from ebl.errors import DuplicateError, NotFoundError
 from ebl.mongo_collection import MongoCollection
 
 
 COLLECTION = "cache"
+GENERATION_COLLECTION = "cache_generation"
+GENERATION_ID = "generation"
+LEASE_COLLECTION = "cache_lease"
+PROJECTION = {"_id": 0, "cache_key": 0, "cache_tags": 0, "cache_expires_at": 0}
+MANY_PROJECTION = {"_id": 0, "cache_tags": 0, "cache_expires_at": 0}
+
+
+def now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def query_key_is(cache_key) -> dict:
+    return {
+        "cache_key": cache_key,
+        "$or": [
+            {"cache_expires_at": None},
+            {"cache_expires_at": {"$gt": now()}},
+        ],
+    }
 
 
 class MongoCacheRepository(CacheRepository):
     def __init__(self, database: Database) -> None:
         self._collection = MongoCollection(database, COLLECTION)
+        self._generation = MongoCollection(database, GENERATION_COLLECTION)
+        self._leases = MongoCollection(database, LEASE_COLLECTION)
 
-    def has(self, cache_key: str, regex=False) -> bool:
-        return self._collection.exists(
-            {"cache_key": {"$regex": cache_key} if regex else cache_key}
+    def create_indexes(self) -> None:
+        try:
+            self._create_key_index()
+        except DuplicateKeyError:
+            self._collection.delete_many({"cache_key": {"$exists": True}})
+            self._create_key_index()
+        with suppress(NotFoundError):
+            self._collection.delete_many({"cache_tags": {"$exists": False}})
+        self._collection.create_index([("cache_tags", pymongo.ASCENDING)])
+        self._collection.create_index(
+            [("cache_expires_at", pymongo.ASCENDING)], expireAfterSeconds=0
         )
+        self._leases.create_index(
+            [("expires_at", pymongo.ASCENDING)], expireAfterSeconds=0
+        )
+
+    def _create_key_index(self) -> None:
+        self._collection.create_index([("cache_key", pymongo.ASCENDING)], unique=True)
+
+    def has(self, cache_key: str) -> bool:
+        return self._collection.exists(query_key_is(cache_key))
 
     def get(self, cache_key: str) -> dict:
-        return self._collection.find_one(
-            {"cache_key": cache_key}, projection={"cache_key": 0, "_id": 0}
+        return self._collection.find_one(query_key_is(cache_key), projection=PROJECTION)
+
+    def get_or_none(self, cache_key: str) -> Optional[dict]:
+        return next(
+            self._collection.find_many(
+                query_key_is(cache_key), projection=PROJECTION
+            ).limit(1),
+            None,
         )
 
-    def set(self, cache_key: str, item: dict) -> None:
-        self._collection.insert_one({"cache_key": cache_key, **item})
+    def get_many(self, cache_keys: Sequence[str]) -> Dict[str, dict]:
+        documents = self._collection.find_many(
+            query_key_is({"$in": list(cache_keys)}), projection=MANY_PROJECTION
+        )
+        return {document.pop("cache_key"): document for document in documents}
+
+    def set(
+        self,
+        cache_key: str,
+        item: dict,
+        tags: Sequence[str] = (),
+        timeout: Optional[int] = None,
+    ) -> None:
+        self._collection.replace_one(
+            {
+                **item,
+                "cache_key": cache_key,
+                "cache_tags": list(tags),
+                "cache_expires_at": (
+                    None
+                    if timeout is None
+                    else now() + datetime.timedelta(seconds=timeout)
+                ),
+            },
+            {"cache_key": cache_key},
+            True,
+        )
+
+    def count(self) -> int:
+        return self._collection.count_documents({})
 
     def delete(self, cache_key: str) -> None:
-        if self.has(cache_key):
+        with suppress(NotFoundError):
             self._collection.delete_one({"cache_key": cache_key})
 
-    def delete_all(self, pattern: str) -> None:
-        if self.has(pattern, regex=True):
-            self._collection.delete_many({"cache_key": {"$regex": pattern}})
+    def delete_by_tag(self, tag: str) -> None:
+        with suppress(NotFoundError):
+            self._collection.delete_many({"cache_tags": tag})
+
+    def get_generation(self) -> int:
+        return next(
+            self._generation.find_many({"_id": GENERATION_ID}).limit(1),
+            {"value": 0},
+        )["value"]
+
+    def increment_generation(self) -> None:
+        self._generation.update_many(
+            {"_id": GENERATION_ID}, {"$inc": {"value": 1}}, upsert=True
+        )
+
+    def acquire_lease(self, cache_key: str, seconds: int) -> bool:
+        expires_at = now() + datetime.timedelta(seconds=seconds)
+        try:
+            self._leases.insert_one({"_id": cache_key, "expires_at": expires_at})
+            return True
+        except DuplicateError:
+            try:
+                self._leases.update_one(
+                    {"_id": cache_key, "expires_at": {"$lte": now()}},
+                    {"$set": {"expires_at": expires_at}},
+                )
+                return True
+            except NotFoundError:
+                return False
+
+    def release_lease(self, cache_key: str) -> None:
+        with suppress(NotFoundError):
+            self._leases.delete_one({"_id": cache_key})
@@ -0,0 +1,197 @@
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import attr
+
+from ebl.app import create_context
+from ebl.cache.application.custom_cache import ChapterCache
+from ebl.corpus.application.chapter_display_cache import ChapterDisplayCache
+from ebl.corpus.application.corpus import Corpus
+from ebl.corpus.domain.chapter import ChapterId
+from ebl.corpus.web.text_utils import create_chapter_id
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.application.fragmentarium import Fragmentarium
+from ebl.fragmentarium.web.statistics import memoize_statistics
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+Task = Tuple[str, Callable[[], int]]
+
+
+class RateLimiter:
+    """Spaces calls evenly to at most `rate` per second across all threads."""
+
+    def __init__(self, rate: Optional[float] = None):
+        self._interval = 1 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + self._interval
+        time.sleep(start - now)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class WarmUpReport:
+    chapters: int = 0
+    fragments: int = 0
+    statistics: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    cache_entries: int = 0
+    errors: Sequence[str] = ()
+
+    def to_text(self) -> str:
+        return "\n".join(
+            [
+                f"Chapters: {self.chapters}",
+                f"Fragments: {self.fragments}",
+                f"Statistics: {self.statistics}",
+                f"Cached bytes: {self.bytes}",
+                f"Cache entries: {self.cache_entries}",
+                f"Duration: {self.seconds:.1f} s",
+                *(f"Error: {error}" for error in self.errors),
+            ]
+        )
+
+
+class CacheWarmer:
+    def __init__(
+        self,
+        corpus: Corpus,
+        chapter_cache: ChapterCache,
+        fragments: FragmentRepository,
+        statistics: Callable[[], Dict[str, int]],
+        workers: int = 4,
+        rate: Optional[float] = None,
+    ):
+        self._corpus = corpus
+        self._chapter_cache = chapter_cache
+        self._chapter_display_cache = ChapterDisplayCache(chapter_cache, corpus)
+        self._fragments = fragments
+        self._statistics = statistics
+        self._workers = workers
+        self._limiter = RateLimiter(rate)
+
+    def warm_up(self, numbers: Sequence[MuseumNumber] = ()) -> WarmUpReport:
+        start = time.perf_counter()
+        tasks: List[Task] = [
+            ("statistics", lambda: len(json.dumps(self._statistics()))),
+            *(
+                (f"chapter {chapter_id}", self._create_chapter_task(chapter_id))
+                for chapter_id in self._list_chapters()
+            ),
+            *(
+                (f"fragment {number}", self._create_fragment_task(number))
+                for number in numbers
+            ),
+        ]
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            results = list(executor.map(self._run, tasks))
+
+        done = [
+            name for (name, _), (size, _) in zip(tasks, results) if size is not None
+        ]
+        return WarmUpReport(
+            chapters=sum(name.startswith("chapter ") for name in done),
+            fragments=sum(name.startswith("fragment ") for name in done),
+            statistics=done.count("statistics"),
+            bytes=sum(size for size, _ in results if size is not None),
+            seconds=time.perf_counter() - start,
+            cache_entries=self._chapter_cache.count(),
+            errors=[error for _, error in results if error is not None],
+        )
+
+    def _list_chapters(self) -> List[ChapterId]:
+        return [
+            create_chapter_id(
+                str(chapter["genre"]),
+                str(chapter["category"]),
+                str(chapter["index"]),
+                str(chapter["stage"]),
+                str(chapter["chapter"]),
+            )
+            for chapter in self._corpus.list_all_chapters()
+        ]
+
+    def _create_chapter_task(self, chapter_id: ChapterId) -> Callable[[], int]:
+        return lambda: len(json.dumps(self._chapter_display_cache.find(chapter_id)))
+
+    def _create_fragment_task(self, number: MuseumNumber) -> Callable[[], int]:
+        def warm_fragment() -> int:
+            self._fragments.query_by_museum_number(number)
+            return 0
+
+        return warm_fragment
+
+    def _run(self, task: Task) -> Tuple[Optional[int], Optional[str]]:
+        name, warm = task
+        self._limiter.wait()
+        try:
+            return warm(), None
+        except Exception as error:
+            return None, f"{name}\t{error}"
+
+
+def read_numbers(path: Optional[Path]) -> List[MuseumNumber]:
+    return (
+        []
+        if path is None
+        else [
+            MuseumNumber.of(line.strip())
+            for line in path.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fill the caches for chapter displays, statistics and fragments."
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=4, help="Number of parallel workers."
+    )
+    parser.add_argument(
+        "-r",
+        "--rate",
+        type=float,
+        default=None,
+        help="Maximum number of items to warm per second. Unlimited by default.",
+    )
+    parser.add_argument(
+        "-f",
+        "--fragments",
+        type=Path,
+        default=None,
+        help="File with the numbers of popular fragments, one per line.",
+    )
+    args = parser.parse_args()
+
+    context = create_context()
+    corpus = Corpus(
+        context.text_repository,
+        context.get_bibliography(),
+        context.changelog,
+        context.sign_repository,
+        context.parallel_line_injector,
+    )
+    warmer = CacheWarmer(
+        corpus,
+        context.custom_cache,
+        context.fragment_repository,
+        memoize_statistics(context.cache, Fragmentarium(context.fragment_repository)),
+        args.workers,
+        args.rate,
+    )
+    report = warmer.warm_up(read_numbers(args.fragments))
+    print(report.to_text())
@@ -0,0 +1,8 @@
+import falcon
+
+from ebl.cache.application.cache_metrics import cache_metrics
+from ebl.cache.web.metrics import CacheMetricsResource
+
+
+def create_cache_routes(api: falcon.App) -> None:
+    api.add_route("/cache/metrics", CacheMetricsResource(cache_metrics))
@@ -0,0 +1,17 @@
+import falcon
+from falcon import Request, Response
+
+from ebl.cache.application.cache_metrics import CacheMetrics
+from ebl.users.web.require_scope import require_scope
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class CacheMetricsResource:
+    def __init__(self, metrics: CacheMetrics):
+        self._metrics = metrics
+
+    @falcon.before(require_scope, "read:metrics")
+    def on_get(self, _req: Request, resp: Response) -> None:
+        resp.content_type = CONTENT_TYPE
+        resp.text = self._metrics.to_prometheus()
@@ -26,3 +26,12 @@ class Changelog:
             user_profile, resource_type, old["_id"], list(dictdiffer.diff(old, new))
         )
         return self._collection.insert_one(entry)
+
+    def create_many(self, resource_type, user_profile, changes):
+        entries = [
+            create_entry(
+                user_profile, resource_type, old["_id"], list(dictdiffer.diff(old, new))
+            )
+            for old, new in changes
+        ]
+        return self._collection.insert_many(entries, ordered=False) if entries else []
@@ -79,3 +79,4 @@ class Scope(ScopeItem):
     READ_WORDS = ("read:words", OPEN)
     READ_TEXTS = ("read:texts", OPEN)
     WRITE_WORDS = ("write:words", RESTRICTED)
+    READ_METRICS = ("read:metrics", RESTRICTED)
@@ -0,0 +1,46 @@
+import falcon
+from falcon import Request, Response
+
+from ebl.versions import Versions
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def _get_user_scopes(req: Request) -> list:
+    user = getattr(req.context, "user", None)
+    return sorted(scope.name for scope in user.get_scopes()) if user else []
+
+
+class ConditionalRequestMiddleware:
+    """Answers conditional requests for versioned documents without loading them.
+
+    Resources opt in by implementing `get_version_id(req, params)` which
+    returns the collection and id of the document they represent. The ETag
+    is derived from the version of the document, the URI and the scopes of
+    the user, so it changes whenever the document is updated.
+    """
+
+    def __init__(self, versions: Versions):
+        self._versions = versions
+
+    def process_resource(self, req: Request, resp: Response, resource, params):
+        if req.method not in SAFE_METHODS or not hasattr(resource, "get_version_id"):
+            return
+
+        version = self._versions.find(*resource.get_version_id(req, params))
+        etag = version.create_etag(req.relative_uri, *_get_user_scopes(req))
+        req.context.etag = etag
+
+        if req.if_none_match and (
+            "*" in req.if_none_match or etag in req.if_none_match
+        ):
+            resp.etag = etag
+            resp.status = falcon.HTTP_NOT_MODIFIED
+            resp.complete = True
+
+    def process_response(
+        self, req: Request, resp: Response, _resource, req_succeeded: bool
+    ):
+        etag = getattr(req.context, "etag", None)
+        if etag and req_succeeded and falcon.http_status_to_code(resp.status) == 200:
+            resp.etag = etag
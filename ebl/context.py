@@ -25,6 +25,7 @@ from ebl.transliteration.application.sign_repository import SignRepository
 from ebl.transliteration.application.transliteration_query_factory import (
     TransliterationQueryFactory,
 )
+from ebl.versions import Versions
 from ebl.afo_register.application.afo_register_repository import AfoRegisterRepository
 from ebl.fragmentarium.infrastructure.mongo_findspot_repository import (
     MongoFindspotRepository,
@@ -53,6 +54,7 @@ class Context:
     cache: Cache
     parallel_line_injector: ParallelLineInjector
     afo_register_repository: AfoRegisterRepository
+    versions: Versions
 
     def get_bibliography(self):
         return Bibliography(self.bibliography_repository, self.changelog)
@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional, Sequence
+
+from ebl.cache.application.custom_cache import ChapterCache
+from ebl.corpus.application.corpus import Corpus
+from ebl.corpus.application.display_schemas import ChapterDisplaySchema
+from ebl.corpus.domain.chapter import ChapterId
+
+BLOCK_SIZE = 50
+
+
+def header_tag(chapter_id: ChapterId) -> str:
+    return f"{chapter_id} header"
+
+
+def block_tag(chapter_id: ChapterId, line_index: int) -> str:
+    return f"{chapter_id} block {line_index // BLOCK_SIZE}"
+
+
+def header_key(chapter_id: ChapterId) -> str:
+    return f"{chapter_id} header"
+
+
+def block_key(chapter_id: ChapterId, block: int) -> str:
+    return f"{chapter_id} lines {block}"
+
+
+def line_details_key(chapter_id: ChapterId, number: int) -> str:
+    return f"{chapter_id} line-{number}"
+
+
+class ChapterDisplayCache:
+    """Caches chapter displays as a whole and as a header with blocks of lines.
+
+    Requests for some of the lines read only the header and the blocks they
+    need. Editing lines invalidates only the header and the edited blocks.
+    """
+
+    def __init__(self, cache: ChapterCache, corpus: Corpus):
+        self._cache = cache
+        self._corpus = corpus
+
+    def find(self, chapter_id: ChapterId) -> dict:
+        return self._cache.get_or_set_chapter(
+            chapter_id,
+            str(chapter_id),
+            lambda: self._dump(chapter_id),
+            [header_tag(chapter_id)],
+        )
+
+    def find_json(self, chapter_id: ChapterId) -> bytes:
+        return self._cache.get_or_set_chapter_json(
+            chapter_id,
+            str(chapter_id),
+            lambda: self._dump(chapter_id),
+            [header_tag(chapter_id)],
+        )
+
+    def find_lines(self, chapter_id: ChapterId, lines: Sequence[int]) -> dict:
+        indexes = sorted({index for index in lines if index >= 0})
+        blocks = sorted({index // BLOCK_SIZE for index in indexes})
+        keys = [header_key(chapter_id), *(block_key(chapter_id, b) for b in blocks)]
+        entries = self._cache.get_many(keys)
+        header = entries.get(header_key(chapter_id))
+        if header is None or any(
+            block_key(chapter_id, block) not in entries
+            for block in blocks
+            if block * BLOCK_SIZE < header["numberOfLines"]
+        ):
+            entries = self._fill(chapter_id, entries)
+            header = entries[header_key(chapter_id)]
+
+        block_lines: Dict[int, List[dict]] = {
+            block: entries.get(block_key(chapter_id, block), {"lines": []})["lines"]
+            for block in blocks
+        }
+        selected = [
+            block_lines[index // BLOCK_SIZE][index % BLOCK_SIZE]
+            for index in indexes
+            if index < header["numberOfLines"]
+        ]
+        chapter = {
+            key: value for key, value in header.items() if key != "numberOfLines"
+        }
+        return {**chapter, "lines": selected}
+
+    def invalidate(
+        self, chapter_id: ChapterId, line_indexes: Optional[Sequence[int]] = None
+    ) -> None:
+        if line_indexes is None:
+            self._cache.delete_chapter(chapter_id)
+        else:
+            self._cache.delete_tags(
+                [
+                    header_tag(chapter_id),
+                    *{block_tag(chapter_id, index) for index in line_indexes},
+                ]
+            )
+
+    def _fill(self, chapter_id: ChapterId, entries: Dict[str, dict]) -> Dict[str, dict]:
+        chapter = self.find(chapter_id)
+        lines = chapter["lines"]
+        header = {
+            **{key: value for key, value in chapter.items() if key != "lines"},
+            "numberOfLines": len(lines),
+        }
+        filled = {
+            header_key(chapter_id): (header, [header_tag(chapter_id)]),
+            **{
+                block_key(chapter_id, start // BLOCK_SIZE): (
+                    {"lines": lines[start : start + BLOCK_SIZE]},
+                    [block_tag(chapter_id, start)],
+                )
+                for start in range(0, len(lines), BLOCK_SIZE)
+            },
+        }
+        for key, (entry, tags) in filled.items():
+            if key not in entries:
+                self._cache.set_chapter(chapter_id, key, entry, tags)
+        return {key: entry for key, (entry, _) in filled.items()}
+
+    def _dump(self, chapter_id: ChapterId) -> dict:
+        return ChapterDisplaySchema().dump(
+            self._corpus.find_chapter_for_display(chapter_id)
+        )
@@ -75,3 +75,7 @@ class TextRepository(ABC):
 
     @abstractmethod
     def get_all_sign_data(self) -> Sequence[dict]: ...
+
+    @abstractmethod
+    def get_chapters_generation(self) -> int:
+        """Return a counter which changes whenever a chapter is written."""
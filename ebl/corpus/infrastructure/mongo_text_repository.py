@@ -5,7 +5,7 @@ from pymongo.database import Database
 from pymongo.collation import Collation
 
 
-from ebl.bibliography.infrastructure.bibliography import join_reference_documents
+from ebl.bibliography.infrastructure.bibliography import ReferenceResolver
 from ebl.common.query.query_result import CorpusQueryResult
 from ebl.common.query.query_schemas import CorpusQueryResultSchema
 from ebl.corpus.application.text_repository import TextRepository
@@ -50,6 +50,9 @@ from ebl.transliteration.infrastructure.collections import (
     CHAPTERS_COLLECTION,
     TEXTS_COLLECTION,
 )
+from ebl.versions import Versions
+
+GENERATION_ID = "all"
 
 
 def text_not_found(id_: TextId) -> Exception:
@@ -68,6 +71,8 @@ class MongoTextRepository(TextRepository):
     def __init__(self, database: Database):
         self._texts = MongoCollection(database, TEXTS_COLLECTION)
         self._chapters = MongoCollection(database, CHAPTERS_COLLECTION)
+        self._versions = Versions(database)
+        self._references = ReferenceResolver(database)
 
     def create_indexes(self) -> None:
         self._texts.create_index(
@@ -109,6 +114,8 @@ class MongoTextRepository(TextRepository):
 
     def create_chapter(self, chapter: Chapter) -> None:
         self._chapters.insert_one(ChapterSchema().dump(chapter))
+        self._versions.increment(CHAPTERS_COLLECTION, str(chapter.id_))
+        self._versions.increment(CHAPTERS_COLLECTION, GENERATION_ID)
 
     def find(self, id_: TextId) -> Text:
         try:
@@ -122,13 +129,12 @@ class MongoTextRepository(TextRepository):
                                 "index": id_.index,
                             }
                         },
-                        *join_reference_documents(),
-                        *join_chapters(True),
                         {"$limit": 1},
+                        *join_chapters(True),
                     ]
                 )
             )
-            return TextSchema().load(mongo_text)
+            return TextSchema().load(self._references.resolve_one(mongo_text))
 
         except StopIteration as error:
             raise text_not_found(id_) from error
@@ -160,32 +166,31 @@ class MongoTextRepository(TextRepository):
             raise chapter_not_found(id_) from error
 
     def find_line(self, id_: ChapterId, number: int) -> Line:
+        if number < 0:
+            raise line_not_found(id_, number)
         try:
-            chapters = self._chapters.aggregate(
-                [
-                    {"$match": chapter_id_query(id_)},
-                    {"$unwind": "$lines"},
-                    {"$replaceRoot": {"newRoot": "$lines"}},
-                    {"$skip": number},
-                ]
+            chapter = self._chapters.find_one(
+                chapter_id_query(id_),
+                projection={"_id": False, "lines": {"$slice": [number, 1]}},
             )
-            return LineSchema().load(next(chapters))
-        except StopIteration as error:
+            return LineSchema().load(chapter["lines"][0])
+        except (NotFoundError, IndexError) as error:
             raise line_not_found(id_, number) from error
 
     def list(self) -> List[Text]:
         return TextSchema().load(
-            self._texts.aggregate(
-                [
-                    *join_reference_documents(),
-                    *join_chapters(False),
-                    {
-                        "$sort": {
-                            "category": pymongo.ASCENDING,
-                            "index": pymongo.ASCENDING,
-                        }
-                    },
-                ]
+            self._references.resolve(
+                self._texts.aggregate(
+                    [
+                        *join_chapters(False),
+                        {
+                            "$sort": {
+                                "category": pymongo.ASCENDING,
+                                "index": pymongo.ASCENDING,
+                            }
+                        },
+                    ]
+                )
             ),
             many=True,
         )
@@ -243,6 +248,11 @@ class MongoTextRepository(TextRepository):
                 ).dump(chapter)
             },
         )
+        self._versions.increment(CHAPTERS_COLLECTION, str(id_))
+        self._versions.increment(CHAPTERS_COLLECTION, GENERATION_ID)
+
+    def get_chapters_generation(self) -> int:
+        return self._versions.find(CHAPTERS_COLLECTION, GENERATION_ID).version
 
     def query_by_transliteration(
         self, query: TransliterationQuery, pagination_index: int
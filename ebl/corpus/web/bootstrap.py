@@ -38,6 +38,7 @@ def create_corpus_routes(api: falcon.App, context: Context):
         context.parallel_line_injector,
     )
     context.text_repository.create_indexes()
+    context.custom_cache.create_indexes()
 
     texts = TextsResource(corpus)
     text = TextResource(corpus)
@@ -1,6 +1,6 @@
 import json
 from collections import defaultdict
-from typing import Sequence, Optional
+from typing import Sequence
 import falcon
 from falcon_caching import Cache
 from pydash.arrays import flatten_deep
@@ -14,8 +14,8 @@ from ebl.common.query.parameter_parser import (
     parse_lines,
 )
 from ebl.common.query.query_schemas import CorpusQueryResultSchema
+from ebl.corpus.application.chapter_display_cache import ChapterDisplayCache
 from ebl.corpus.application.corpus import Corpus
-from ebl.corpus.application.display_schemas import ChapterDisplaySchema
 from ebl.corpus.application.schemas import (
     ManuscriptAttestationSchema,
 )
@@ -55,7 +55,7 @@ class ChaptersResource:
 class ChaptersDisplayResource:
     def __init__(self, corpus: Corpus, cache: ChapterCache):
         self._corpus = corpus
-        self._cache = cache
+        self._cache = ChapterDisplayCache(cache, corpus)
 
     def _create_line_variant_map(
         self, lines: Sequence[int], variants: Sequence[int]
@@ -67,28 +67,24 @@ class ChaptersDisplayResource:
 
         return line_variants
 
-    def _select_lines_and_variants(
-        self,
-        chapter: dict,
-        lines: Optional[Sequence[int]],
-        variants: Optional[Sequence[int]],
-    ):
-        if lines and variants:
-            line_variants_map = self._create_line_variant_map(lines, variants)
-
-            def get_matching_variants(variants: Sequence, line_index) -> Sequence:
-                return [variants[i] for i in line_variants_map[line_index]]
+    def _select_variants(
+        self, chapter: dict, lines: Sequence[int], variants: Sequence[int]
+    ) -> dict:
+        line_variants_map = self._create_line_variant_map(lines, variants)
 
-            chapter["lines"] = [
+        return {
+            **chapter,
+            "lines": [
                 {
                     **line,
-                    "variants": get_matching_variants(line["variants"], line_index),
+                    "variants": [
+                        line["variants"][i]
+                        for i in line_variants_map[line["originalIndex"]]
+                    ],
                 }
-                for line_index, line in enumerate(chapter["lines"])
-                if line_index in lines
-            ]
-
-        return chapter
+                for line in chapter["lines"]
+            ],
+        }
 
     def on_get(
         self,
@@ -101,21 +97,15 @@ class ChaptersDisplayResource:
         name: str,
     ) -> None:
         chapter_id = create_chapter_id(genre, category, index, stage, name)
-        chapter_id_str = str(chapter_id)
         lines = parse_lines(req.get_param_as_list("lines", default=[]))
         variants = parse_lines(req.get_param_as_list("variants", default=[]))
 
-        if self._cache.has(chapter_id_str):
-            cached_chapter = self._cache.get(chapter_id_str)
-            resp.media = self._select_lines_and_variants(
-                cached_chapter, lines, variants
-            )
+        if lines and variants:
+            chapter = self._cache.find_lines(chapter_id, lines)
+            resp.media = self._select_variants(chapter, lines, variants)
         else:
-            chapter = self._corpus.find_chapter_for_display(chapter_id)
-            dump = ChapterDisplaySchema().dump(chapter)
-            self._cache.set(chapter_id_str, dump)
-
-            resp.media = self._select_lines_and_variants(dump, lines, variants)
+            resp.content_type = falcon.MEDIA_JSON
+            resp.data = self._cache.find_json(chapter_id)
 
 
 class ChaptersByManuscriptResource:
@@ -133,9 +123,9 @@ class ChaptersByManuscriptResource:
             museum_number = MuseumNumber.of(number)
         except ValueError as error:
             raise DataError(f"Invalid museum number {number}.") from error
-        fragment = self._fragment_finder.find(museum_number)[0]
+        joins = self._fragment_finder.find_joins(museum_number)
         museum_numbers = [
-            join.museum_number for join in flatten_deep(fragment.joins.fragments)
+            join.museum_number for join in flatten_deep(joins.fragments)
         ] or [museum_number]
         manuscript_attestations = self._corpus.search_corpus_by_manuscript(
             museum_numbers
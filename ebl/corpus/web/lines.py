@@ -4,6 +4,11 @@ import falcon
 from marshmallow import Schema, fields, post_load
 
 from ebl.cache.application.custom_cache import ChapterCache
+from ebl.corpus.application.chapter_display_cache import (
+    ChapterDisplayCache,
+    block_tag,
+    line_details_key,
+)
 from ebl.corpus.application.corpus import Corpus
 from ebl.corpus.domain.line import Line
 from ebl.corpus.domain.lines_update import LinesUpdate
@@ -41,7 +46,7 @@ class LinesImportSchema(Schema):
 class LinesResource:
     def __init__(self, corpus: Corpus, cache: ChapterCache):
         self._corpus = corpus
-        self._cache = cache
+        self._cache = ChapterDisplayCache(cache, corpus)
 
     @falcon.before(require_scope, "write:texts")
     @validate(LinesUpdateSchema())
@@ -56,9 +61,17 @@ class LinesResource:
         name: str,
     ) -> None:
         chapter_id = create_chapter_id(genre, category, index, stage, name)
-        self._cache.delete_chapter(chapter_id)
+        lines_update = LinesUpdateSchema().load(req.media)
         updated_chapter = self._corpus.update_lines(
-            chapter_id, LinesUpdateSchema().load(req.media), req.context.user
+            chapter_id, lines_update, req.context.user
+        )
+        self._cache.invalidate(
+            chapter_id,
+            (
+                None
+                if lines_update.new or lines_update.deleted
+                else list(lines_update.edited)
+            ),
         )
         resp.media = ApiChapterSchema().dump(updated_chapter)
 
@@ -105,19 +118,26 @@ class LineResource:
         number: str,
     ) -> None:
         chapter_id = create_chapter_id(genre, category, index, stage, name)
-        cache_id = f"{str(chapter_id)} line-{number}"
-
-        if self._cache.has(cache_id):
-            resp.media = self._cache.get(cache_id)
-            return
-
         try:
-            line, manuscripts = self._corpus.find_line_with_manuscript_joins(
-                chapter_id, int(number)
-            )
-            line_details = LineDetailsDisplay.from_line_manuscripts(line, manuscripts)
-            dump = LineDetailsDisplaySchema().dump(line_details)
-            self._cache.set(cache_id, dump)
-            resp.media = dump
-        except (IndexError, ValueError) as error:
+            line_number = int(number)
+        except ValueError as error:
             raise NotFoundError(f"{chapter_id} line {number} not found.") from error
+
+        def find_line() -> dict:
+            try:
+                line, manuscripts = self._corpus.find_line_with_manuscript_joins(
+                    chapter_id, line_number
+                )
+            except (IndexError, ValueError) as error:
+                raise NotFoundError(f"{chapter_id} line {number} not found.") from error
+            return LineDetailsDisplaySchema().dump(
+                LineDetailsDisplay.from_line_manuscripts(line, manuscripts)
+            )
+
+        resp.content_type = falcon.MEDIA_JSON
+        resp.data = self._cache.get_or_set_chapter_json(
+            chapter_id,
+            line_details_key(chapter_id, line_number),
+            find_line,
+            [block_tag(chapter_id, line_number)],
+        )
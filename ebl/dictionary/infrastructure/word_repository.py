@@ -5,6 +5,7 @@ from ebl.dictionary.application.word_repository import WordRepository
 from ebl.dictionary.domain.word import WordId
 from ebl.mongo_collection import MongoCollection
 from ebl.common.query.query_collation import CollatedFieldQuery
+from ebl.versions import Versions
 
 COLLECTION = "words"
 LEMMA_SEARCH_LIMIT = 15
@@ -121,6 +122,7 @@ class MongoWordRepository(WordRepository):
     def __init__(self, database):
         self._collection = MongoCollection(database, COLLECTION)
         self._changelog = Changelog(database)
+        self._versions = Versions(database)
 
     def create(self, document):
         return self._collection.insert_one(document)
@@ -192,3 +194,4 @@ class MongoWordRepository(WordRepository):
 
     def update(self, word) -> None:
         self._collection.update_one({"_id": word["_id"]}, {"$set": word})
+        self._versions.increment(COLLECTION, word["_id"])
@@ -1,5 +1,8 @@
+from typing import Tuple
+
 import falcon
 
+from ebl.dictionary.application.dictionary_service import COLLECTION
 from ebl.dictionary.application.word_schema import WordSchema
 from ebl.marshmallowschema import validate
 from ebl.users.web.require_scope import require_scope
@@ -9,6 +12,9 @@ class WordsResource:
     def __init__(self, dictionary):
         self._dictionary = dictionary
 
+    def get_version_id(self, _req, params) -> Tuple[str, str]:
+        return COLLECTION, params["object_id"]
+
     def on_get(self, _req, resp, object_id):
         resp.media = self._dictionary.find(object_id)
 
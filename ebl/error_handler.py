@@ -3,7 +3,7 @@ import logging
 import falcon
 
 from ebl.dispatcher import DispatchError
-from ebl.errors import DataError, DuplicateError, NotFoundError
+from ebl.errors import ConflictError, DataError, DuplicateError, NotFoundError
 from ebl.lemmatization.domain.lemmatization import LemmatizationError
 from ebl.transliteration.domain.alignment import AlignmentError
 
@@ -36,6 +36,7 @@ def set_up(api):
     api.add_error_handler(LemmatizationError, unprocessable_entity)
     api.add_error_handler(NotFoundError, not_found_error)
     api.add_error_handler(DuplicateError, duplicate_error)
+    api.add_error_handler(ConflictError, duplicate_error)
     api.add_error_handler(DataError, unprocessable_entity)
     api.add_error_handler(falcon.HTTPError, http_error)
     api.add_error_handler(falcon.HTTPStatus, http_error)
@@ -6,6 +6,10 @@ class DuplicateError(Exception):
     pass
 
 
+class ConflictError(Exception):
+    pass
+
+
 class DataError(Exception):
     pass
 
@@ -1,5 +1,6 @@
+import datetime
 from abc import ABC, abstractmethod
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 from ebl.common.domain.scopes import Scope
 
 from ebl.errors import NotFoundError
@@ -19,6 +20,10 @@ class File(ABC):
     @abstractmethod
     def content_type(self) -> str: ...
 
+    @property
+    def upload_date(self) -> Optional[datetime.datetime]:
+        return None
+
     @abstractmethod
     def read(self, size=-1) -> bytes: ...
 
@@ -1,3 +1,4 @@
+import datetime
 from typing import Any, Mapping, Optional
 
 import attr
@@ -24,6 +25,10 @@ class GridFsFile(File):
     def content_type(self) -> Optional[str]:
         return self._grid_out.content_type
 
+    @property
+    def upload_date(self) -> Optional[datetime.datetime]:
+        return self._grid_out.upload_date
+
     def read(self, size=-1) -> bytes:
         return self._grid_out.read(size)
 
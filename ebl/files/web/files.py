@@ -1,19 +1,39 @@
-from falcon import Response
+import datetime
+
+import falcon
+from falcon import Request, Response
 from falcon_auth import NoneAuthBackend
 
-from ebl.files.application.file_repository import FileRepository
+from ebl.files.application.file_repository import File, FileRepository
 from ebl.users.domain.user import Guest
 
 
+def _to_http_date(date: datetime.datetime) -> datetime.datetime:
+    if date.tzinfo is not None:
+        date = date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return date.replace(microsecond=0)
+
+
+def stream_file(req: Request, resp: Response, file: File) -> None:
+    """Stream the file unless the client has an up-to-date copy."""
+    if file.upload_date is not None:
+        last_modified = _to_http_date(file.upload_date)
+        resp.last_modified = last_modified
+        if req.if_modified_since and last_modified <= req.if_modified_since:
+            file.close()
+            resp.status = falcon.HTTP_NOT_MODIFIED
+            return
+
+    resp.content_type = file.content_type
+    resp.content_length = file.length
+    resp.stream = file
+
+
 class PublicFilesResource:
     auth = {"backend": NoneAuthBackend(Guest)}
 
     def __init__(self, files: FileRepository):
         self._files = files
 
-    def on_get(self, _req, resp: Response, file_name: str):
-        file = self._files.query_by_file_name(file_name)
-
-        resp.content_type = file.content_type
-        resp.content_length = file.length
-        resp.stream = file
+    def on_get(self, req: Request, resp: Response, file_name: str):
+        stream_file(req, resp, self._files.query_by_file_name(file_name))
@@ -88,8 +88,8 @@ class AnnotationsService:
     def _cropped_image_from_annotations(
         self, annotations: Annotations
     ) -> Tuple[Annotations, Sequence[CroppedSignImage]]:
-        fragment = self._fragments_repository.query_by_museum_number(
-            annotations.fragment_number
+        fragment = self._fragments_repository.query_fields_by_museum_number(
+            annotations.fragment_number, ["text"]
         )
         fragment_image = self._photos_repository.query_by_file_name(
             f"{annotations.fragment_number}.jpg"
@@ -10,6 +10,7 @@ from ebl.fragmentarium.domain.folios import Folio
 from ebl.fragmentarium.domain.fragment import Fragment
 from ebl.fragmentarium.domain.fragment_info import FragmentInfo
 from ebl.fragmentarium.domain.fragment_pager_info import FragmentPagerInfo
+from ebl.fragmentarium.domain.joins import Joins
 from ebl.transliteration.application.parallel_line_injector import ParallelLineInjector
 from ebl.transliteration.domain.museum_number import MuseumNumber
 
@@ -60,6 +61,26 @@ class FragmentFinder:
             self._photos.query_if_file_exists(f"{number}.jpg"),
         )
 
+    def find_many(
+        self,
+        numbers: Sequence[MuseumNumber],
+        projection: Optional[Sequence[str]] = None,
+    ) -> List[Tuple[Fragment, bool]]:
+        fragments = self._repository.query_by_museum_numbers(numbers, projection)
+        texts = self._parallel_injector.inject_transliterations(
+            [fragment.text for fragment in fragments]
+        )
+        return [
+            (
+                fragment.set_text(text),
+                self._photos.query_if_file_exists(f"{fragment.number}.jpg"),
+            )
+            for fragment, text in zip(fragments, texts)
+        ]
+
+    def find_joins(self, number: MuseumNumber) -> Joins:
+        return self._repository.query_fields_by_museum_number(number, ["joins"]).joins
+
     def fetch_scopes(self, number: MuseumNumber) -> List[Scope]:
         return self._repository.fetch_scopes(number)
 
@@ -63,8 +63,8 @@ class FragmentMatcher:
         self._fragment_repository = fragment_repository
 
     def _parse_candidate(self, candidate: str) -> Tuple[LineToVecEncodings, ...]:
-        return self._fragment_repository.query_by_museum_number(
-            MuseumNumber.of(candidate)
+        return self._fragment_repository.query_fields_by_museum_number(
+            MuseumNumber.of(candidate), ["line_to_vec"]
         ).line_to_vec
 
     def rank_line_to_vec(self, candidate: str) -> LineToVecRanking:
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Sequence, Optional
+from typing import Iterator, List, Sequence, Optional, Tuple
 from ebl.common.domain.scopes import Scope
 from ebl.common.query.query_result import QueryResult, AfORegisterToFragmentQueryResult
+from ebl.errors import NotFoundError
 
 from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
 from ebl.fragmentarium.domain.fragment import Fragment
@@ -35,6 +36,22 @@ class FragmentRepository(ABC):
         exclude_lines: bool = False,
     ) -> Fragment: ...
 
+    @abstractmethod
+    def query_by_museum_numbers(
+        self,
+        numbers: Sequence[MuseumNumber],
+        projection: Optional[Sequence[str]] = None,
+    ) -> List[Fragment]: ...
+
+    def query_fields_by_museum_number(
+        self, number: MuseumNumber, fields: Sequence[str]
+    ) -> Fragment:
+        """Load only the given fields, leaving the others at their defaults."""
+        fragments = self.query_by_museum_numbers([number], fields)
+        if not fragments:
+            raise NotFoundError(f"Fragment {number} not found.")
+        return fragments[0]
+
     @abstractmethod
     def query_by_traditional_references(
         self,
@@ -76,7 +93,14 @@ class FragmentRepository(ABC):
     ) -> FragmentPagerInfo: ...
 
     @abstractmethod
-    def update_field(self, field: str, fragment: Fragment) -> None: ...
+    def update_field(
+        self, field: str, fragment: Fragment, version: Optional[int] = None
+    ) -> Fragment:
+        """Write the field and return the updated fragment.
+
+        The joins of the result are taken from `fragment`. Raise ConflictError
+        if the fragment is no longer at the given version.
+        """
 
     @abstractmethod
     def query(
@@ -89,9 +113,21 @@ class FragmentRepository(ABC):
     @abstractmethod
     def fetch_scopes(self, number: MuseumNumber) -> List[Scope]: ...
 
+    @abstractmethod
+    def bulk_update(
+        self, fields: Sequence[str], fragments: Sequence[Fragment]
+    ) -> List[Tuple[Fragment, Exception]]:
+        """Set the given fields of the fragments without a version check.
+
+        Returns the fragments which were not found or could not be written.
+        """
+
     @abstractmethod
     def fetch_date(self, number: MuseumNumber) -> Optional[Date]: ...
 
+    @abstractmethod
+    def fetch_version(self, number: MuseumNumber) -> int: ...
+
     @abstractmethod
     def list_all_fragments(self) -> Sequence[str]: ...
 
@@ -100,3 +136,11 @@ class FragmentRepository(ABC):
 
     @abstractmethod
     def fetch_fragment_signs(self) -> Sequence[dict]: ...
+
+    @abstractmethod
+    def export_transliterated_fragments(
+        self,
+        fields: Sequence[str],
+        user_scopes: Sequence[Scope] = tuple(),
+        after: Optional[str] = None,
+    ) -> Iterator[dict]: ...
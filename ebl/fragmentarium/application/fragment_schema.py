@@ -216,12 +216,15 @@ class FragmentSchema(Schema):
 
     @post_load
     def make_fragment(self, data, **kwargs):
-        data["references"] = tuple(data["references"])
-        data["genres"] = tuple(data["genres"])
-        data["line_to_vec"] = tuple(map(tuple, data["line_to_vec"]))
+        if "references" in data:
+            data["references"] = tuple(data["references"])
+        if "genres" in data:
+            data["genres"] = tuple(data["genres"])
+        if "line_to_vec" in data:
+            data["line_to_vec"] = tuple(map(tuple, data["line_to_vec"]))
         if "projects" in data:
             data["projects"] = tuple(data["projects"])
-        if data["uncurated_references"] is not None:
+        if data.get("uncurated_references") is not None:
             data["uncurated_references"] = tuple(data["uncurated_references"])
         if "authorized_scopes" in data:
             data["authorized_scopes"] = list(data["authorized_scopes"])
@@ -1,4 +1,4 @@
-from typing import Sequence, Tuple, Optional
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
 
 from ebl.bibliography.application.bibliography import Bibliography
 from ebl.bibliography.domain.reference import Reference
@@ -16,6 +16,9 @@ from ebl.users.domain.user import User
 from ebl.fragmentarium.domain.date import Date
 
 COLLECTION = "fragments"
+TRANSLITERATION_FIELDS = ("text", "signs", "record", "line_to_vec")
+LOWEST_JOIN_FIELDS = (*TRANSLITERATION_FIELDS, "joins")
+RESULT_FIELDS = ("joins", "archaeology")
 
 
 class FragmentUpdater:
@@ -40,115 +43,202 @@ class FragmentUpdater:
         user: User,
         ignore_lowest_join: bool = False,
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-
-        updated_fragment = (
-            fragment.update_transliteration(transliteration, user)
-            if ignore_lowest_join
-            else fragment.update_lowest_join_transliteration(transliteration, user)
+        updated_fragment = self._update(
+            number,
+            "transliteration",
+            TRANSLITERATION_FIELDS if ignore_lowest_join else LOWEST_JOIN_FIELDS,
+            lambda fragment: (
+                fragment.update_transliteration(transliteration, user)
+                if ignore_lowest_join
+                else fragment.update_lowest_join_transliteration(transliteration, user)
+            ),
+            user,
         )
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("transliteration", updated_fragment)
-
         return self._create_result(updated_fragment)
 
     def update_introduction(
         self, number: MuseumNumber, introduction: str, user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.set_introduction(introduction)
-
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("introduction", updated_fragment)
-
+        updated_fragment = self._update(
+            number,
+            "introduction",
+            ["introduction"],
+            lambda fragment: fragment.set_introduction(introduction),
+            user,
+        )
         return self._create_result(updated_fragment)
 
     def update_notes(
         self, number: MuseumNumber, notes: str, user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.set_notes(notes)
-
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("notes", updated_fragment)
-
+        updated_fragment = self._update(
+            number, "notes", ["notes"], lambda fragment: fragment.set_notes(notes), user
+        )
         return self._create_result(updated_fragment)
 
     def update_script(
         self, number: MuseumNumber, script: Script, user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.set_script(script)
-
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("script", updated_fragment)
-
+        updated_fragment = self._update(
+            number,
+            "script",
+            ["script"],
+            lambda fragment: fragment.set_script(script),
+            user,
+        )
         return self._create_result(updated_fragment)
 
     def update_date(
         self, number: MuseumNumber, date: Optional[Date], user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.set_date(date)
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("date", updated_fragment)
-
+        updated_fragment = self._update(
+            number, "date", ["date"], lambda fragment: fragment.set_date(date), user
+        )
         return self._create_result(updated_fragment)
 
     def update_dates_in_text(
         self, number: MuseumNumber, dates_in_text: Sequence[Date], user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.set_dates_in_text(dates_in_text)
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("dates_in_text", updated_fragment)
-
+        updated_fragment = self._update(
+            number,
+            "dates_in_text",
+            ["dates_in_text"],
+            lambda fragment: fragment.set_dates_in_text(dates_in_text),
+            user,
+        )
         return self._create_result(updated_fragment)
 
     def update_genres(
         self, number: MuseumNumber, genres: Sequence[Genre], user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.set_genres(genres)
-
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("genres", updated_fragment)
-
+        updated_fragment = self._update(
+            number,
+            "genres",
+            ["genres"],
+            lambda fragment: fragment.set_genres(genres),
+            user,
+        )
         return self._create_result(updated_fragment)
 
     def update_lemmatization(
         self, number: MuseumNumber, lemmatization: Lemmatization, user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.update_lemmatization(lemmatization)
-
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("lemmatization", updated_fragment)
-
+        updated_fragment = self._update(
+            number,
+            "lemmatization",
+            ["text"],
+            lambda fragment: fragment.update_lemmatization(lemmatization),
+            user,
+        )
         return self._create_result(updated_fragment)
 
     def update_references(
         self, number: MuseumNumber, references: Sequence[Reference], user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
         self._bibliography.validate_references(references)
-
-        updated_fragment = fragment.set_references(references)
-
-        self._create_changelog(user, fragment, updated_fragment)
-        self._repository.update_field("references", updated_fragment)
-
-        return self._create_result(self._repository.query_by_museum_number(number))
+        updated_fragment = self._update(
+            number,
+            "references",
+            ["references"],
+            lambda fragment: fragment.set_references(references),
+            user,
+        )
+        return self._create_result(updated_fragment)
 
     def update_archaeology(
         self, number: MuseumNumber, archaeology: Archaeology, user: User
     ) -> Tuple[Fragment, bool]:
-        fragment = self._repository.query_by_museum_number(number)
-        updated_fragment = fragment.set_archaeology(archaeology)
+        updated_fragment = self._update(
+            number,
+            "archaeology",
+            ["archaeology"],
+            lambda fragment: fragment.set_archaeology(archaeology),
+        )
+        return self._create_result(updated_fragment)
 
-        self._repository.update_field("archaeology", updated_fragment)
+    def bulk_update(
+        self,
+        fields: Sequence[str],
+        updates: Iterable[Tuple[Fragment, Callable[[Fragment], Fragment]]],
+        user: User,
+    ) -> List[Tuple[Fragment, Exception]]:
+        """Update fragments which already have the given fields loaded.
+
+        The fields are written with one bulk write and the changelog with one
+        insert for the fragments which were written. Returns the fragments
+        which could not be updated.
+        """
+        errors = []
+        changes = {}
+        for fragment, update in updates:
+            try:
+                changes[fragment.number] = (fragment, update(fragment))
+            except Exception as error:
+                errors.append((fragment, error))
+
+        failed = {
+            updated.number: error
+            for updated, error in self._repository.bulk_update(
+                fields, [updated for _, updated in changes.values()]
+            )
+        }
+        self._changelog.create_many(
+            COLLECTION,
+            user.profile,
+            [
+                _create_change(fragment, updated)
+                for number, (fragment, updated) in changes.items()
+                if number not in failed
+            ],
+        )
+        return [
+            *errors,
+            *((changes[number][0], error) for number, error in failed.items()),
+        ]
 
-        return self._create_result(updated_fragment)
+    def bulk_update_transliterations(
+        self,
+        updates: Iterable[Tuple[Fragment, TransliterationUpdate]],
+        user: User,
+    ) -> List[Tuple[Fragment, Exception]]:
+        return self.bulk_update(
+            TRANSLITERATION_FIELDS,
+            [
+                (
+                    fragment,
+                    lambda fragment, transliteration=transliteration: (
+                        fragment.update_transliteration(transliteration, user)
+                    ),
+                )
+                for fragment, transliteration in updates
+            ],
+            user,
+        )
+
+    def _update(
+        self,
+        number: MuseumNumber,
+        field: str,
+        fields: Sequence[str],
+        update: Callable[[Fragment], Fragment],
+        user: Optional[User] = None,
+    ) -> Fragment:
+        """Load only the fields needed for the update and the result and write it.
+
+        The write fails with ConflictError if the fragment has been modified
+        since its version was read. The changelog is written only after the
+        update succeeded. Returns the updated fragment.
+        """
+        version = self._repository.fetch_version(number)
+        fragment = self._repository.query_fields_by_museum_number(
+            number,
+            [*fields, *(name for name in RESULT_FIELDS if name not in fields)],
+        )
+        updated_fragment = update(fragment)
+        result = self._repository.update_field(field, updated_fragment, version)
+        if user is not None:
+            self._create_changelog(user, fragment, updated_fragment)
+        return result
 
     def _create_result(self, fragment: Fragment) -> Tuple[Fragment, bool]:
         return (
@@ -161,11 +251,15 @@ class FragmentUpdater:
     def _create_changelog(
         self, user: User, fragment: Fragment, updated_fragment: Fragment
     ) -> None:
-        schema = FragmentSchema()
-        fragment_id = str(fragment.number)
         self._changelog.create(
-            COLLECTION,
-            user.profile,
-            {"_id": fragment_id, **schema.dump(fragment)},
-            {"_id": fragment_id, **schema.dump(updated_fragment)},
+            COLLECTION, user.profile, *_create_change(fragment, updated_fragment)
         )
+
+
+def _create_change(fragment: Fragment, updated_fragment: Fragment) -> Tuple[dict, dict]:
+    schema = FragmentSchema()
+    fragment_id = str(fragment.number)
+    return (
+        {"_id": fragment_id, **schema.dump(fragment)},
+        {"_id": fragment_id, **schema.dump(updated_fragment)},
+    )
@@ -0,0 +1,84 @@
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ebl.alignment.application.align import ALIGNMENT_FIELDS
+from ebl.app import create_context
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+ACCESS_PATTERNS: Dict[str, Optional[Sequence[str]]] = {
+    "full": None,
+    "date": ["date"],
+    "joins": ["joins"],
+    "annotations": ["text"],
+    "matcher": ["line_to_vec"],
+    "alignment": ALIGNMENT_FIELDS,
+}
+
+
+def create_loader(
+    repository: FragmentRepository, fields: Optional[Sequence[str]]
+) -> Callable[[MuseumNumber], object]:
+    return (
+        repository.query_by_museum_number
+        if fields is None
+        else lambda number: repository.query_fields_by_museum_number(number, fields)
+    )
+
+
+def measure(
+    load: Callable[[MuseumNumber], object], numbers: Sequence[MuseumNumber]
+) -> List[float]:
+    durations = []
+    for number in numbers:
+        start = time.perf_counter()
+        load(number)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def benchmark(
+    repository: FragmentRepository, numbers: Sequence[MuseumNumber]
+) -> Dict[str, List[float]]:
+    return {
+        name: measure(create_loader(repository, fields), numbers)
+        for name, fields in ACCESS_PATTERNS.items()
+    }
+
+
+def to_text(results: Dict[str, List[float]]) -> str:
+    def percentile(durations: List[float], fraction: float) -> float:
+        ordered = sorted(durations)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return "\n".join(
+        [
+            "pattern\tmedian ms\tp95 ms",
+            *(
+                f"{name}\t{statistics.median(durations) * 1000:.2f}"
+                f"\t{percentile(durations, 0.95) * 1000:.2f}"
+                for name, durations in results.items()
+                if durations
+            ),
+        ]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the latency of loading fragments with and without "
+        "projections."
+    )
+    parser.add_argument(
+        "-n", "--sample", type=int, default=100, help="Number of fragments to load."
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    repository = create_context().fragment_repository
+    numbers = repository.query_transliterated_numbers()
+    sample = random.Random(args.seed).sample(numbers, min(args.sample, len(numbers)))
+    print(to_text(benchmark(repository, sample)))
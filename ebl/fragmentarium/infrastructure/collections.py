@@ -1 +1,4 @@
 JOINS_COLLECTION = "joins"
+NEIGHBOURS_COLLECTION = "fragment_neighbours"
+NEEDS_REVISION_COLLECTION = "fragments_needing_revision"
+LATEST_TRANSLITERATIONS_COLLECTION = "latest_transliterations"
@@ -0,0 +1,214 @@
+import math
+import uuid
+from contextlib import suppress
+from itertools import groupby
+from typing import Iterable, List, Optional, Sequence
+
+import attr
+import pydash
+import pymongo
+from pymongo import ReplaceOne
+
+from ebl.errors import NotFoundError
+from ebl.fragmentarium.infrastructure.collections import NEIGHBOURS_COLLECTION
+from ebl.mongo_collection import MongoCollection
+from ebl.transliteration.application.museum_number_schema import MuseumNumberSchema
+from ebl.transliteration.domain.museum_number import MuseumNumber
+from ebl.transliteration.infrastructure.collections import FRAGMENTS_COLLECTION
+
+MUSEUM_NUMBER_SEQUENCE = "museumNumber"
+INFINITE_INTEGER = "99"
+STRING_TERMINATOR = "\x00"
+BATCH_SIZE = 1000
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Entry:
+    sequence: str
+    key: str
+    value: dict
+
+    @property
+    def id(self) -> str:
+        return create_id(self.sequence, self.key)
+
+
+def create_id(sequence: str, key: str) -> str:
+    return f"{sequence}/{key}"
+
+
+def folio_sequence(folio_name: str) -> str:
+    return f"folios/{folio_name}"
+
+
+def folio_key(folio_number: str, fragment_id: str) -> str:
+    return f"{folio_number}-{fragment_id}"
+
+
+def encode_order(order: Iterable) -> str:
+    """Encode a sort tuple as a string with the same order."""
+
+    def encode(value) -> str:
+        if isinstance(value, str):
+            return f"{value}{STRING_TERMINATOR}"
+        elif value == math.inf:
+            return INFINITE_INTEGER
+        else:
+            digits = str(value)
+            return f"{len(digits):02d}{digits}"
+
+    return "".join(encode(value) for value in order)
+
+
+def museum_number_entry(number: MuseumNumber) -> Entry:
+    return Entry(
+        MUSEUM_NUMBER_SEQUENCE,
+        encode_order(number.order),
+        {"museumNumber": MuseumNumberSchema().dump(number)},
+    )
+
+
+def folio_entries(fragment_id: str, folios: Sequence[dict]) -> List[Entry]:
+    return [
+        Entry(
+            folio_sequence(folio["name"]),
+            folio_key(folio["number"], fragment_id),
+            {"fragmentNumber": fragment_id, "folioNumber": folio["number"]},
+        )
+        for folio in folios
+    ]
+
+
+def create_entries(document: dict) -> List[Entry]:
+    return [
+        museum_number_entry(MuseumNumberSchema().load(document["museumNumber"])),
+        *folio_entries(document["_id"], document.get("folios", [])),
+    ]
+
+
+def link(entries: Sequence[Entry]) -> List[dict]:
+    return [
+        {
+            "_id": entry.id,
+            "sequence": entry.sequence,
+            "key": entry.key,
+            "value": entry.value,
+            "previous": entries[index - 1].value,
+            "next": entries[(index + 1) % len(entries)].value,
+        }
+        for index, entry in enumerate(entries)
+    ]
+
+
+class FragmentNeighbours:
+    """Materialized previous and next fragments for the pagers.
+
+    Every fragment is linked to its neighbours in museum number order and in
+    the order of each of its folios. The sequences wrap around. `rebuild`
+    recreates all links in place and `insert` links new fragments into the
+    existing sequences.
+    """
+
+    def __init__(self, database):
+        self._fragments = MongoCollection(database, FRAGMENTS_COLLECTION)
+        self._neighbours = MongoCollection(database, NEIGHBOURS_COLLECTION)
+
+    def create_indexes(self) -> None:
+        self._neighbours.create_index(
+            [("sequence", pymongo.ASCENDING), ("key", pymongo.ASCENDING)],
+            unique=True,
+        )
+
+    def find(self, sequence: str, key: str) -> Optional[dict]:
+        return next(
+            self._neighbours.find_many({"_id": create_id(sequence, key)}).limit(1),
+            None,
+        )
+
+    def find_fragment(self, number: MuseumNumber) -> Optional[dict]:
+        entry = museum_number_entry(number)
+        return self.find(entry.sequence, entry.key)
+
+    def find_folio(
+        self, folio_name: str, folio_number: str, number: MuseumNumber
+    ) -> Optional[dict]:
+        return self.find(
+            folio_sequence(folio_name), folio_key(folio_number, str(number))
+        )
+
+    def rebuild(self) -> None:
+        entries = sorted(
+            (
+                entry
+                for document in self._fragments.find_many(
+                    {}, projection={"museumNumber": True, "folios": True}
+                )
+                for entry in create_entries(document)
+            ),
+            key=lambda entry: (entry.sequence, entry.key),
+        )
+        documents = [
+            document
+            for _, sequence in groupby(entries, key=lambda entry: entry.sequence)
+            for document in link(list(sequence))
+        ]
+        build = str(uuid.uuid4())
+        for batch in pydash.chunk(documents, BATCH_SIZE):
+            self._neighbours.bulk_write(
+                [
+                    ReplaceOne(
+                        {"_id": document["_id"]},
+                        {**document, "build": build},
+                        upsert=True,
+                    )
+                    for document in batch
+                ],
+                ordered=False,
+            )
+        with suppress(NotFoundError):
+            self._neighbours.delete_many({"build": {"$ne": build}})
+
+    def insert(self, documents: Iterable[dict]) -> None:
+        for document in documents:
+            for entry in create_entries(document):
+                self._insert_entry(entry)
+
+    def _insert_entry(self, entry: Entry) -> None:
+        previous = self._find_adjacent(
+            entry, {"$lt": entry.key}, pymongo.DESCENDING
+        ) or self._find_adjacent(entry, None, pymongo.DESCENDING)
+        next_ = self._find_adjacent(
+            entry, {"$gt": entry.key}, pymongo.ASCENDING
+        ) or self._find_adjacent(entry, None, pymongo.ASCENDING)
+
+        self._neighbours.replace_one(
+            {
+                "_id": entry.id,
+                "sequence": entry.sequence,
+                "key": entry.key,
+                "value": entry.value,
+                "previous": previous["value"] if previous else entry.value,
+                "next": next_["value"] if next_ else entry.value,
+            },
+            upsert=True,
+        )
+        if previous:
+            self._neighbours.update_one(
+                {"_id": previous["_id"]}, {"$set": {"next": entry.value}}
+            )
+        if next_:
+            self._neighbours.update_one(
+                {"_id": next_["_id"]}, {"$set": {"previous": entry.value}}
+            )
+
+    def _find_adjacent(
+        self, entry: Entry, key: Optional[dict], direction: int
+    ) -> Optional[dict]:
+        query = {
+            "sequence": entry.sequence,
+            "_id": {"$ne": entry.id},
+            **({} if key is None else {"key": key}),
+        }
+        return next(
+            self._neighbours.find_many(query).sort("key", direction).limit(1), None
+        )
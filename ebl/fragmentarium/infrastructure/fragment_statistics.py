@@ -0,0 +1,114 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ebl.fragmentarium.infrastructure.queries import HAS_TRANSLITERATION
+from ebl.mongo_collection import MongoCollection
+from ebl.transliteration.infrastructure.collections import FRAGMENTS_COLLECTION
+
+COLLECTION = "statistics"
+STATISTICS_ID = "fragments"
+STATISTICS_FIELDS = ("transliteration",)
+SOURCE_PROJECTION = {
+    "museumNumber": True,
+    "text.numberOfLines": True,
+    "text.lines.type": True,
+    "authorizedScopes": True,
+}
+
+
+def count(document: Optional[dict]) -> Dict[str, int]:
+    """Count the contribution of a fragment document to the statistics."""
+    text = (document or {}).get("text") or {}
+    is_transliterated = bool(text.get("lines"))
+    return {
+        "transliteratedFragments": int(is_transliterated),
+        "publicTransliteratedFragments": int(
+            is_transliterated and "authorizedScopes" not in document
+        ),
+        "lines": text.get("numberOfLines", 0),
+    }
+
+
+def match_counts(document: dict) -> dict:
+    """Create a query matching fragments with the same counts as the document."""
+    text = document.get("text") or {}
+    return {
+        "text.numberOfLines": text.get("numberOfLines"),
+        "text.lines.0": {"$exists": bool(text.get("lines"))},
+        "authorizedScopes": {"$exists": "authorizedScopes" in document},
+    }
+
+
+class FragmentStatistics:
+    """Counters of the fragmentarium kept up to date on write.
+
+    Every write adds the difference between the counts of the new and the old
+    version of a fragment. The old version must be the pre-image of the write
+    itself, e.g. returned by `find_one_and_update` or guarded with
+    `match_counts`, so that concurrent writes do not make the counters drift.
+    The counters are computed from scratch when they do not exist yet, and
+    `reconcile` recomputes them and returns the drift.
+    """
+
+    def __init__(self, database):
+        self._fragments = MongoCollection(database, FRAGMENTS_COLLECTION)
+        self._statistics = MongoCollection(database, COLLECTION)
+
+    def find(self) -> Dict[str, int]:
+        document = self._find_document()
+        if document is None:
+            computed = self.compute()
+            self._set(computed)
+            return computed
+        return {key: document.get(key, 0) for key in count(None)}
+
+    def find_sources(self, query: dict) -> List[dict]:
+        return list(self._fragments.find_many(query, projection=SOURCE_PROJECTION))
+
+    def update(self, old: Optional[dict], new: Optional[dict]) -> None:
+        self.update_many([(old, new)])
+
+    def update_many(
+        self, changes: Iterable[Tuple[Optional[dict], Optional[dict]]]
+    ) -> None:
+        totals = dict.fromkeys(count(None), 0)
+        for old, new in changes:
+            old_counts = count(old)
+            for key, value in count(new).items():
+                totals[key] += value - old_counts[key]
+        if deltas := {key: delta for key, delta in totals.items() if delta}:
+            self._statistics.update_many({"_id": STATISTICS_ID}, {"$inc": deltas})
+
+    def compute(self) -> Dict[str, int]:
+        lines = next(
+            self._fragments.aggregate(
+                [{"$group": {"_id": None, "total": {"$sum": "$text.numberOfLines"}}}]
+            ),
+            {"total": 0},
+        )["total"]
+        return {
+            "transliteratedFragments": self._fragments.count_documents(
+                HAS_TRANSLITERATION
+            ),
+            "publicTransliteratedFragments": self._fragments.count_documents(
+                {**HAS_TRANSLITERATION, "authorizedScopes": {"$exists": False}}
+            ),
+            "lines": lines,
+        }
+
+    def reconcile(self) -> Dict[str, int]:
+        document = self._find_document() or {}
+        computed = self.compute()
+        self._set(computed)
+        return {
+            key: value - document.get(key, 0)
+            for key, value in computed.items()
+            if value != document.get(key, 0)
+        }
+
+    def _find_document(self) -> Optional[dict]:
+        return next(self._statistics.find_many({"_id": STATISTICS_ID}).limit(1), None)
+
+    def _set(self, counts: Dict[str, int]) -> None:
+        self._statistics.update_many(
+            {"_id": STATISTICS_ID}, {"$set": counts}, upsert=True
+        )
@@ -0,0 +1,195 @@
+import uuid
+from contextlib import suppress
+from itertools import islice
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import pymongo
+from pymongo import DeleteOne, ReplaceOne
+
+from ebl.common.domain.scopes import Scope
+from ebl.common.query.query_result import QueryResult
+from ebl.common.query.query_schemas import QueryResultSchema
+from ebl.errors import NotFoundError
+from ebl.fragmentarium.application.fragment_info_schema import FragmentInfoSchema
+from ebl.fragmentarium.domain.fragment_info import FragmentInfo
+from ebl.fragmentarium.domain.record import RecordType
+from ebl.fragmentarium.infrastructure.collections import (
+    LATEST_TRANSLITERATIONS_COLLECTION,
+    NEEDS_REVISION_COLLECTION,
+)
+from ebl.fragmentarium.infrastructure.queries import (
+    LATEST_TRANSLITERATION_LIMIT,
+    LATEST_TRANSLITERATION_LINE_LIMIT,
+    NUMBER_OF_NEEDS_REVISION,
+    match_user_scopes,
+)
+from ebl.mongo_collection import MongoCollection
+from ebl.transliteration.infrastructure.collections import FRAGMENTS_COLLECTION
+
+VIEW_FIELDS = ("transliteration", "script")
+BATCH_SIZE = 1000
+SOURCE_PROJECTION = {
+    "museumNumber": True,
+    "accession": True,
+    "description": True,
+    "script": True,
+    "record": True,
+    "text.lines.type": True,
+    "authorizedScopes": True,
+}
+
+
+def _get_entries(document: dict, type_: RecordType) -> List[dict]:
+    return sorted(
+        (entry for entry in document.get("record", []) if entry["type"] == type_.value),
+        key=lambda entry: entry["date"],
+    )
+
+
+def _get_scopes(document: dict) -> dict:
+    return (
+        {"authorizedScopes": document["authorizedScopes"]}
+        if "authorizedScopes" in document
+        else {}
+    )
+
+
+def create_needs_revision_entry(document: dict) -> Optional[dict]:
+    transliterations = _get_entries(document, RecordType.TRANSLITERATION)
+    transliterators = {entry["user"] for entry in transliterations}
+    revisors = {entry["user"] for entry in _get_entries(document, RecordType.REVISION)}
+    return (
+        {
+            "_id": document["_id"],
+            "number": document["museumNumber"],
+            **{
+                key: document[key]
+                for key in ("accession", "description", "script")
+                if key in document
+            },
+            "editionDate": transliterations[0]["date"],
+            "editor": transliterations[0]["user"],
+            **_get_scopes(document),
+        }
+        if document.get("text", {}).get("lines")
+        and transliterations
+        and revisors <= transliterators
+        else None
+    )
+
+
+def create_latest_entry(document: dict) -> Optional[dict]:
+    transliterations = _get_entries(document, RecordType.TRANSLITERATION)
+    return (
+        {
+            "_id": document["_id"],
+            "museumNumber": document["museumNumber"],
+            "latestDate": transliterations[-1]["date"],
+            "matchingLines": [
+                index
+                for index, line in enumerate(document.get("text", {}).get("lines", []))
+                if line["type"] == "TextLine"
+            ][:LATEST_TRANSLITERATION_LINE_LIMIT],
+            **_get_scopes(document),
+        }
+        if transliterations
+        else None
+    )
+
+
+def _create_request(
+    create_entry: Callable[[dict], Optional[dict]], document: dict
+) -> Union[ReplaceOne, DeleteOne]:
+    return (
+        ReplaceOne({"_id": entry["_id"]}, entry, upsert=True)
+        if (entry := create_entry(document))
+        else DeleteOne({"_id": document["_id"]})
+    )
+
+
+class FragmentViews:
+    """Materialized views of the fragments listed on the landing page.
+
+    The views hold the candidates for the "needs revision" and "latest
+    transliterations" lists together with their sort keys. They are updated
+    whenever a fragment is written and can be rebuilt with `rebuild`.
+    """
+
+    def __init__(self, database):
+        self._fragments = MongoCollection(database, FRAGMENTS_COLLECTION)
+        self._needs_revision = MongoCollection(database, NEEDS_REVISION_COLLECTION)
+        self._latest = MongoCollection(database, LATEST_TRANSLITERATIONS_COLLECTION)
+        self._views: Sequence[
+            Tuple[MongoCollection, Callable[[dict], Optional[dict]]]
+        ] = [
+            (self._needs_revision, create_needs_revision_entry),
+            (self._latest, create_latest_entry),
+        ]
+
+    def create_indexes(self) -> None:
+        self._needs_revision.create_index([("editionDate", pymongo.ASCENDING)])
+        self._latest.create_index([("latestDate", pymongo.DESCENDING)])
+
+    def update(self, document: dict) -> None:
+        self.update_many([document])
+
+    def update_many(self, documents: Sequence[dict]) -> None:
+        if documents:
+            for view, create_entry in self._views:
+                view.bulk_write(
+                    [_create_request(create_entry, document) for document in documents],
+                    ordered=False,
+                )
+
+    def refresh(self, query: dict) -> None:
+        self.update_many(
+            list(self._fragments.find_many(query, projection=SOURCE_PROJECTION))
+        )
+
+    def rebuild(self) -> None:
+        build = str(uuid.uuid4())
+        documents = self._fragments.find_many({}, projection=SOURCE_PROJECTION)
+        while batch := list(islice(documents, BATCH_SIZE)):
+            for view, create_entry in self._views:
+                if requests := [
+                    ReplaceOne(
+                        {"_id": entry["_id"]}, {**entry, "build": build}, upsert=True
+                    )
+                    for document in batch
+                    if (entry := create_entry(document))
+                ]:
+                    view.bulk_write(requests, ordered=False)
+        for view, _ in self._views:
+            with suppress(NotFoundError):
+                view.delete_many({"build": {"$ne": build}})
+
+    def find_needs_revision(
+        self, user_scopes: Sequence[Scope] = tuple()
+    ) -> List[FragmentInfo]:
+        cursor = (
+            self._needs_revision.find_many(
+                match_user_scopes(user_scopes),
+                projection={"_id": False, "authorizedScopes": False, "build": False},
+            )
+            .sort("editionDate", pymongo.ASCENDING)
+            .limit(NUMBER_OF_NEEDS_REVISION)
+        )
+        return FragmentInfoSchema(many=True).load(cursor)
+
+    def find_latest(self, user_scopes: Sequence[Scope] = tuple()) -> QueryResult:
+        cursor = (
+            self._latest.find_many(
+                match_user_scopes(user_scopes),
+                projection={"_id": False, "museumNumber": True, "matchingLines": True},
+            )
+            .sort("latestDate", pymongo.DESCENDING)
+            .limit(LATEST_TRANSLITERATION_LIMIT)
+        )
+        items = [
+            {**entry, "matchCount": 0} for entry in cursor if entry["matchingLines"]
+        ]
+        return (
+            QueryResultSchema().load({"items": items, "matchCountTotal": 0})
+            if items
+            else QueryResult.create_empty()
+        )
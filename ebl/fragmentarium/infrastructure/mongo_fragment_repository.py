@@ -1,49 +1,96 @@
-from typing import List, Optional, Sequence, Iterator
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import attr
 import pymongo
 from marshmallow import EXCLUDE
+from pymongo import ReturnDocument, UpdateOne
 from pymongo.collation import Collation
+from pymongo.errors import BulkWriteError, WriteError
 
-from ebl.bibliography.infrastructure.bibliography import join_reference_documents
+from ebl.bibliography.infrastructure.bibliography import ReferenceResolver
 from ebl.common.domain.scopes import Scope
 from ebl.common.query.query_result import QueryResult, AfORegisterToFragmentQueryResult
 from ebl.common.query.query_schemas import (
     QueryResultSchema,
     AfORegisterToFragmentQueryResultSchema,
 )
-from ebl.errors import NotFoundError
-from ebl.fragmentarium.application.fragment_info_schema import FragmentInfoSchema
+from ebl.errors import ConflictError, NotFoundError
 from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.application.archaeology_schemas import FindspotSchema
 from ebl.fragmentarium.application.fragment_schema import FragmentSchema, ScriptSchema
 from ebl.fragmentarium.application.joins_schema import JoinSchema
 from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
 from ebl.fragmentarium.domain.date import Date, DateSchema
+from ebl.fragmentarium.domain.findspot import Findspot
 from ebl.fragmentarium.domain.fragment import Fragment
 from ebl.fragmentarium.domain.fragment_pager_info import FragmentPagerInfo
 from ebl.fragmentarium.domain.joins import Join
 from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
 from ebl.fragmentarium.infrastructure.collections import JOINS_COLLECTION
+from ebl.fragmentarium.infrastructure.fragment_neighbours import FragmentNeighbours
 from ebl.fragmentarium.infrastructure.fragment_pattern_matcher import PatternMatcher
+from ebl.fragmentarium.infrastructure.fragment_statistics import (
+    SOURCE_PROJECTION as STATISTICS_PROJECTION,
+    STATISTICS_FIELDS,
+    FragmentStatistics,
+    match_counts,
+)
+from ebl.fragmentarium.infrastructure.fragment_views import VIEW_FIELDS, FragmentViews
+from ebl.fragmentarium.infrastructure.sample_pools import SamplePools, find_pools
 from ebl.fragmentarium.infrastructure.queries import (
     HAS_TRANSLITERATION,
-    aggregate_latest,
-    aggregate_needs_revision,
-    aggregate_path_of_the_pioneers,
-    aggregate_random,
     fragment_is,
     join_joins,
     join_findspots,
     aggregate_by_traditional_references,
+    match_path_of_the_pioneers,
+    match_random,
 )
 from ebl.fragmentarium.infrastructure.queries import match_user_scopes
 from ebl.mongo_collection import MongoCollection
 from ebl.transliteration.application.museum_number_schema import MuseumNumberSchema
 from ebl.transliteration.domain.museum_number import MuseumNumber
-from ebl.transliteration.infrastructure.collections import FRAGMENTS_COLLECTION
+from ebl.transliteration.infrastructure.collections import (
+    FINDSPOTS_COLLECTION,
+    FRAGMENTS_COLLECTION,
+)
 from ebl.transliteration.infrastructure.queries import query_number_is
+from ebl.versions import Versions
 
 
 RETRIEVE_ALL_LIMIT = 1000
+EXPORT_BATCH_SIZE = 1000
+DUPLICATE_KEY_ERROR = 11000
+FIELDS_TO_UPDATE = {
+    "introduction": ("introduction",),
+    "lemmatization": ("text",),
+    "genres": ("genres",),
+    "references": ("references",),
+    "script": ("script",),
+    "notes": ("notes",),
+    "archaeology": ("archaeology",),
+    "transliteration": (
+        "text",
+        "signs",
+        "record",
+        "line_to_vec",
+    ),
+    "date": ("date",),
+    "dates_in_text": ("dates_in_text",),
+}
+
+
+def _numbers_are(numbers: Iterable[MuseumNumber]) -> dict:
+    return {"$or": [query_number_is(number) for number in numbers]}
+
+
+def _get_write_errors(
+    numbers: Sequence[MuseumNumber], details: dict
+) -> Dict[MuseumNumber, WriteError]:
+    return {
+        numbers[error["index"]]: WriteError(error["errmsg"], error["code"], error)
+        for error in details["writeErrors"]
+    }
 
 
 def has_none_values(dictionary: dict) -> bool:
@@ -59,10 +106,32 @@ def load_query_result(cursor: Iterator) -> QueryResult:
     return QueryResultSchema().load(data) if data else QueryResult.create_empty()
 
 
+def omitted_fields(projection: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(set(FragmentSchema().fields) - set(projection))
+
+
+def project_fragment_fields(projection: Sequence[str]) -> dict:
+    schema_fields = FragmentSchema().fields
+    unknown = set(projection) - set(schema_fields)
+    if unknown:
+        raise ValueError(f"Unexpected fragment fields {', '.join(sorted(unknown))}.")
+    return {
+        "museumNumber": True,
+        **{schema_fields[field].data_key or field: True for field in projection},
+    }
+
+
 class MongoFragmentRepository(FragmentRepository):
     def __init__(self, database):
         self._fragments = MongoCollection(database, FRAGMENTS_COLLECTION)
         self._joins = MongoCollection(database, JOINS_COLLECTION)
+        self._findspots = MongoCollection(database, FINDSPOTS_COLLECTION)
+        self._versions = Versions(database)
+        self._references = ReferenceResolver(database)
+        self._neighbours = FragmentNeighbours(database)
+        self._sample_pools = SamplePools(database)
+        self._views = FragmentViews(database)
+        self._statistics = FragmentStatistics(database)
 
     def create_indexes(self) -> None:
         self._fragments.create_index(
@@ -101,39 +170,44 @@ class MongoFragmentRepository(FragmentRepository):
                 ("fragments.museumNumber.suffix", pymongo.ASCENDING),
             ]
         )
+        self._neighbours.create_indexes()
+        self._views.create_indexes()
 
     def count_transliterated_fragments(self, only_authorized=False) -> int:
-        query = HAS_TRANSLITERATION
-        if only_authorized:
-            query = query | {"authorizedScopes": {"$exists": False}}
-        return self._fragments.count_documents(query)
+        return self._statistics.find()[
+            (
+                "publicTransliteratedFragments"
+                if only_authorized
+                else "transliteratedFragments"
+            )
+        ]
 
     def count_lines(self):
-        result = self._fragments.aggregate(
-            [{"$group": {"_id": None, "total": {"$sum": "$text.numberOfLines"}}}]
-        )
-        try:
-            return next(result)["total"]
-        except StopIteration:
-            return 0
+        return self._statistics.find()["lines"]
 
     def create(self, fragment, sort_key=None):
-        return self._fragments.insert_one(
-            {
-                "_id": str(fragment.number),
-                **FragmentSchema(exclude=["joins"]).dump(fragment),
-                **({} if sort_key is None else {"_sortKey": sort_key}),
-            }
-        )
+        document = {
+            "_id": str(fragment.number),
+            **FragmentSchema(exclude=["joins"]).dump(fragment),
+            **({} if sort_key is None else {"_sortKey": sort_key}),
+        }
+        id_ = self._fragments.insert_one(document)
+        self._neighbours.insert([document])
+        self._views.update(document)
+        self._statistics.update(None, document)
+        return id_
 
     def create_many(self, fragments: Sequence[Fragment]) -> Sequence[str]:
         schema = FragmentSchema(exclude=["joins"])
-        return self._fragments.insert_many(
-            [
-                {"_id": str(fragment.number), **schema.dump(fragment)}
-                for fragment in fragments
-            ]
-        )
+        documents = [
+            {"_id": str(fragment.number), **schema.dump(fragment)}
+            for fragment in fragments
+        ]
+        ids = self._fragments.insert_many(documents)
+        self._neighbours.insert(documents)
+        self._views.update_many(documents)
+        self._statistics.update_many((None, document) for document in documents)
+        return ids
 
     def create_join(self, joins: Sequence[Sequence[Join]]) -> None:
         self._joins.insert_one(
@@ -188,16 +262,50 @@ class MongoFragmentRepository(FragmentRepository):
                     else self._filter_fragment_lines(lines)
                 ),
                 *join_findspots(),
-                *join_reference_documents(),
                 *join_joins(),
             ]
         )
         try:
-            fragment_data = next(data)
+            fragment_data = self._references.resolve_one(next(data))
             return FragmentSchema(unknown=EXCLUDE).load(fragment_data)
         except StopIteration as error:
             raise NotFoundError(f"Fragment {number} not found.") from error
 
+    def query_by_museum_numbers(
+        self,
+        numbers: Sequence[MuseumNumber],
+        projection: Optional[Sequence[str]] = None,
+    ) -> List[Fragment]:
+        if not numbers:
+            return []
+        fields = None if projection is None else project_fragment_fields(projection)
+        data = self._fragments.aggregate(
+            [
+                {"$match": {"$or": [query_number_is(number) for number in numbers]}},
+                *([] if fields is None else [{"$project": fields}]),
+                *(
+                    join_findspots()
+                    if fields is None or "archaeology" in fields
+                    else []
+                ),
+                *(join_joins() if fields is None or "joins" in fields else []),
+            ]
+        )
+        if fields is None or "references" in fields:
+            data = self._references.resolve(data)
+        fragments = {
+            fragment.number: fragment
+            for fragment in FragmentSchema(
+                unknown=EXCLUDE,
+                many=True,
+                partial=() if projection is None else omitted_fields(projection),
+            ).load(data)
+        }
+        return [fragments[number] for number in numbers if number in fragments]
+
+    def fetch_version(self, number: MuseumNumber) -> int:
+        return self._versions.find(FRAGMENTS_COLLECTION, str(number)).version
+
     def fetch_date(self, number: MuseumNumber) -> Optional[Date]:
         try:
             if date := self._fragments.find_one(
@@ -226,20 +334,20 @@ class MongoFragmentRepository(FragmentRepository):
         ]
 
     def query_random_by_transliterated(self, user_scopes: Sequence[Scope] = tuple()):
-        cursor = self._fragments.aggregate(
-            [*aggregate_random(user_scopes), {"$project": {"joins": False}}]
-        )
-
-        return self._map_fragments(cursor)
+        return self._query_sample("random", match_random(user_scopes), user_scopes)
 
     def query_path_of_the_pioneers(self, user_scopes: Sequence[Scope] = tuple()):
-        cursor = self._fragments.aggregate(
-            [
-                *aggregate_path_of_the_pioneers(user_scopes),
-                {"$project": {"joins": False}},
-            ]
+        return self._query_sample(
+            "pioneers", match_path_of_the_pioneers(user_scopes), user_scopes
         )
 
+    def _query_sample(
+        self, name: str, pipeline: List[dict], user_scopes: Sequence[Scope]
+    ) -> Sequence[Fragment]:
+        id_ = self._sample_pools.pick(name, pipeline, user_scopes)
+        if id_ is None:
+            return []
+        cursor = self._fragments.find_many({"_id": id_}, projection={"joins": False})
         return self._map_fragments(cursor)
 
     def query_transliterated_numbers(self):
@@ -268,42 +376,209 @@ class MongoFragmentRepository(FragmentRepository):
     def query_by_transliterated_not_revised_by_other(
         self, user_scopes: Sequence[Scope] = tuple()
     ):
-        cursor = self._fragments.aggregate(
-            [*aggregate_needs_revision(user_scopes), {"$project": {"joins": False}}],
-            allowDiskUse=True,
-        )
-        return FragmentInfoSchema(many=True).load(cursor)
-
-    def update_field(self, field, fragment):
-        fields_to_update = {
-            "introduction": ("introduction",),
-            "lemmatization": ("text",),
-            "genres": ("genres",),
-            "references": ("references",),
-            "script": ("script",),
-            "notes": ("notes",),
-            "archaeology": ("archaeology",),
-            "transliteration": (
-                "text",
-                "signs",
-                "record",
-                "line_to_vec",
-            ),
-            "date": ("date",),
-            "dates_in_text": ("dates_in_text",),
-        }
+        return self._views.find_needs_revision(user_scopes)
 
-        if field not in fields_to_update:
+    def update_field(self, field, fragment, version=None):
+        if field not in FIELDS_TO_UPDATE:
             raise ValueError(
-                f"Unexpected update field {field}, must be one of {','.join(fields_to_update)}"
+                f"Unexpected update field {field}, must be one of {','.join(FIELDS_TO_UPDATE)}"
             )
-        query = FragmentSchema(only=fields_to_update[field]).dump(fragment)
-        self._fragments.update_one(
+        query = FragmentSchema(only=FIELDS_TO_UPDATE[field]).dump(fragment)
+        update = query if query else {field: None}
+        id_ = str(fragment.number)
+        if version is not None:
+            self._check_exists(fragment)
+            if not self._versions.increment_if(FRAGMENTS_COLLECTION, id_, version):
+                raise ConflictError(
+                    f"Fragment {fragment.number} has been modified concurrently."
+                )
+        old = self._fragments.find_one_and_update(
             fragment_is(fragment),
-            {"$set": query if query else {field: None}},
+            {"$set": update},
+            return_document=ReturnDocument.BEFORE,
         )
+        if version is None:
+            self._versions.increment(FRAGMENTS_COLLECTION, id_)
+        document = {**old, **update}
+        if field in STATISTICS_FIELDS:
+            self._statistics.update(old, document)
+        self._sample_pools.invalidate(find_pools([field]))
+        if field in VIEW_FIELDS:
+            self._views.update(document)
+        return self._load_updated(document, fragment)
+
+    def _check_exists(self, fragment: Fragment) -> None:
+        if self._fragments.count_documents(fragment_is(fragment)) == 0:
+            raise NotFoundError(f"Fragment {fragment.number} not found.")
+
+    def _load_updated(self, document: dict, fragment: Fragment) -> Fragment:
+        updated = FragmentSchema(unknown=EXCLUDE).load(
+            self._references.resolve_one(document)
+        )
+        archaeology = updated.archaeology
+        if archaeology is not None and archaeology.findspot_id is not None:
+            previous = fragment.archaeology
+            archaeology = attr.evolve(
+                archaeology,
+                findspot=(
+                    previous.findspot
+                    if previous is not None
+                    and previous.findspot_id == archaeology.findspot_id
+                    and previous.findspot is not None
+                    else self._find_findspot(archaeology.findspot_id)
+                ),
+            )
+        return attr.evolve(updated, joins=fragment.joins, archaeology=archaeology)
+
+    def _find_findspot(self, findspot_id: int) -> Optional[Findspot]:
+        document = next(self._findspots.find_many({"_id": findspot_id}).limit(1), None)
+        return None if document is None else FindspotSchema().load(document)
+
+    def bulk_update(
+        self, fields: Sequence[str], fragments: Sequence[Fragment]
+    ) -> List[Tuple[Fragment, Exception]]:
+        keys = [key for key in project_fragment_fields(fields) if key != "museumNumber"]
+        if not fragments:
+            return []
+        schema = FragmentSchema(only=fields)
+        updates = {
+            fragment.number: {**dict.fromkeys(keys, None), **schema.dump(fragment)}
+            for fragment in fragments
+        }
+        updated_fields = {
+            field
+            for field, schema_fields in FIELDS_TO_UPDATE.items()
+            if set(schema_fields) & set(fields)
+        }
+        failed = (
+            self._bulk_update_counted(updates)
+            if updated_fields & set(STATISTICS_FIELDS)
+            else self._bulk_update_uncounted(updates)
+        )
+        if succeeded := [number for number in updates if number not in failed]:
+            self._versions.increment_many(FRAGMENTS_COLLECTION, map(str, succeeded))
+            self._sample_pools.invalidate(find_pools(updated_fields))
+            if updated_fields & set(VIEW_FIELDS):
+                self._views.refresh(_numbers_are(succeeded))
+        return [
+            (fragment, failed[fragment.number])
+            for fragment in fragments
+            if fragment.number in failed
+        ]
+
+    def _bulk_write(self, requests: Dict[MuseumNumber, UpdateOne]) -> dict:
+        """Write the requests unordered and return the details of the result."""
+        if not requests:
+            return {"nMatched": 0, "writeErrors": [], "upserted": []}
+        try:
+            return self._fragments.bulk_write(
+                list(requests.values()), ordered=False
+            ).bulk_api_result
+        except BulkWriteError as error:
+            return error.details
+
+    def _bulk_update_uncounted(
+        self, updates: Dict[MuseumNumber, dict]
+    ) -> Dict[MuseumNumber, Exception]:
+        details = self._bulk_write(
+            {
+                number: UpdateOne(query_number_is(number), {"$set": update})
+                for number, update in updates.items()
+            }
+        )
+        failed = _get_write_errors(list(updates), details)
+        if details["nMatched"] < len(updates) - len(failed):
+            existing = {
+                load_museum_number(document)
+                for document in self._fragments.find_many(
+                    _numbers_are(updates), projection={"museumNumber": True}
+                )
+            }
+            failed.update(
+                (number, NotFoundError(f"Fragment {number} not found."))
+                for number in updates
+                if number not in existing and number not in failed
+            )
+        return failed
+
+    def _bulk_update_counted(
+        self, updates: Dict[MuseumNumber, dict]
+    ) -> Dict[MuseumNumber, Exception]:
+        """Write the updates and add their differences to the statistics.
+
+        Each write is guarded by the counts of the fragment read before and
+        upserts by id, so a fragment modified in between fails with a
+        duplicate key error instead of being written. These fragments are
+        written one by one and their statistics computed from the returned
+        pre-image. Fragments deleted in between are upserted and removed again.
+        """
+        old = self._find_statistics_sources(updates)
+        failed: Dict[MuseumNumber, Exception] = {
+            number: NotFoundError(f"Fragment {number} not found.")
+            for number in updates
+            if number not in old
+        }
+        details = self._bulk_write(
+            {
+                number: UpdateOne(
+                    {
+                        "_id": str(number),
+                        **query_number_is(number),
+                        **match_counts(document),
+                    },
+                    {"$set": updates[number]},
+                    upsert=True,
+                )
+                for number, document in old.items()
+            }
+        )
+        if deleted := [upserted["_id"] for upserted in details["upserted"]]:
+            self._fragments.delete_many({"_id": {"$in": deleted}})
+        write_errors = _get_write_errors(list(old), details)
+        pre_images = {
+            number: document
+            for number, document in old.items()
+            if number not in write_errors and str(number) not in deleted
+        }
+        failed.update(
+            (number, NotFoundError(f"Fragment {number} not found."))
+            for number in old
+            if str(number) in deleted
+        )
+        for number, error in write_errors.items():
+            if error.code != DUPLICATE_KEY_ERROR:
+                failed[number] = error
+                continue
+            try:
+                pre_images[number] = self._fragments.find_one_and_update(
+                    query_number_is(number),
+                    {"$set": updates[number]},
+                    projection=STATISTICS_PROJECTION,
+                    return_document=ReturnDocument.BEFORE,
+                )
+            except NotFoundError as not_found:
+                failed[number] = not_found
+        self._statistics.update_many(
+            (document, {**document, **updates[number]})
+            for number, document in pre_images.items()
+        )
+        return failed
+
+    def _find_statistics_sources(
+        self, numbers: Iterable[MuseumNumber]
+    ) -> Dict[MuseumNumber, dict]:
+        return {
+            load_museum_number(document): document
+            for document in self._statistics.find_sources(_numbers_are(numbers))
+        }
 
     def query_next_and_previous_folio(self, folio_name, folio_number, number):
+        if neighbours := self._neighbours.find_folio(folio_name, folio_number, number):
+            return {"previous": neighbours["previous"], "next": neighbours["next"]}
+        else:
+            return self._scan_next_and_previous_folio(folio_name, folio_number, number)
+
+    def _scan_next_and_previous_folio(self, folio_name, folio_number, number):
         sort_ascending = {"$sort": {"key": 1}}
         sort_descending = {"$sort": {"key": -1}}
 
@@ -388,6 +663,12 @@ class MongoFragmentRepository(FragmentRepository):
     def query_next_and_previous_fragment(
         self, museum_number: MuseumNumber
     ) -> FragmentPagerInfo:
+        if neighbours := self._neighbours.find_fragment(museum_number):
+            return FragmentPagerInfo(
+                load_museum_number(neighbours["previous"]),
+                load_museum_number(neighbours["next"]),
+            )
+
         current = self._fragments.find_one(
             {
                 "museumNumber.prefix": museum_number.prefix,
@@ -422,14 +703,7 @@ class MongoFragmentRepository(FragmentRepository):
         return load_query_result(cursor)
 
     def query_latest(self, user_scopes: Sequence[Scope] = tuple()) -> QueryResult:
-        return load_query_result(
-            self._fragments.aggregate(
-                aggregate_latest(user_scopes),
-                collation=Collation(
-                    locale="en", numericOrdering=True, alternate="shifted"
-                ),
-            )
-        )
+        return self._views.find_latest(user_scopes)
 
     def query_by_traditional_references(
         self,
@@ -471,6 +745,7 @@ class MongoFragmentRepository(FragmentRepository):
                         "legacyJoins": 0,
                         "legacyScript": 0,
                         "_sortKey": 0,
+                        "version": 0,
                     }
                 },
                 {"$skip": skip},
@@ -479,6 +754,37 @@ class MongoFragmentRepository(FragmentRepository):
         )
         return list(fragments)
 
+    def export_transliterated_fragments(
+        self,
+        fields: Sequence[str],
+        user_scopes: Sequence[Scope] = tuple(),
+        after: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[dict]:
+        return self._iterate_by_id(
+            {**HAS_TRANSLITERATION, **match_user_scopes(user_scopes)},
+            project_fragment_fields(fields),
+            after,
+            batch_size,
+        )
+
+    def _iterate_by_id(
+        self, query: dict, projection: dict, after: Optional[str], batch_size: int
+    ) -> Iterator[dict]:
+        while True:
+            batch = list(
+                self._fragments.find_many(
+                    query if after is None else {**query, "_id": {"$gt": after}},
+                    projection=projection,
+                )
+                .sort("_id", pymongo.ASCENDING)
+                .limit(batch_size)
+            )
+            yield from batch
+            if len(batch) < batch_size:
+                break
+            after = batch[-1]["_id"]
+
     def fetch_fragment_signs(self) -> Sequence[dict]:
         return list(
             self._fragments.find_many(
@@ -1,10 +1,9 @@
-from typing import List, Sequence, Dict
+from typing import List, Sequence
 from ebl.common.domain.accession import Accession
 from ebl.common.domain.scopes import Scope
 from ebl.fragmentarium.domain.archaeology import ExcavationNumber
 
 from ebl.fragmentarium.domain.fragment import Fragment
-from ebl.fragmentarium.domain.record import RecordType
 from ebl.fragmentarium.infrastructure.collections import JOINS_COLLECTION
 from ebl.transliteration.domain.museum_number import MuseumNumber
 from ebl.transliteration.infrastructure.collections import (
@@ -35,10 +34,6 @@ def number_is(number: str) -> dict:
     return {"$or": or_}
 
 
-def sample_size_one() -> dict:
-    return {"$sample": {"size": 1}}
-
-
 def match_user_scopes(user_scopes: Sequence[Scope] = tuple()) -> dict:
     allowed_scopes: List[dict] = [
         {"authorizedScopes": {"$exists": False}},
@@ -53,167 +48,11 @@ def match_user_scopes(user_scopes: Sequence[Scope] = tuple()) -> dict:
     return {"$or": allowed_scopes}
 
 
-def aggregate_random(user_scopes: Sequence[Scope] = tuple()) -> List[dict]:
-    return [
-        {"$match": {**HAS_TRANSLITERATION, **match_user_scopes(user_scopes)}},
-        sample_size_one(),
-    ]
-
-
-def aggregate_latest(
-    user_scopes: Sequence[Scope] = tuple(),
-) -> List[Dict]:
-    tmp_record = "_tmpRecord"
-    return [
-        {
-            "$match": {
-                "record.type": RecordType.TRANSLITERATION.value,
-                **match_user_scopes(user_scopes),
-            }
-        },
-        {
-            "$project": {
-                tmp_record: {
-                    "$filter": {
-                        "input": "$record",
-                        "as": "entry",
-                        "cond": {
-                            "$eq": [
-                                "$$entry.type",
-                                RecordType.TRANSLITERATION.value,
-                            ]
-                        },
-                    }
-                },
-                "lineType": "$text.lines.type",
-                "museumNumber": 1,
-            }
-        },
-        {"$sort": {f"{tmp_record}.date": -1}},
-        {"$limit": LATEST_TRANSLITERATION_LIMIT},
-        {
-            "$unwind": {
-                "path": "$lineType",
-                "includeArrayIndex": "lineIndex",
-            }
-        },
-        {"$match": {"lineType": "TextLine"}},
-        {
-            "$group": {
-                "_id": "$_id",
-                "museumNumber": {"$first": "$museumNumber"},
-                "matchingLines": {"$push": "$lineIndex"},
-                tmp_record: {"$first": f"${tmp_record}"},
-            }
-        },
-        {"$sort": {f"{tmp_record}.date": -1}},
-        {
-            "$project": {
-                "_id": False,
-                "museumNumber": True,
-                "matchCount": {"$literal": 0},
-                "matchingLines": {
-                    "$slice": [
-                        "$matchingLines",
-                        0,
-                        LATEST_TRANSLITERATION_LINE_LIMIT,
-                    ]
-                },
-            }
-        },
-        {
-            "$group": {
-                "_id": None,
-                "items": {"$push": "$$ROOT"},
-            }
-        },
-        {"$project": {"_id": False, "items": 1, "matchCountTotal": {"$literal": 0}}},
-    ]
-
-
-def aggregate_needs_revision(user_scopes: Sequence[Scope] = tuple()) -> List[dict]:
-    return [
-        {
-            "$match": {
-                "record.type": "Transliteration",
-                **HAS_TRANSLITERATION,
-                **match_user_scopes(user_scopes),
-            }
-        },
-        {"$unwind": "$record"},
-        {"$sort": {"record.date": 1}},
-        {
-            "$group": {
-                "_id": "$museumNumber",
-                "accession": {"$first": "$accession"},
-                "description": {"$first": "$description"},
-                "script": {"$first": "$script"},
-                "record": {"$push": "$record"},
-            }
-        },
-        {
-            "$addFields": {
-                "transliterations": {
-                    "$filter": {
-                        "input": "$record",
-                        "as": "item",
-                        "cond": {"$eq": ["$$item.type", "Transliteration"]},
-                    }
-                },
-                "revisions": {
-                    "$filter": {
-                        "input": "$record",
-                        "as": "item",
-                        "cond": {"$eq": ["$$item.type", "Revision"]},
-                    }
-                },
-            }
-        },
-        {
-            "$addFields": {
-                "transliterators": {
-                    "$map": {
-                        "input": "$transliterations",
-                        "as": "item",
-                        "in": "$$item.user",
-                    }
-                },
-                "transliterationDates": {
-                    "$map": {
-                        "input": "$transliterations",
-                        "as": "item",
-                        "in": "$$item.date",
-                    }
-                },
-                "revisors": {
-                    "$map": {"input": "$revisions", "as": "item", "in": "$$item.user"}
-                },
-            }
-        },
-        {
-            "$match": {
-                "$expr": {
-                    "$eq": [{"$setDifference": ["$revisors", "$transliterators"]}, []]
-                }
-            }
-        },
-        {
-            "$project": {
-                "_id": 0,
-                "number": "$_id",
-                "accession": 1,
-                "description": 1,
-                "script": 1,
-                "editionDate": {"$arrayElemAt": ["$transliterationDates", 0]},
-                "editor": {"$arrayElemAt": ["$transliterators", 0]},
-            }
-        },
-        {"$sort": {"editionDate": 1}},
-        {"$limit": NUMBER_OF_NEEDS_REVISION},
-    ]
+def match_random(user_scopes: Sequence[Scope] = tuple()) -> List[dict]:
+    return [{"$match": {**HAS_TRANSLITERATION, **match_user_scopes(user_scopes)}}]
 
 
-def aggregate_path_of_the_pioneers(
+def match_path_of_the_pioneers(
     user_scopes: Sequence[Scope] = tuple(),
 ) -> List[dict]:
     max_uncurated_reference = (
@@ -261,7 +100,6 @@ def aggregate_path_of_the_pioneers(
         },
         {"$match": {"photos.0": {"$exists": True}}},
         {"$project": {"photos": 0, "filename": 0}},
-        sample_size_one(),
     ]
 
 
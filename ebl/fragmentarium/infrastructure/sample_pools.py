@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import attr
+
+from ebl.cache.application.single_flight import SingleFlight
+from ebl.common.domain.scopes import Scope
+from ebl.mongo_collection import MongoCollection
+from ebl.transliteration.infrastructure.collections import FRAGMENTS_COLLECTION
+from ebl.versions import Versions
+
+REFRESH_SECONDS = 10 * 60
+POOLS = "sample_pools"
+POOL_FIELDS = {
+    "random": ("transliteration",),
+    "pioneers": ("transliteration", "notes", "references"),
+}
+
+
+def find_pools(fields: Iterable[str]) -> List[str]:
+    fields = set(fields)
+    return [
+        name for name, pool_fields in POOL_FIELDS.items() if fields & set(pool_fields)
+    ]
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Pool:
+    ids: Tuple[str, ...]
+    generation: int
+    created: float
+
+
+class SamplePools:
+    """Pools of eligible fragment ids for picking random fragments.
+
+    A pool is kept in memory for each query and set of user scopes. Pools are
+    rebuilt after `refresh_seconds` and when `invalidate` is called for them,
+    e.g. after a transliteration is updated in any process. A stale pool is
+    served while it is rebuilt in the background and each pool is rebuilt by
+    only one thread at a time.
+    """
+
+    def __init__(
+        self,
+        database,
+        refresh_seconds: float = REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fragments = MongoCollection(database, FRAGMENTS_COLLECTION)
+        self._versions = Versions(database)
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._pools: Dict[Tuple[str, Tuple[str, ...]], Pool] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def pick(
+        self, name: str, pipeline: List[dict], user_scopes: Sequence[Scope] = ()
+    ) -> Optional[str]:
+        ids = self._get_pool(name, pipeline, user_scopes).ids
+        return random.choice(ids) if ids else None
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._versions.increment(POOLS, name)
+
+    def _get_pool(
+        self, name: str, pipeline: List[dict], user_scopes: Sequence[Scope]
+    ) -> Pool:
+        key = (name, tuple(sorted(scope.scope_name for scope in user_scopes)))
+        generation = self._versions.find(POOLS, name).version
+        pool = self._pools.get(key)
+        if pool is None or (not pool.ids and self._is_stale(pool, generation)):
+            pool = self._flight.do(key, lambda: self._build(key, pipeline, generation))
+        elif self._is_stale(pool, generation):
+            self._flight.do_in_background(
+                key, lambda: self._build(key, pipeline, generation)
+            )
+        return pool
+
+    def _is_stale(self, pool: Pool, generation: int) -> bool:
+        return (
+            pool.generation != generation
+            or self._clock() - pool.created > self._refresh_seconds
+        )
+
+    def _build(
+        self, key: Tuple[str, Tuple[str, ...]], pipeline: List[dict], generation: int
+    ) -> Pool:
+        pool = Pool(self._find_ids(pipeline), generation, self._clock())
+        with self._lock:
+            self._pools[key] = pool
+        return pool
+
+    def _find_ids(self, pipeline: List[dict]) -> Tuple[str, ...]:
+        return tuple(
+            document["_id"]
+            for document in self._fragments.aggregate(
+                [*pipeline, {"$project": {"_id": True}}], allowDiskUse=True
+            )
+        )
@@ -0,0 +1,27 @@
+import argparse
+import os
+from typing import Dict
+
+from pymongo import MongoClient
+
+from ebl.fragmentarium.infrastructure.fragment_statistics import FragmentStatistics
+
+
+def to_text(drift: Dict[str, int]) -> str:
+    return (
+        "\n".join(f"{counter}\t{delta:+d}" for counter, delta in drift.items())
+        if drift
+        else "No drift."
+    )
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(
+        description="Recompute the fragmentarium statistics from the fragments "
+        "and report how far the maintained counters had drifted. "
+        "MONGODB_URI environment variable must be set."
+    ).parse_args()
+
+    client = MongoClient(os.environ["MONGODB_URI"])
+    database = client.get_database(os.environ.get("MONGODB_DB"))
+    print(to_text(FragmentStatistics(database).reconcile()))
@@ -1,15 +1,21 @@
 import argparse
 from functools import reduce
 from multiprocessing import Pool
-from typing import List
+from typing import List, Sequence
 
 import attr
+import pydash
+from pymongo.errors import WriteError
 from tqdm import tqdm
 
 from ebl.app import create_context
 from ebl.context import Context
+from ebl.errors import NotFoundError
 from ebl.fragmentarium.application.fragment_repository import FragmentRepository
-from ebl.fragmentarium.application.fragment_updater import FragmentUpdater
+from ebl.fragmentarium.application.fragment_updater import (
+    TRANSLITERATION_FIELDS,
+    FragmentUpdater,
+)
 from ebl.fragmentarium.application.transliteration_update_factory import (
     TransliterationUpdateFactory,
 )
@@ -21,17 +27,14 @@ from ebl.transliteration.domain.transliteration_error import TransliterationErro
 
 from ebl.users.domain.user import ApiUser
 
+UPDATE_FIELDS = (*TRANSLITERATION_FIELDS, "introduction", "notes")
+BATCH_SIZE = 500
 
-def update_fragment(
-    transliteration_factory: TransliterationUpdateFactory,
-    updater: FragmentUpdater,
-    fragment: Fragment,
-) -> None:
-    transliteration = transliteration_factory.create(fragment.text.atf)
-    user = ApiUser("update_fragments.py")
-    updater.update_transliteration(fragment.number, transliteration, user, True)
-    updater.update_introduction(fragment.number, fragment.introduction.text, user)
-    updater.update_notes(fragment.number, fragment.notes.text, user)
+
+def reparse_markup(fragment: Fragment) -> Fragment:
+    return fragment.set_introduction(fragment.introduction.text).set_notes(
+        fragment.notes.text
+    )
 
 
 def find_transliterated(fragment_repository: FragmentRepository) -> List[MuseumNumber]:
@@ -44,16 +47,21 @@ class State:
     invalid_lemmas: int = 0
     invalid_fragment_query: int = 0
     updated: int = 0
+    failed_writes: int = 0
     errors: List[str] = attr.ib(factory=list)
 
-    def add_updated(self) -> None:
-        self.updated += 1
+    def add_updated(self, count: int = 1) -> None:
+        self.updated += count
 
     def add_error(self, error: Exception, fragment: Fragment) -> None:
         if isinstance(error, LemmatizationError):
             self._add_lemmatization_error(error, fragment)
         elif isinstance(error, TransliterationError):
             self._add_transliteration_error(error, fragment)
+        elif isinstance(error, NotFoundError):
+            self.add_querying_error(error, str(fragment.number))
+        elif isinstance(error, WriteError):
+            self._add_write_error(error, fragment)
         else:
             self._add_error(error, fragment)
 
@@ -76,6 +84,10 @@ class State:
             number = fragment.number if index == 0 else len(str(fragment.number)) * " "
             self.errors.append(f"{number}\t{atf}\t{error}")
 
+    def _add_write_error(self, error: WriteError, fragment: Fragment) -> None:
+        self.failed_writes += 1
+        self.errors.append(f"{fragment.number}\t\t{error}")
+
     def _add_error(self, error: Exception, fragment: Fragment) -> None:
         self.invalid_atf += 1
         self.errors.append(f"{fragment.number}\t\t{error}")
@@ -88,6 +100,7 @@ class State:
                 f"# Invalid ATF: {self.invalid_atf}",
                 f"# Invalid lemmas: {self.invalid_lemmas}",
                 f"# Invalid fragment querys: {self.invalid_fragment_query}",
+                f"# Failed writes: {self.failed_writes}",
             ]
         )
 
@@ -97,25 +110,62 @@ class State:
             self.invalid_lemmas + other.invalid_lemmas,
             self.invalid_fragment_query + other.invalid_fragment_query,
             self.updated + other.updated,
+            self.failed_writes + other.failed_writes,
             self.errors + other.errors,
         )
 
 
-def update(number: MuseumNumber) -> State:
+def update_fragments(
+    transliteration_factory: TransliterationUpdateFactory,
+    updater: FragmentUpdater,
+    fragments: Sequence[Fragment],
+    state: State,
+) -> None:
+    user = ApiUser("update_fragments.py")
+    transliterations = []
+    for fragment in fragments:
+        try:
+            transliterations.append(
+                (fragment, transliteration_factory.create(fragment.text.atf))
+            )
+        except Exception as error:
+            state.add_error(error, fragment)
+
+    errors = updater.bulk_update_transliterations(transliterations, user)
+    failed = {fragment.number for fragment, _ in errors}
+    errors += updater.bulk_update(
+        ["introduction", "notes"],
+        [
+            (fragment, reparse_markup)
+            for fragment, _ in transliterations
+            if fragment.number not in failed
+        ],
+        user,
+    )
+
+    for fragment, error in errors:
+        state.add_error(error, fragment)
+    state.add_updated(len(transliterations) - len(errors))
+
+
+def update(numbers: Sequence[MuseumNumber]) -> State:
     context = create_context_()
     fragment_repository = context.fragment_repository
     transliteration_factory = context.get_transliteration_update_factory()
     updater = context.get_fragment_updater()
     state = State()
     try:
-        fragment = fragment_repository.query_by_museum_number(number)
-        try:
-            update_fragment(transliteration_factory, updater, fragment)
-            state.add_updated()
-        except Exception as error:
-            state.add_error(error, fragment)
+        fragments = fragment_repository.query_by_museum_numbers(numbers, UPDATE_FIELDS)
+        found = {fragment.number for fragment in fragments}
+        for number in numbers:
+            if number not in found:
+                state.add_querying_error(
+                    NotFoundError(f"Fragment {number} not found."), str(number)
+                )
+        update_fragments(transliteration_factory, updater, fragments, state)
     except Exception as error:
-        state.add_querying_error(error, str(number))
+        for number in numbers:
+            state.add_querying_error(error, str(number))
 
     return state
 
@@ -140,9 +190,10 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     numbers = find_transliterated(create_context_().fragment_repository)
+    batches = pydash.chunk(numbers, BATCH_SIZE)
 
     with Pool(processes=args.workers) as pool:
-        states = tqdm(pool.imap_unordered(update, numbers), total=len(numbers))
+        states = tqdm(pool.imap_unordered(update, batches), total=len(batches))
         final_state = reduce(
             lambda accumulator, state: accumulator.merge(state), states, State()
         )
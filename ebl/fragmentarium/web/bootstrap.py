@@ -1,5 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import falcon
 
+from ebl.alignment.application.alignment_service import (
+    MAX_WORKERS,
+    AlignmentService,
+)
+from ebl.alignment.web.alignments import AlignmentJobResource, AlignmentJobsResource
 from ebl.context import Context
 from ebl.dictionary.application.dictionary_service import Dictionary
 from ebl.fragmentarium.application.annotations_service import AnnotationsService
@@ -16,6 +23,7 @@ from ebl.fragmentarium.web.fragment_date import (
     FragmentDateResource,
     FragmentDatesInTextResource,
 )
+from ebl.fragmentarium.web.fragment_export import FragmentsExportResource
 from ebl.fragmentarium.web.fragment_matcher import FragmentMatcherResource
 from ebl.fragmentarium.web.fragment_pager import make_fragment_pager_resource
 from ebl.fragmentarium.web.fragment_search import FragmentSearch
@@ -24,7 +32,7 @@ from ebl.fragmentarium.web.fragments import (
     FragmentsResource,
     FragmentsListResource,
     FragmentsRetrieveAllResource,
-    make_latest_additions_resource,
+    LatestAdditionsResource,
     make_all_fragment_signs_resource,
 )
 from ebl.fragmentarium.web.genres import GenresResource
@@ -85,6 +93,15 @@ def create_fragmentarium_routes(api: falcon.App, context: Context):
     fragment_date = FragmentDateResource(updater)
     fragment_dates_in_text = FragmentDatesInTextResource(updater)
 
+    alignment_service = AlignmentService(
+        context.fragment_repository,
+        context.text_repository,
+        context.custom_cache,
+        ThreadPoolExecutor(max_workers=MAX_WORKERS),
+    )
+    alignment_jobs = AlignmentJobsResource(alignment_service)
+    alignment_job = AlignmentJobResource(alignment_service)
+
     fragment_matcher = FragmentMatcherResource(
         FragmentMatcher(context.fragment_repository)
     )
@@ -92,7 +109,6 @@ def create_fragmentarium_routes(api: falcon.App, context: Context):
         fragmentarium,
         finder,
         context.get_transliteration_query_factory(),
-        context.cache,
     )
     fragment_query = FragmentsQueryResource(
         context.fragment_repository, context.get_transliteration_query_factory()
@@ -100,9 +116,7 @@ def create_fragmentarium_routes(api: falcon.App, context: Context):
     afo_register_fragments_query = AfoRegisterFragmentsQueryResource(
         context.fragment_repository, finder
     )
-    latest_additions_query = make_latest_additions_resource(
-        context.fragment_repository, context.cache
-    )
+    latest_additions_query = LatestAdditionsResource(context.fragment_repository)
     genres = GenresResource()
     provenances = ProvenancesResource()
     periods = PeriodsResource()
@@ -123,6 +137,7 @@ def create_fragmentarium_routes(api: falcon.App, context: Context):
     findspots = FindspotResource(context.findspot_repository)
 
     all_fragments = FragmentsListResource(context.fragment_repository)
+    fragments_export = FragmentsExportResource(context.fragment_repository)
     all_signs = make_all_fragment_signs_resource(
         context.fragment_repository, context.cache
     )
@@ -131,6 +146,8 @@ def create_fragmentarium_routes(api: falcon.App, context: Context):
         ("/fragments", fragment_search),
         ("/fragments/retrieve-all", fragments_retrieve_all),
         ("/fragments/{number}/match", fragment_matcher),
+        ("/fragments/{number}/alignments", alignment_jobs),
+        ("/fragments/{number}/alignments/{job_id}", alignment_job),
         ("/fragments/{number}/genres", fragment_genre),
         ("/fragments/{number}/script", fragment_script),
         ("/fragments/{number}/date", fragment_date),
@@ -158,6 +175,7 @@ def create_fragmentarium_routes(api: falcon.App, context: Context):
         ("/fragments/latest", latest_additions_query),
         ("/fragments/all", all_fragments),
         ("/fragments/all-signs", all_signs),
+        ("/fragments/export", fragments_export),
         ("/findspots", findspots),
     ]
 
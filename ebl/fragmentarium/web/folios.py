@@ -1,6 +1,7 @@
 import falcon
 from falcon import Request, Response
 
+from ebl.files.web.files import stream_file
 from ebl.fragmentarium.application.fragment_finder import FragmentFinder
 from ebl.fragmentarium.domain.folios import Folio
 from ebl.users.web.require_scope import require_folio_scope
@@ -12,8 +13,4 @@ class FoliosResource:
 
     @falcon.before(require_folio_scope)
     def on_get(self, req: Request, resp: Response, name: str, number: str):
-        file = self._finder.find_folio(Folio(name, number))
-
-        resp.content_type = file.content_type
-        resp.content_length = file.length
-        resp.stream = file
+        stream_file(req, resp, self._finder.find_folio(Folio(name, number)))
@@ -0,0 +1,57 @@
+import json
+import zlib
+from typing import Iterable, Iterator
+
+from falcon import Request, Response
+
+from ebl.errors import DataError
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+
+NDJSON = "application/x-ndjson"
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def to_ndjson(documents: Iterable[dict]) -> Iterator[bytes]:
+    for document in documents:
+        yield f"{json.dumps(document)}\n".encode()
+
+
+def gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(req: Request) -> bool:
+    return "gzip" in (req.get_header("Accept-Encoding") or "")
+
+
+class FragmentsExportResource:
+    """Streams the transliterated fragments as newline delimited JSON.
+
+    The fragments are ordered by `_id`. An interrupted download can be resumed
+    by passing the `_id` of the last received fragment as `after`.
+    """
+
+    def __init__(self, repository: FragmentRepository):
+        self._repository = repository
+
+    def on_get(self, req: Request, resp: Response) -> None:
+        try:
+            fragments = self._repository.export_transliterated_fragments(
+                req.get_param_as_list("fields", required=True),
+                req.context.user.get_scopes(prefix="read:", suffix="-fragments"),
+                req.get_param("after"),
+            )
+        except ValueError as error:
+            raise DataError(str(error)) from error
+
+        chunks = to_ndjson(fragments)
+        resp.content_type = NDJSON
+        resp.vary = ("Accept-Encoding",)
+        if accepts_gzip(req):
+            resp.set_header("Content-Encoding", "gzip")
+            chunks = gzip(chunks)
+        resp.stream = chunks
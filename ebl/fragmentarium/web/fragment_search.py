@@ -1,10 +1,8 @@
-from typing import Tuple, Sequence
+from typing import Tuple
 
 import falcon
-from falcon_caching import Cache
 
-from ebl.cache.application.cache import DEFAULT_TIMEOUT, cache_control
-from ebl.common.domain.scopes import Scope
+from ebl.cache.application.cache import cache_control
 from ebl.dispatcher import create_dispatcher
 from ebl.errors import DataError
 from ebl.fragmentarium.application.fragment_finder import FragmentFinder
@@ -12,11 +10,13 @@ from ebl.fragmentarium.application.fragment_info_schema import (
     ApiFragmentInfoSchema,
 )
 from ebl.fragmentarium.application.fragmentarium import Fragmentarium
+from ebl.fragmentarium.web.dtos import create_response_dto, parse_museum_number
 from ebl.transliteration.application.transliteration_query_factory import (
     TransliterationQueryFactory,
 )
 
 CACHED_COMMANDS = frozenset({"needsRevision"})
+MAX_NUMBERS = 100
 
 
 class FragmentSearch:
@@ -25,19 +25,17 @@ class FragmentSearch:
         fragmentarium: Fragmentarium,
         finder: FragmentFinder,
         transliteration_query_factory: TransliterationQueryFactory,
-        cache: Cache,
     ):
-        @cache.memoize(DEFAULT_TIMEOUT)
-        def find_needs_revision(user_scopes: Sequence[Scope] = tuple()):
-            return fragmentarium.find_needs_revision(user_scopes)
-
         self.api_fragment_info_schema = ApiFragmentInfoSchema(many=True)
+        self._finder = finder
         self._transliteration_query_factory = transliteration_query_factory
         self._dispatch = create_dispatcher(
             {
                 frozenset(["random"]): lambda _: finder.find_random,
                 frozenset(["interesting"]): lambda _: finder.find_interesting,
-                frozenset(["needsRevision"]): lambda _: find_needs_revision,
+                frozenset(
+                    ["needsRevision"]
+                ): lambda _: fragmentarium.find_needs_revision,
             }
         )
 
@@ -67,8 +65,25 @@ class FragmentSearch:
         when=lambda req, _: req.params.keys() <= CACHED_COMMANDS,
     )
     def on_get(self, req: falcon.Request, resp: falcon.Response) -> None:
-        resp.media = self.api_fragment_info_schema.dump(
-            self._dispatch(req.params)(
-                req.context.user.get_scopes(prefix="read:", suffix="-fragments")
+        if "numbers" in req.params:
+            resp.media = self._find_many(req)
+        else:
+            resp.media = self.api_fragment_info_schema.dump(
+                self._dispatch(req.params)(
+                    req.context.user.get_scopes(prefix="read:", suffix="-fragments")
+                )
             )
-        )
+
+    def _find_many(self, req: falcon.Request) -> list:
+        numbers = [
+            parse_museum_number(number)
+            for number in req.get_param_as_list("numbers", default=[])
+        ]
+        if len(numbers) > MAX_NUMBERS:
+            raise DataError(f"At most {MAX_NUMBERS} fragments can be fetched at once.")
+        user = req.context.user
+        return [
+            create_response_dto(fragment, user, has_photo)
+            for fragment, has_photo in self._finder.find_many(numbers)
+            if user.can_read_fragment(fragment.authorized_scopes or [])
+        ]
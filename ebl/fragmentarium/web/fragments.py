@@ -118,27 +118,21 @@ class FragmentsListResource:
         resp.media = self._repository.list_all_fragments()
 
 
-def make_latest_additions_resource(repository: FragmentRepository, cache: Cache):
-    class LatestAdditionsResource:
-        def __init__(
-            self,
-            repository: FragmentRepository,
-        ):
-            self._repository = repository
+class LatestAdditionsResource:
+    def __init__(
+        self,
+        repository: FragmentRepository,
+    ):
+        self._repository = repository
 
-        @cache.cached(timeout=DEFAULT_TIMEOUT)
-        def on_get(self, req: Request, resp: Response):
-            resp.text = json.dumps(
-                QueryResultSchema().dump(
-                    self._repository.query_latest(
-                        req.context.user.get_scopes(
-                            prefix="read:", suffix="-fragments"
-                        ),
-                    )
+    def on_get(self, req: Request, resp: Response):
+        resp.text = json.dumps(
+            QueryResultSchema().dump(
+                self._repository.query_latest(
+                    req.context.user.get_scopes(prefix="read:", suffix="-fragments"),
                 )
             )
-
-    return LatestAdditionsResource(repository)
+        )
 
 
 def make_all_fragment_signs_resource(repository: FragmentRepository, cache: Cache):
@@ -1,7 +1,8 @@
 from typing import Optional
 import falcon
-from falcon import Response
+from falcon import Request, Response
 
+from ebl.files.web.files import stream_file
 from ebl.fragmentarium.application.fragment_finder import FragmentFinder, ThumbnailSize
 from ebl.users.web.require_scope import require_fragment_read_scope
 
@@ -12,7 +13,11 @@ class PhotoResource:
 
     @falcon.before(require_fragment_read_scope)
     def on_get(
-        self, _req, resp: Response, number: str, resolution: Optional[str] = None
+        self,
+        req: Request,
+        resp: Response,
+        number: str,
+        resolution: Optional[str] = None,
     ):
         if resolution is None:
             file = self._finder.find_photo(number)
@@ -20,6 +25,4 @@ class PhotoResource:
             width = ThumbnailSize.from_string(resolution)
             file = self._finder.find_thumbnail(number, width)
 
-        resp.content_type = file.content_type
-        resp.content_length = file.length
-        resp.stream = file
+        stream_file(req, resp, file)
@@ -1,19 +1,27 @@
 import json
+from typing import Callable, Dict
 
 import falcon
 from falcon_caching import Cache
 from falcon_caching.utils import register
 
 from ebl.cache.application.cache import DEFAULT_TIMEOUT, cache_control
+from ebl.cache.application.single_flight import memoize
 from ebl.fragmentarium.application.fragmentarium import Fragmentarium
 
 
+def memoize_statistics(
+    cache: Cache, fragmentarium: Fragmentarium
+) -> Callable[[], Dict[str, int]]:
+    return memoize(cache, DEFAULT_TIMEOUT, DEFAULT_TIMEOUT)(fragmentarium.statistics)
+
+
 def make_statistics_resource(cache: Cache, fragmentarium: Fragmentarium):
     class StatisticsResource:
         auth = {"auth_disabled": True}
 
         def __init__(self, fragmentarium: Fragmentarium):
-            self._fragmentarium = fragmentarium
+            self._statistics = memoize_statistics(cache, fragmentarium)
 
         @register(
             cache_control(["public", f"max-age={DEFAULT_TIMEOUT}"]),
@@ -21,6 +29,6 @@ def make_statistics_resource(cache: Cache, fragmentarium: Fragmentarium):
         )
         def on_get(self, _req, resp: falcon.Response) -> None:
             # Falcon-Caching 1.0.1 does not cache resp.media.
-            resp.text = json.dumps(self._fragmentarium.statistics())
+            resp.text = json.dumps(self._statistics())
 
     return StatisticsResource(fragmentarium)
@@ -8,6 +8,10 @@ from pymongo import MongoClient
 import pymongo
 from ebl.common.query.util import sort_by_museum_number
 from ebl.fragmentarium.application.fragment_schema import FragmentSchema
+from ebl.fragmentarium.infrastructure.fragment_neighbours import FragmentNeighbours
+from ebl.fragmentarium.infrastructure.fragment_statistics import FragmentStatistics
+from ebl.fragmentarium.reconcile_statistics import to_text
+from ebl.fragmentarium.infrastructure.fragment_views import FragmentViews
 from ebl.mongo_collection import MongoCollection
 from ebl.transliteration.domain.museum_number import MuseumNumber
 from ebl.transliteration.infrastructure.collections import FRAGMENTS_COLLECTION
@@ -112,6 +116,18 @@ def create_sort_index(fragments_collection: MongoCollection) -> None:
     fragments_collection.create_index([("_sortKey", pymongo.ASCENDING)])
 
 
+def update_neighbours(database) -> None:
+    neighbours = FragmentNeighbours(database)
+    neighbours.create_indexes()
+    neighbours.rebuild()
+
+
+def update_views(database) -> None:
+    views = FragmentViews(database)
+    views.create_indexes()
+    views.rebuild()
+
+
 def write_to_db(
     fragments: Sequence[dict], fragments_collection: MongoCollection
 ) -> List:
@@ -185,7 +201,10 @@ if __name__ == "__main__":
         parents=[_input_parser, _output_parser],
     )
 
-    index_info = "Rebuild the sort index"
+    index_info = (
+        "Rebuild the sort index, the pager links, the fragment views "
+        "and the statistics"
+    )
     index_parser = subparsers.add_parser(
         INDEX_CMD,
         help=index_info,
@@ -201,6 +220,15 @@ if __name__ == "__main__":
         print("Creating the sort index...")
         create_sort_index(collection)
 
+        print("Linking the fragment and folio pagers...")
+        update_neighbours(TARGET_DB)
+
+        print("Rebuilding the needs revision and latest transliterations views...")
+        update_views(TARGET_DB)
+
+        print("Reconciling the statistics...")
+        print(to_text(FragmentStatistics(TARGET_DB).reconcile()))
+
         print("Sort index built successfully.")
 
     args = parser.parse_args()
@@ -2,10 +2,12 @@ import falcon
 from falcon import Request, Response
 from falcon_caching import Cache
 import json
+import time
 
 from ebl.context import Context
 from ebl.markup.domain.converters import markup_string_to_json
 from ebl.cache.application.cache import DAILY_TIMEOUT
+from ebl.cache.application.cache_metrics import cache_metrics
 
 
 class Markup:
@@ -16,6 +18,8 @@ class Markup:
 
 
 class CachedMarkup(Markup):
+    NAMESPACE = "markup"
+
     def __init__(self, cache: Cache):
         self._cache = cache
 
@@ -23,10 +27,15 @@ class CachedMarkup(Markup):
         cache_key = req.params["text"]
 
         if cached := self._cache.get(cache_key):
+            cache_metrics.hit(self.NAMESPACE)
             resp.text = cached
         else:
+            cache_metrics.miss(self.NAMESPACE)
+            start = time.perf_counter()
             data = json.dumps(markup_string_to_json(req.params["text"]))
+            cache_metrics.compute(self.NAMESPACE, time.perf_counter() - start)
             self._cache.set(cache_key, data, timeout=DAILY_TIMEOUT)
+            cache_metrics.set(self.NAMESPACE, len(data))
             resp.text = data
 
 
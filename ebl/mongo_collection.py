@@ -82,9 +82,19 @@ class MongoCollection:
         else:
             return result
 
+    def find_one_and_update(self, query, update, **kwargs):
+        document = self.__get_collection().find_one_and_update(query, update, **kwargs)
+        if document is None:
+            raise self.__not_found_error(query)
+        else:
+            return document
+
     def update_many(self, query, update, **kwargs):
         return self.__get_collection().update_many(query, update, **kwargs)
 
+    def bulk_write(self, requests: Sequence, ordered=True):
+        return self.__get_collection().bulk_write(requests, ordered=ordered)
+
     def count_documents(self, query) -> int:
         return self.__get_collection().count_documents(query)
 
@@ -1,5 +1,5 @@
 from alignment.vocabulary import Vocabulary
-from hamcrest import assert_that, has_properties, contains_exactly
+from hamcrest import assert_that, has_properties, contains_exactly, has_length
 
 from ebl.alignment.application.align import align, align_pair
 from ebl.alignment.domain.sequence import NamedSequence
@@ -31,3 +31,22 @@ def test_align() -> None:
         result,
         contains_exactly(has_properties({"score": 16}), has_properties({"score": 0})),
     )
+
+
+def test_align_with_min_score() -> None:
+    vocabulary = Vocabulary()
+    sequence_1 = NamedSequence.of_signs("name1", "ABZ001", vocabulary)
+    sequence_2 = NamedSequence.of_signs("name2", "ABZ001", vocabulary)
+    sequence_3 = NamedSequence.of_signs("name3", "ABZ002", vocabulary)
+
+    result = align(
+        [(sequence_1, sequence_3), (sequence_1, sequence_2)], vocabulary, match
+    )
+
+    assert_that(
+        result,
+        contains_exactly(
+            has_properties({"score": match, "alignments": has_length(1)}),
+            has_properties({"score": 0, "alignments": []}),
+        ),
+    )
@@ -0,0 +1,86 @@
+import csv
+
+import pytest
+
+from ebl.alignment.application.alignment_job import (
+    FIELDNAMES,
+    AlignmentStatistics,
+    Checkpoint,
+    CsvResultWriter,
+    Shard,
+)
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+NUMBERS = [MuseumNumber("X", str(number)) for number in range(100)]
+
+
+def test_shard_of() -> None:
+    shard = Shard.of("1/4")
+
+    assert shard == Shard(1, 4)
+    assert str(shard) == "1/4"
+
+
+@pytest.mark.parametrize("value", ["4/4", "-1/4", "0/0"])
+def test_invalid_shard(value) -> None:
+    with pytest.raises(ValueError):
+        Shard.of(value)
+
+
+def test_shards_partition_numbers() -> None:
+    shards = [Shard(index, 3) for index in range(3)]
+
+    for number in NUMBERS:
+        assert sum(shard.contains(number) for shard in shards) == 1
+
+
+def test_checkpoint(tmp_path) -> None:
+    path = tmp_path / "results.csv.checkpoint.json"
+    checkpoint = Checkpoint({"skip": 0}).add(NUMBERS[:2], 42)
+    checkpoint.save(path)
+
+    loaded = Checkpoint.load(path)
+
+    assert loaded == checkpoint
+    assert loaded.is_done(NUMBERS[0])
+    assert not loaded.is_done(NUMBERS[2])
+
+
+def test_load_missing_checkpoint(tmp_path) -> None:
+    assert Checkpoint.load(tmp_path / "missing.json") is None
+
+
+def test_csv_writer_resume(tmp_path) -> None:
+    path = tmp_path / "results.csv"
+    first = {name: "first" for name in FIELDNAMES}
+    second = {name: "second" for name in FIELDNAMES}
+    writer = CsvResultWriter(path)
+    writer.resume(0)
+    position = writer.write([first])
+    writer.write([second])
+
+    CsvResultWriter(path).resume(position)
+    CsvResultWriter(path).write([second])
+
+    with open(path, encoding="utf-8", newline="") as file:
+        assert list(csv.DictReader(file)) == [first, second]
+
+
+def test_alignment_statistics() -> None:
+    statistics = AlignmentStatistics(
+        pairs=1, cells=100, aligned_cells=100, aligned_seconds=1.0, seconds=1.0
+    ) + AlignmentStatistics(pairs=1, skipped=1, cells=300)
+
+    assert statistics == AlignmentStatistics(
+        pairs=2,
+        skipped=1,
+        cells=400,
+        aligned_cells=100,
+        aligned_seconds=1.0,
+        seconds=1.0,
+    )
+    assert statistics.time_saved == 3.0
+
+
+def test_alignment_statistics_without_aligned_pairs() -> None:
+    assert AlignmentStatistics(pairs=1, skipped=1, cells=100).time_saved == 0.0
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ebl.alignment.application.alignment_service import AlignmentService
+from ebl.alignment.domain.alignment_job import AlignmentJobStatus
+from ebl.cache.application.custom_cache import CustomCache
+from ebl.errors import NotFoundError
+from ebl.tests.factories.corpus import ChapterFactory, TextFactory
+from ebl.tests.factories.fragment import TransliteratedFragmentFactory
+
+SIGNS = "KU NU IGI\nMI DIŠ UD\nKU NU IGI MI DIŠ UD"
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def alignment_service(
+    fragment_repository, text_repository, mongo_cache_repository, executor
+):
+    return AlignmentService(
+        fragment_repository,
+        text_repository,
+        CustomCache(mongo_cache_repository),
+        executor,
+        0,
+    )
+
+
+@pytest.fixture
+def chapter(text_repository):
+    chapter = ChapterFactory.build(signs=(SIGNS,))
+    text_repository.create(
+        TextFactory.build(
+            genre=chapter.text_id.genre,
+            category=chapter.text_id.category,
+            index=chapter.text_id.index,
+        )
+    )
+    text_repository.create_chapter(chapter)
+    return chapter
+
+
+def test_enqueue(alignment_service, executor, fragment_repository, chapter):
+    fragment = TransliteratedFragmentFactory.build(signs=SIGNS)
+    fragment_repository.create(fragment)
+
+    job = alignment_service.enqueue(fragment.number)
+    executor.shutdown(wait=True)
+    result = alignment_service.find(job.id)
+
+    assert job.number == fragment.number
+    assert result.status == AlignmentJobStatus.DONE
+    assert [alignment.chapter_id for alignment in result.results] == [chapter.id_]
+    assert result.results[0].manuscript == str(chapter.manuscripts[0].siglum)
+
+
+def test_enqueue_cached(alignment_service, executor, fragment_repository, chapter):
+    fragment = TransliteratedFragmentFactory.build(signs=SIGNS)
+    fragment_repository.create(fragment)
+    first = alignment_service.enqueue(fragment.number)
+    executor.shutdown(wait=True)
+
+    second = alignment_service.enqueue(fragment.number)
+
+    assert second.id != first.id
+    assert second.status == AlignmentJobStatus.DONE
+    assert second.results == alignment_service.find(first.id).results
+
+
+def test_enqueue_after_chapter_update(
+    alignment_service, executor, fragment_repository, text_repository, chapter
+):
+    fragment = TransliteratedFragmentFactory.build(signs=SIGNS)
+    fragment_repository.create(fragment)
+    first = alignment_service.enqueue(fragment.number)
+    executor.submit(lambda: None).result()
+    text_repository.update(chapter.id_, chapter)
+
+    second = alignment_service.enqueue(fragment.number)
+
+    assert second.id != first.id
+    assert second.status == AlignmentJobStatus.QUEUED
+
+
+def test_enqueue_not_found(alignment_service):
+    with pytest.raises(NotFoundError):
+        alignment_service.enqueue(TransliteratedFragmentFactory.build().number)
+
+
+def test_find_not_found(alignment_service):
+    with pytest.raises(NotFoundError):
+        alignment_service.find("unknown")
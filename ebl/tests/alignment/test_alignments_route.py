@@ -0,0 +1,66 @@
+import time
+
+import falcon
+
+from ebl.tests.factories.corpus import ChapterFactory, TextFactory
+from ebl.tests.factories.fragment import TransliteratedFragmentFactory
+
+SIGNS = "KU NU IGI\nMI DIŠ UD\nKU NU IGI MI DIŠ UD"
+
+
+def poll(client, url: str):
+    for _ in range(100):
+        result = client.simulate_get(url)
+        if result.json["status"] not in ["queued", "running"]:
+            return result
+        time.sleep(0.1)
+    return result
+
+
+def test_align_fragment(client, fragment_repository, text_repository):
+    chapter = ChapterFactory.build(signs=(SIGNS,))
+    text_repository.create(
+        TextFactory.build(
+            genre=chapter.text_id.genre,
+            category=chapter.text_id.category,
+            index=chapter.text_id.index,
+        )
+    )
+    text_repository.create_chapter(chapter)
+    fragment = TransliteratedFragmentFactory.build(signs=SIGNS)
+    fragment_repository.create(fragment)
+
+    post_result = client.simulate_post(f"/fragments/{fragment.number}/alignments")
+
+    assert post_result.status == falcon.HTTP_ACCEPTED
+    assert post_result.json["number"] == str(fragment.number)
+
+    get_result = poll(client, post_result.headers["location"])
+
+    assert get_result.status == falcon.HTTP_OK
+    assert get_result.json["id"] == post_result.json["id"]
+    assert get_result.json["status"] == "done"
+
+
+def test_align_fragment_not_found(client):
+    result = client.simulate_post("/fragments/unknown.1/alignments")
+
+    assert result.status == falcon.HTTP_NOT_FOUND
+
+
+def test_alignment_job_not_found(client, fragment_repository):
+    fragment = TransliteratedFragmentFactory.build()
+    fragment_repository.create(fragment)
+
+    result = client.simulate_get(f"/fragments/{fragment.number}/alignments/unknown")
+
+    assert result.status == falcon.HTTP_NOT_FOUND
+
+
+def test_align_fragment_forbidden(guest_client, fragment_repository):
+    fragment = TransliteratedFragmentFactory.build()
+    fragment_repository.create(fragment)
+
+    result = guest_client.simulate_post(f"/fragments/{fragment.number}/alignments")
+
+    assert result.status == falcon.HTTP_FORBIDDEN
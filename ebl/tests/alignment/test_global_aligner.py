@@ -0,0 +1,117 @@
+from alignment.sequence import Sequence
+from alignment.vocabulary import Vocabulary
+import pytest
+
+from ebl.alignment.domain.global_aligner import AffineGlobalAligner, find_diagonal
+from ebl.alignment.domain.scoring import (
+    EblScoring,
+    break_match,
+    common_mismatch,
+    gap_extension,
+    gap_start,
+    match,
+)
+
+
+def encode(vocabulary: Vocabulary, signs: str):
+    return vocabulary.encodeSequence(Sequence(signs.split()))
+
+
+@pytest.mark.parametrize(
+    "first,second,expected",
+    [
+        ("ABZ001", "ABZ001", match),
+        ("ABZ001", "ABZ002", 0),
+        ("ABZ545", "ABZ597", common_mismatch),
+        ("ABZ001 # ABZ002", "ABZ001 # ABZ002", 2 * match + break_match),
+        ("ABZ002", "ABZ001 ABZ002 ABZ003", match),
+        (
+            "ABZ001 ABZ002 ABZ003 ABZ004",
+            "ABZ001 ABZ002 ABZ005 ABZ006 ABZ003 ABZ004",
+            4 * match + gap_start + 2 * gap_extension,
+        ),
+        ("ABZ001", "", 0),
+    ],
+)
+def test_score(first, second, expected) -> None:
+    vocabulary = Vocabulary()
+    first = encode(vocabulary, first)
+    second = encode(vocabulary, second)
+    aligner = AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
+
+    assert aligner.score(first, second) == expected
+    assert aligner.align(first, second)[0] == expected
+
+
+def test_upper_bound() -> None:
+    vocabulary = Vocabulary()
+    first = encode(vocabulary, "ABZ001 ABZ002 ABZ003")
+    second = encode(vocabulary, "ABZ009 ABZ001 ABZ004 ABZ002 ABZ003 ABZ001")
+    aligner = AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
+
+    assert aligner.upper_bound(first, second) == 3 * match
+    assert aligner.upper_bound(first, second) >= aligner.score(first, second)
+
+
+@pytest.mark.parametrize(
+    "min_score,expected",
+    [
+        (0, 3 * match + gap_start + gap_extension),
+        (3 * match + gap_start + gap_extension, 3 * match + gap_start + gap_extension),
+        (3 * match + gap_start + gap_extension + 1, None),
+        (3 * match + 1, None),
+    ],
+)
+def test_score_above(min_score, expected) -> None:
+    vocabulary = Vocabulary()
+    first = encode(vocabulary, "ABZ001 ABZ002 ABZ003")
+    second = encode(vocabulary, "ABZ009 ABZ001 ABZ004 ABZ002 ABZ003")
+    aligner = AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
+
+    assert aligner.score_above(first, second, min_score) == expected
+
+
+@pytest.mark.parametrize(
+    "first,second,expected",
+    [
+        ("ABZ003 ABZ004 ABZ005", "ABZ001 ABZ002 ABZ003 ABZ004 ABZ005 ABZ006", 2),
+        ("ABZ001 ABZ002 ABZ003", "ABZ001 ABZ002 ABZ003", 0),
+        ("ABZ001 ABZ002 ABZ003", "ABZ003 ABZ002 ABZ001", None),
+        ("ABZ001", "ABZ001", None),
+    ],
+)
+def test_find_diagonal(first, second, expected) -> None:
+    vocabulary = Vocabulary()
+
+    assert (
+        find_diagonal(encode(vocabulary, first), encode(vocabulary, second), 3)
+        == expected
+    )
+
+
+def test_align() -> None:
+    vocabulary = Vocabulary()
+    first = encode(vocabulary, "ABZ001 ABZ002 ABZ003")
+    second = encode(vocabulary, "ABZ009 ABZ001 ABZ004 ABZ002 ABZ003")
+    aligner = AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
+
+    score, alignments = aligner.align(first, second)
+    alignment = vocabulary.decodeSequenceAlignment(alignments[0])
+
+    assert score == 3 * match + gap_start + gap_extension
+    assert alignment.score == score
+    assert list(alignment.first) == ["ABZ001", "-", "ABZ002", "ABZ003"]
+    assert list(alignment.second) == ["ABZ001", "ABZ004", "ABZ002", "ABZ003"]
+
+
+def test_save_and_load(tmp_path) -> None:
+    vocabulary = Vocabulary()
+    first = encode(vocabulary, "ABZ001 # ABZ002")
+    second = encode(vocabulary, "ABZ001 ABZ003 # ABZ002")
+    aligner = AffineGlobalAligner.of_scoring(EblScoring(vocabulary))
+
+    aligner.save(tmp_path)
+
+    assert AffineGlobalAligner.load(tmp_path).score(first, second) == aligner.score(
+        first, second
+    )
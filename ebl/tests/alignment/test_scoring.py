@@ -36,3 +36,29 @@ def test_gap_start() -> None:
 def test_gap_xtension(element, expected) -> None:
     vocabulary = Vocabulary()
     assert EblScoring(vocabulary).gapExtension(vocabulary.encode(element)) == expected
+
+
+def test_variant_parts_are_added_to_vocabulary() -> None:
+    vocabulary = Vocabulary()
+    variant = vocabulary.encode("ABZ001/ABZ002")
+
+    scoring = EblScoring(vocabulary)
+
+    assert vocabulary.has("ABZ001")
+    assert vocabulary.has("ABZ002")
+    assert scoring(variant, vocabulary.encode("ABZ002")) == 16
+
+
+def test_substitution_matrix_is_symmetric() -> None:
+    vocabulary = Vocabulary()
+    for element in ["ABZ001", "ABZ545/ABZ002", "ABZ597", "#", "X"]:
+        vocabulary.encode(element)
+
+    matrix = EblScoring(vocabulary).substitution_matrix
+
+    assert len(matrix) == len(vocabulary)
+    assert all(
+        matrix[first][second] == matrix[second][first]
+        for first in range(len(matrix))
+        for second in range(len(matrix))
+    )
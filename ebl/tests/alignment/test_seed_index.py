@@ -0,0 +1,31 @@
+from ebl.alignment.domain.seed_index import SeedIndex, create_seeds
+
+
+def test_create_seeds() -> None:
+    assert create_seeds("X ABZ001 ABZ002\nABZ003 X", 2) == frozenset(
+        [("ABZ001", "ABZ002"), ("ABZ002", "ABZ003")]
+    )
+
+
+def test_create_seeds_too_short() -> None:
+    assert create_seeds("ABZ001 ABZ002", 3) == frozenset()
+
+
+def test_count_shared_seeds() -> None:
+    index = SeedIndex(2)
+    index.add("a", "ABZ001 ABZ002 ABZ003 ABZ004")
+    index.add("b", "ABZ003 ABZ004 ABZ005")
+    index.add("c", "ABZ006 ABZ007")
+
+    assert index.count_shared_seeds("ABZ002 ABZ003 ABZ004 ABZ005") == {"a": 2, "b": 2}
+
+
+def test_find_candidates() -> None:
+    index = SeedIndex(2)
+    index.add("a", "ABZ001 ABZ002 ABZ003 ABZ004")
+    index.add("b", "ABZ003 ABZ004 ABZ005")
+    index.add("c", "ABZ001 ABZ002")
+
+    assert index.find_candidates("ABZ001 ABZ002 ABZ003 ABZ004", 2) == {"a"}
+    assert index.find_candidates("ABZ001 ABZ002 ABZ003 ABZ004", 3, 1) == {"a"}
+    assert index.find_candidates("ABZ001 ABZ002 ABZ003 ABZ004", 1) == {"a", "b", "c"}
@@ -0,0 +1,25 @@
+from alignment.sequence import EncodedSequence
+
+from ebl.alignment.domain.sequence_table import SequenceTable
+
+sequences = [EncodedSequence([1, 2, 3]), EncodedSequence([]), EncodedSequence([4])]
+
+
+def test_of_sequences() -> None:
+    table = SequenceTable.of_sequences(sequences)
+
+    assert len(table) == 3
+    assert [list(table[index]) for index in range(len(table))] == [
+        [1, 2, 3],
+        [],
+        [4],
+    ]
+
+
+def test_save_and_load(tmp_path) -> None:
+    SequenceTable.of_sequences(sequences).save(tmp_path)
+
+    table = SequenceTable.load(tmp_path)
+
+    assert list(table[0]) == [1, 2, 3]
+    assert list(table[2]) == [4]
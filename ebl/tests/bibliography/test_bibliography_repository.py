@@ -1,6 +1,10 @@
 import pydash
 import pytest
 
+from ebl.bibliography.infrastructure.bibliography import (
+    GENERATION_ID,
+    ReferenceResolver,
+)
 from ebl.errors import DuplicateError, NotFoundError
 from ebl.tests.factories.bibliography import BibliographyEntryFactory
 
@@ -55,3 +59,51 @@ def test_update_not_found(bibliography_repository):
     bibliography_entry = BibliographyEntryFactory.build()
     with pytest.raises(NotFoundError):
         bibliography_repository.update(bibliography_entry)
+
+
+def test_resolve_references(database, create_mongo_bibliography_entry):
+    entry = create_mongo_bibliography_entry()
+    database[COLLECTION].insert_one(entry)
+    known = {"id": entry["_id"], "type": "EDITION"}
+    unknown = {"id": "unknown", "type": "EDITION"}
+
+    assert ReferenceResolver(database).resolve(
+        [{"_id": 1, "references": [known, unknown]}, {"_id": 2}]
+    ) == [
+        {"_id": 1, "references": [{**known, "document": entry}, unknown]},
+        {"_id": 2, "references": []},
+    ]
+
+
+def test_resolve_references_from_cache(
+    database, versions, bibliography_repository, create_mongo_bibliography_entry
+):
+    bibliography_entry = BibliographyEntryFactory.build()
+    document = {"references": [{"id": bibliography_entry["id"]}]}
+    resolver = ReferenceResolver(database)
+    bibliography_repository.create(bibliography_entry)
+
+    resolver.resolve_one(document)
+    database[COLLECTION].delete_many({})
+    versions.increment(COLLECTION, GENERATION_ID)
+
+    assert resolver.resolve_one(document)["references"][0][
+        "document"
+    ] == create_mongo_bibliography_entry(bibliography_entry)
+
+
+def test_resolve_references_after_update(
+    database, bibliography_repository, create_mongo_bibliography_entry
+):
+    bibliography_entry = BibliographyEntryFactory.build()
+    updated_entry = {**bibliography_entry, "title": "New Title"}
+    document = {"references": [{"id": bibliography_entry["id"]}]}
+    resolver = ReferenceResolver(database, generation_ttl=0)
+    bibliography_repository.create(bibliography_entry)
+
+    resolver.resolve_one(document)
+    bibliography_repository.update(updated_entry)
+
+    assert resolver.resolve_one(document)["references"][0][
+        "document"
+    ] == create_mongo_bibliography_entry(updated_entry)
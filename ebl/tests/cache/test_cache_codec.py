@@ -0,0 +1,51 @@
+import json
+
+from ebl.cache.application.cache_codec import (
+    DATA,
+    ENCODING,
+    JSON_ZLIB,
+    CompressedJsonCodec,
+    DocumentCodec,
+    dump_json,
+)
+
+SMALL = {"name": "I", "lines": []}
+LARGE = {"name": "I", "lines": [{"number": "1", "text": "kur-kur"}] * 1000}
+
+
+def test_dump_json() -> None:
+    assert dump_json({"text": "šà", "lines": [1, 2]}) == (
+        '{"text":"šà","lines":[1,2]}'.encode()
+    )
+
+
+def test_document_codec() -> None:
+    codec = DocumentCodec()
+    document = codec.encode(LARGE)
+
+    assert document == LARGE
+    assert codec.decode(document) == LARGE
+    assert json.loads(codec.to_json(document)) == LARGE
+
+
+def test_compressed_json_codec_below_threshold() -> None:
+    codec = CompressedJsonCodec()
+
+    assert codec.encode(SMALL) == SMALL
+
+
+def test_compressed_json_codec() -> None:
+    codec = CompressedJsonCodec()
+    document = codec.encode(LARGE)
+
+    assert document[ENCODING] == JSON_ZLIB
+    assert codec.size(document) == len(document[DATA])
+    assert codec.size(document) < len(dump_json(LARGE)) / 10
+    assert codec.decode(document) == LARGE
+    assert codec.to_json(document) == dump_json(LARGE)
+
+
+def test_decode_compressed_with_document_codec() -> None:
+    document = CompressedJsonCodec(threshold=0).encode(SMALL)
+
+    assert DocumentCodec().decode(document) == SMALL
@@ -0,0 +1,83 @@
+import falcon
+from falcon import testing
+from falcon_caching import Cache
+
+from ebl.cache.application.cache import create_middleware
+from ebl.cache.application.cache_metrics import (
+    CacheMetrics,
+    NamespaceMetrics,
+    cache_metrics,
+    get_size,
+)
+
+NAMESPACE = "test"
+
+
+def test_counters() -> None:
+    metrics = CacheMetrics()
+    metrics.miss(NAMESPACE)
+    metrics.set(NAMESPACE, 10)
+    metrics.evict(NAMESPACE, 2)
+    metrics.size(NAMESPACE, 8)
+    metrics.compute(NAMESPACE, 0.5)
+    metrics.hit(NAMESPACE)
+    metrics.hit(NAMESPACE)
+    metrics.hit(NAMESPACE)
+
+    assert metrics.get(NAMESPACE) == NamespaceMetrics(
+        hits=3,
+        misses=1,
+        sets=1,
+        evictions=2,
+        set_bytes=10,
+        size_bytes=8,
+        computes=1,
+        compute_seconds=0.5,
+        saved_seconds=1.5,
+    )
+
+
+def test_saved_seconds_are_monotonic() -> None:
+    metrics = CacheMetrics()
+    metrics.compute(NAMESPACE, 1.0)
+    metrics.hit(NAMESPACE)
+    metrics.compute(NAMESPACE, 0.0)
+
+    assert metrics.get(NAMESPACE).saved_seconds == 1.0
+
+
+def test_to_prometheus() -> None:
+    metrics = CacheMetrics()
+    metrics.hit(NAMESPACE)
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE ebl_cache_hits_total counter\n" in text
+    assert 'ebl_cache_hits_total{namespace="test"} 1\n' in text
+    assert 'ebl_cache_misses_total{namespace="test"} 0\n' in text
+
+
+def test_get_size() -> None:
+    assert get_size("text") == 4
+    assert get_size({"a": 1}) == len('{"a": 1}')
+
+
+def test_instrumented_middleware() -> None:
+    cache = Cache(config={"CACHE_TYPE": "simple"})
+
+    class Resource:
+        @cache.cached(timeout=60)
+        def on_get(self, _req, resp) -> None:
+            resp.text = "response"
+
+    api = falcon.App(middleware=[create_middleware(cache)])
+    api.add_route("/test", Resource())
+    client = testing.TestClient(api)
+    cache_metrics.clear()
+
+    client.simulate_get("/test")
+    client.simulate_get("/test")
+
+    metrics = cache_metrics.get("http")
+    assert (metrics.hits, metrics.misses, metrics.sets) == (1, 1, 1)
+    assert metrics.set_bytes == len("response")
@@ -0,0 +1,20 @@
+import falcon
+
+from ebl.cache.application.cache_metrics import cache_metrics
+
+
+def test_get_cache_metrics(client) -> None:
+    cache_metrics.clear()
+    cache_metrics.hit("test")
+
+    result = client.simulate_get("/cache/metrics")
+
+    assert result.status == falcon.HTTP_OK
+    assert result.headers["Content-Type"].startswith("text/plain")
+    assert 'ebl_cache_hits_total{namespace="test"} 1' in result.text
+
+
+def test_get_cache_metrics_forbidden(guest_client) -> None:
+    result = guest_client.simulate_get("/cache/metrics")
+
+    assert result.status == falcon.HTTP_FORBIDDEN
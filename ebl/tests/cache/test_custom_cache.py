@@ -1,6 +1,8 @@
 from mockito import verify
 
-from ebl.cache.application.custom_cache import ChapterCache
+from ebl.cache.application.cache_codec import CompressedJsonCodec
+from ebl.cache.application.custom_cache import LEASE_SECONDS, ChapterCache
+from ebl.cache.application.lru_cache import LruCache
 from ebl.tests.factories.corpus import ChapterFactory
 from ebl.corpus.domain.chapter import ChapterId
 
@@ -17,11 +19,42 @@ def test_custom_cache_get(mongo_cache_repository, when):
     assert custom_cache.get("test-key") == {"item": "test-item"}
 
 
+def test_custom_cache_get_or_none(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository)
+    when(mongo_cache_repository).get_or_none("test-key").thenReturn(None)
+    assert custom_cache.get_or_none("test-key") is None
+
+
+def test_chapter_cache_get_or_none_from_local_cache(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository, LruCache())
+    when(mongo_cache_repository).get_generation().thenReturn(0)
+    when(mongo_cache_repository).get_or_none("test-key").thenReturn(
+        {"item": "test-item"}
+    )
+    assert custom_cache.get_or_none("test-key") == {"item": "test-item"}
+    assert custom_cache.get_or_none("test-key") == {"item": "test-item"}
+    verify(mongo_cache_repository, 1).get_or_none("test-key")
+    verify(mongo_cache_repository, 1).get_generation()
+
+
+def test_chapter_cache_get_or_none_after_invalidation(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository, LruCache(generation_ttl=0))
+    when(mongo_cache_repository).get_generation().thenReturn(0, 1)
+    when(mongo_cache_repository).get_or_none("test-key").thenReturn(
+        {"item": "test-item"}
+    )
+    custom_cache.get_or_none("test-key")
+    custom_cache.get_or_none("test-key")
+    verify(mongo_cache_repository, 2).get_or_none("test-key")
+
+
 def test_custom_cache_set(mongo_cache_repository, when):
     custom_cache = ChapterCache(mongo_cache_repository)
-    when(mongo_cache_repository).set("test-key", {"item": "test-item"}).thenReturn(None)
+    when(mongo_cache_repository).set(
+        "test-key", {"item": "test-item"}, (), None
+    ).thenReturn(None)
     custom_cache.set("test-key", {"item": "test-item"})
-    verify(mongo_cache_repository, 1).set("test-key", {"item": "test-item"})
+    verify(mongo_cache_repository, 1).set("test-key", {"item": "test-item"}, (), None)
 
 
 def test_custom_cache_delete(mongo_cache_repository, when):
@@ -31,18 +64,122 @@ def test_custom_cache_delete(mongo_cache_repository, when):
     verify(mongo_cache_repository, 1).delete("test-key")
 
 
-def test_custom_cache_delete_all(mongo_cache_repository, when):
+def test_custom_cache_delete_by_tag(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository)
+    when(mongo_cache_repository).delete_by_tag("test").thenReturn(None)
+    custom_cache.delete_by_tag("test")
+    verify(mongo_cache_repository, 1).delete_by_tag("test")
+
+
+def test_chapter_cache_set_chapter(mongo_cache_repository, when):
     custom_cache = ChapterCache(mongo_cache_repository)
-    when(mongo_cache_repository).delete_all("^test-").thenReturn(None)
-    custom_cache.delete_all(pattern="^test-")
-    verify(mongo_cache_repository, 1).delete_all("^test-")
+    chapter = ChapterFactory.build()
+    when(mongo_cache_repository).set(
+        "test-key", {"item": "test-item"}, [str(chapter.id_)], None
+    ).thenReturn(None)
+    custom_cache.set_chapter(chapter.id_, "test-key", {"item": "test-item"})
+    verify(mongo_cache_repository, 1).set(
+        "test-key", {"item": "test-item"}, [str(chapter.id_)], None
+    )
 
 
 def test_custom_cache_delete_chapter(mongo_cache_repository, when):
     custom_cache = ChapterCache(mongo_cache_repository)
     chapter = ChapterFactory.build()
     chapter_id = ChapterId(chapter.text_id, chapter.stage, chapter.name)
-    pattern = rf"^{str(chapter_id)}(\sline-\d+)?$"
-    when(mongo_cache_repository).delete_all(pattern).thenReturn(None)
+    when(mongo_cache_repository).delete_by_tag(str(chapter_id)).thenReturn(None)
     custom_cache.delete_chapter(chapter_id)
-    verify(mongo_cache_repository, 1).delete_all(pattern)
+    verify(mongo_cache_repository, 1).delete_by_tag(str(chapter_id))
+
+
+def test_chapter_cache_delete_chapter_increments_generation(
+    mongo_cache_repository, when
+):
+    custom_cache = ChapterCache(mongo_cache_repository, LruCache())
+    chapter = ChapterFactory.build()
+    when(mongo_cache_repository).delete_by_tag(str(chapter.id_)).thenReturn(None)
+    when(mongo_cache_repository).increment_generation().thenReturn(None)
+    custom_cache.delete_chapter(chapter.id_)
+    verify(mongo_cache_repository, 1).increment_generation()
+
+
+def test_custom_cache_get_or_set_cached(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository)
+    when(mongo_cache_repository).get_or_none("test-key").thenReturn(
+        {"item": "test-item"}
+    )
+    assert custom_cache.get_or_set("test-key", lambda: {"item": "new-item"}) == {
+        "item": "test-item"
+    }
+    verify(mongo_cache_repository, 0).set(...)
+
+
+def test_custom_cache_get_or_set_computes(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository)
+    when(mongo_cache_repository).get_or_none("test-key").thenReturn(None)
+    when(mongo_cache_repository).set(
+        "test-key", {"item": "new-item"}, (), None
+    ).thenReturn(None)
+    assert custom_cache.get_or_set("test-key", lambda: {"item": "new-item"}) == {
+        "item": "new-item"
+    }
+    verify(mongo_cache_repository, 1).set("test-key", {"item": "new-item"}, (), None)
+
+
+def test_chapter_cache_get_or_set_chapter_with_lease(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository)
+    chapter = ChapterFactory.build()
+    tags = [str(chapter.id_)]
+    when(mongo_cache_repository).get_or_none("test-key").thenReturn(None)
+    when(mongo_cache_repository).acquire_lease("test-key", LEASE_SECONDS).thenReturn(
+        True
+    )
+    when(mongo_cache_repository).set(
+        "test-key", {"item": "new-item"}, tags, None
+    ).thenReturn(None)
+    when(mongo_cache_repository).release_lease("test-key").thenReturn(None)
+    assert custom_cache.get_or_set_chapter(
+        chapter.id_, "test-key", lambda: {"item": "new-item"}
+    ) == {"item": "new-item"}
+    verify(mongo_cache_repository, 1).release_lease("test-key")
+
+
+def test_chapter_cache_get_or_set_chapter_waits_for_lease(mongo_cache_repository, when):
+    custom_cache = ChapterCache(mongo_cache_repository)
+    chapter = ChapterFactory.build()
+    when(mongo_cache_repository).get_or_none("test-key").thenReturn(
+        None, None, {"item": "test-item"}
+    )
+    when(mongo_cache_repository).acquire_lease("test-key", LEASE_SECONDS).thenReturn(
+        False
+    )
+    assert custom_cache.get_or_set_chapter(
+        chapter.id_, "test-key", lambda: {"item": "new-item"}
+    ) == {"item": "test-item"}
+    verify(mongo_cache_repository, 0).set(...)
+    verify(mongo_cache_repository, 0).release_lease(...)
+
+
+def test_custom_cache_compressed(mongo_cache_repository) -> None:
+    custom_cache = ChapterCache(
+        mongo_cache_repository, codec=CompressedJsonCodec(threshold=0)
+    )
+    custom_cache.set("test-key", {"item": "test-item"})
+
+    assert custom_cache.get_or_none("test-key") == {"item": "test-item"}
+    assert custom_cache.get_json_or_none("test-key") == b'{"item":"test-item"}'
+
+
+def test_chapter_cache_get_or_set_chapter_json(mongo_cache_repository) -> None:
+    custom_cache = ChapterCache(
+        mongo_cache_repository, LruCache(), codec=CompressedJsonCodec(threshold=0)
+    )
+    chapter = ChapterFactory.build()
+
+    assert (
+        custom_cache.get_or_set_chapter_json(
+            chapter.id_, "test-key", lambda: {"item": "new-item"}
+        )
+        == b'{"item":"new-item"}'
+    )
+    assert custom_cache.get_json_or_none("test-key") == b'{"item":"new-item"}'
@@ -0,0 +1,78 @@
+from ebl.cache.application.lru_cache import LruCache
+
+ITEM = {"data": "data"}
+ITEM_SIZE = 16
+
+
+def test_get_missing() -> None:
+    assert LruCache().get("key", 0) is None
+
+
+def test_set_and_get() -> None:
+    cache = LruCache()
+    cache.set("key", ITEM, 0)
+
+    assert cache.get("key", 0) == ITEM
+    assert cache.size == ITEM_SIZE
+
+
+def test_evicts_least_recently_used() -> None:
+    cache = LruCache(2 * ITEM_SIZE)
+    cache.set("first", ITEM, 0)
+    cache.set("second", ITEM, 0)
+    cache.get("first", 0)
+    cache.set("third", ITEM, 0)
+
+    assert cache.get("first", 0) == ITEM
+    assert cache.get("second", 0) is None
+    assert cache.get("third", 0) == ITEM
+    assert cache.size == 2 * ITEM_SIZE
+
+
+def test_does_not_store_too_large_items() -> None:
+    cache = LruCache(ITEM_SIZE - 1)
+    cache.set("key", ITEM, 0)
+
+    assert cache.get("key", 0) is None
+    assert cache.size == 0
+
+
+def test_new_generation_discards_items() -> None:
+    cache = LruCache()
+    cache.set("key", ITEM, 0)
+
+    assert cache.get("key", 1) is None
+    assert cache.size == 0
+
+
+def test_clear() -> None:
+    cache = LruCache()
+    cache.set("key", ITEM, 0)
+    cache.clear()
+
+    assert cache.get("key", 0) is None
+
+
+def test_current_generation_is_cached() -> None:
+    cache = LruCache()
+    generations = iter([0, 1])
+
+    assert cache.current_generation(lambda: next(generations)) == 0
+    assert cache.current_generation(lambda: next(generations)) == 0
+
+
+def test_current_generation_expires() -> None:
+    cache = LruCache(generation_ttl=0)
+    generations = iter([0, 1])
+
+    assert cache.current_generation(lambda: next(generations)) == 0
+    assert cache.current_generation(lambda: next(generations)) == 1
+
+
+def test_clear_refetches_generation() -> None:
+    cache = LruCache()
+    generations = iter([0, 1])
+    cache.current_generation(lambda: next(generations))
+    cache.clear()
+
+    assert cache.current_generation(lambda: next(generations)) == 1
@@ -1,15 +1,17 @@
-import pytest
-
 CACHE_COLLECTION = "cache"
 
 
 def test_set(database, mongo_cache_repository) -> None:
-    mongo_cache_repository.set("test", {"data": "data"})
+    mongo_cache_repository.set("test", {"data": "data"}, ["tag"])
 
     inserted_text = database[CACHE_COLLECTION].find_one(
         {"cache_key": "test"}, projection={"_id": False, "cache_key": False}
     )
-    assert inserted_text == {"data": "data"}
+    assert inserted_text == {
+        "data": "data",
+        "cache_tags": ["tag"],
+        "cache_expires_at": None,
+    }
 
 
 def test_has(database, mongo_cache_repository) -> None:
@@ -22,31 +24,108 @@ def test_get(database, mongo_cache_repository) -> None:
     assert mongo_cache_repository.get("test") == {"data": "data"}
 
 
+def test_get_or_none(database, mongo_cache_repository) -> None:
+    database[CACHE_COLLECTION].insert_one({"cache_key": "test", "data": "data"})
+    assert mongo_cache_repository.get_or_none("test") == {"data": "data"}
+
+
+def test_get_or_none_missing(mongo_cache_repository) -> None:
+    assert mongo_cache_repository.get_or_none("test") is None
+
+
+def test_generation(mongo_cache_repository) -> None:
+    assert mongo_cache_repository.get_generation() == 0
+    mongo_cache_repository.increment_generation()
+    mongo_cache_repository.increment_generation()
+    assert mongo_cache_repository.get_generation() == 2
+
+
 def test_delete(database, mongo_cache_repository) -> None:
     database[CACHE_COLLECTION].insert_one({"cache_key": "test", "data": "data"})
     mongo_cache_repository.delete("test")
     assert database[CACHE_COLLECTION].find_one({"cache_key": "test"}) is None
 
 
-@pytest.mark.parametrize(
-    "key,expected", [("test", True), ("test line-42", True), ("foobar", False)]
-)
-def test_exists_with_regex(database, mongo_cache_repository, key, expected) -> None:
-    database[CACHE_COLLECTION].insert_one(
-        {"cache_key": key, "data": "data"},
-    )
-    assert mongo_cache_repository.has(r"^test(\sline-\d+)?$", regex=True) == expected
+def test_delete_missing(database, mongo_cache_repository) -> None:
+    mongo_cache_repository.delete("test")
+    assert database[CACHE_COLLECTION].count_documents({}) == 0
+
+
+def test_set_replaces(database, mongo_cache_repository) -> None:
+    mongo_cache_repository.set("test", {"data": "old"})
+    mongo_cache_repository.set("test", {"data": "new"})
+
+    assert database[CACHE_COLLECTION].count_documents({"cache_key": "test"}) == 1
+    assert mongo_cache_repository.get("test") == {"data": "new"}
+
+
+def test_get_expired(mongo_cache_repository) -> None:
+    mongo_cache_repository.set("test", {"data": "data"}, timeout=-1)
+
+    assert mongo_cache_repository.get_or_none("test") is None
+    assert mongo_cache_repository.has("test") is False
+
+
+def test_get_not_expired(mongo_cache_repository) -> None:
+    mongo_cache_repository.set("test", {"data": "data"}, timeout=60)
+
+    assert mongo_cache_repository.get_or_none("test") == {"data": "data"}
+
+
+def test_delete_by_tag(database, mongo_cache_repository) -> None:
+    mongo_cache_repository.set("test", {"data": "data"}, ["test"])
+    mongo_cache_repository.set("test line-42", {"data": "data"}, ["test"])
+    mongo_cache_repository.set("foobar", {"data": "data"}, ["foobar"])
 
+    mongo_cache_repository.delete_by_tag("test")
 
-def test_delete_all(database, mongo_cache_repository) -> None:
+    assert database[CACHE_COLLECTION].find_one({"cache_key": "test"}) is None
+    assert database[CACHE_COLLECTION].find_one({"cache_key": "test line-42"}) is None
+    assert database[CACHE_COLLECTION].find_one({"cache_key": "foobar"}) is not None
+
+
+def test_create_indexes(database, mongo_cache_repository) -> None:
     database[CACHE_COLLECTION].insert_many(
         [
             {"cache_key": "test", "data": "data"},
-            {"cache_key": "test line-42", "data": "data"},
-            {"cache_key": "foobar", "data": "data"},
+            {"cache_key": "test", "data": "data"},
         ]
     )
-    mongo_cache_repository.delete_all(pattern=r"^test(\sline-\d+)?$")
-    assert database[CACHE_COLLECTION].find_one({"cache_key": "test"}) is None
-    assert database[CACHE_COLLECTION].find_one({"cache_key": "test line-42"}) is None
-    assert database[CACHE_COLLECTION].find_one({"cache_key": "foobar"}) is not None
+
+    mongo_cache_repository.create_indexes()
+    mongo_cache_repository.set("test", {"data": "data"})
+
+    assert database[CACHE_COLLECTION].count_documents({"cache_key": "test"}) == 1
+    assert database[CACHE_COLLECTION].index_information()["cache_key_1"]["unique"]
+
+
+def test_acquire_lease(mongo_cache_repository) -> None:
+    assert mongo_cache_repository.acquire_lease("test", 30) is True
+    assert mongo_cache_repository.acquire_lease("test", 30) is False
+
+
+def test_acquire_expired_lease(mongo_cache_repository) -> None:
+    assert mongo_cache_repository.acquire_lease("test", -1) is True
+    assert mongo_cache_repository.acquire_lease("test", 30) is True
+
+
+def test_release_lease(mongo_cache_repository) -> None:
+    mongo_cache_repository.acquire_lease("test", 30)
+    mongo_cache_repository.release_lease("test")
+    mongo_cache_repository.release_lease("test")
+    assert mongo_cache_repository.acquire_lease("test", 30) is True
+
+
+def test_count(mongo_cache_repository) -> None:
+    mongo_cache_repository.set("first", {"data": "data"})
+    mongo_cache_repository.set("second", {"data": "data"})
+    assert mongo_cache_repository.count() == 2
+
+
+def test_get_many(mongo_cache_repository) -> None:
+    mongo_cache_repository.set("first", {"data": 1})
+    mongo_cache_repository.set("second", {"data": 2})
+    assert mongo_cache_repository.get_many(["first", "second", "missing"]) == {
+        "first": {"data": 1},
+        "second": {"data": 2},
+    }
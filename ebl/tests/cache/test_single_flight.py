@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+from falcon_caching import Cache
+
+from ebl.cache.application.single_flight import SingleFlight, memoize
+
+
+def test_do_returns_result() -> None:
+    assert SingleFlight().do("key", lambda: 1) == 1
+
+
+def test_do_raises() -> None:
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError, match="failed"):
+        SingleFlight().do("key", fail)
+
+
+def test_do_coalesces_concurrent_calls() -> None:
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return len(calls)
+
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", compute)))
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("key", compute)))
+        for _ in range(3)
+    ]
+    for follower in followers:
+        follower.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == [1, 1, 1, 1]
+
+
+def test_memoize() -> None:
+    cache = Cache(config={"CACHE_TYPE": "simple"})
+    calls = []
+
+    @memoize(cache, 60)
+    def compute(value):
+        calls.append(value)
+        return value * 2
+
+    assert compute(2) == 4
+    assert compute(2) == 4
+    assert compute(3) == 6
+    assert calls == [2, 3]
+
+
+def test_memoize_serves_stale_while_revalidating() -> None:
+    cache = Cache(config={"CACHE_TYPE": "simple"})
+    calls = []
+    refreshed = threading.Event()
+
+    @memoize(cache, 0, 60)
+    def compute():
+        calls.append(1)
+        if len(calls) > 1:
+            refreshed.set()
+        return len(calls)
+
+    assert compute() == 1
+    time.sleep(0.01)
+    assert compute() == 1
+    assert refreshed.wait(5)
+    time.sleep(0.1)
+    assert compute() == 2
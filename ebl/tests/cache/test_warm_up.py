@@ -0,0 +1,68 @@
+import json
+import time
+
+from mockito import mock
+
+from ebl.cache.warm_up import CacheWarmer, RateLimiter, WarmUpReport, read_numbers
+from ebl.errors import NotFoundError
+from ebl.tests.factories.corpus import ChapterFactory
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+STATISTICS = {"transliteratedFragments": 2, "lines": 10}
+
+
+def test_warm_up(when) -> None:
+    chapter = ChapterFactory.build()
+    number = MuseumNumber.of("X.1")
+    missing = MuseumNumber.of("X.2")
+    corpus = mock()
+    chapter_cache = mock()
+    fragments = mock()
+    when(corpus).list_all_chapters().thenReturn(
+        [
+            {
+                "chapter": chapter.name,
+                "stage": chapter.stage.long_name,
+                "index": chapter.text_id.index,
+                "category": chapter.text_id.category,
+                "genre": chapter.text_id.genre.value,
+            }
+        ]
+    )
+    when(chapter_cache).get_or_set_chapter(
+        chapter.id_, str(chapter.id_), ...
+    ).thenReturn({"lines": []})
+    when(chapter_cache).count().thenReturn(3)
+    when(fragments).query_by_museum_number(number).thenReturn(None)
+    when(fragments).query_by_museum_number(missing).thenRaise(
+        NotFoundError("not found")
+    )
+
+    report = CacheWarmer(corpus, chapter_cache, fragments, lambda: STATISTICS).warm_up(
+        [number, missing]
+    )
+
+    assert report == WarmUpReport(
+        chapters=1,
+        fragments=1,
+        statistics=1,
+        bytes=len(json.dumps({"lines": []})) + len(json.dumps(STATISTICS)),
+        seconds=report.seconds,
+        cache_entries=3,
+        errors=["fragment X.2\tnot found"],
+    )
+
+
+def test_rate_limiter() -> None:
+    limiter = RateLimiter(20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.2
+
+
+def test_read_numbers(tmp_path) -> None:
+    path = tmp_path / "fragments.txt"
+    path.write_text("X.1\n\nX.2\n", encoding="utf-8")
+    assert read_numbers(path) == [MuseumNumber.of("X.1"), MuseumNumber.of("X.2")]
+    assert read_numbers(None) == []
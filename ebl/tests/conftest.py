@@ -86,6 +86,7 @@ from ebl.afo_register.infrastructure.mongo_afo_register_repository import (
 )
 from ebl.users.domain.user import Guest, User
 from ebl.users.infrastructure.auth0 import Auth0User
+from ebl.versions import Versions
 from ebl.fragmentarium.web.annotations import AnnotationResource
 from ebl.tests.factories.archaeology import FindspotFactory, FINDSPOT_COUNT
 
@@ -114,6 +115,11 @@ class TestWordRepository(MongoWordRepository):
         return [self._collection.find_one({})]
 
 
+@pytest.fixture
+def versions(database):
+    return Versions(database)
+
+
 @pytest.fixture
 def word_repository(database):
     return TestWordRepository(database)
@@ -424,6 +430,7 @@ def user() -> User:
                     "read:texts",
                     "write:texts",
                     "create:texts",
+                    "read:metrics",
                 ]
             )
         },
@@ -455,6 +462,7 @@ def context(
     user,
     parallel_line_injector,
     mongo_cache_repository,
+    versions,
 ):
     return ebl.context.Context(
         ebl_ai_client=ebl_ai_client,
@@ -477,6 +485,7 @@ def context(
         cache=Cache({"CACHE_TYPE": "null"}),
         custom_cache=ChapterCache(mongo_cache_repository),
         parallel_line_injector=parallel_line_injector,
+        versions=versions,
     )
 
 
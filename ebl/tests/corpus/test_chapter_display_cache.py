@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from mockito import verify
+
+from ebl.cache.application.custom_cache import ChapterCache
+from ebl.corpus.application.chapter_display_cache import (
+    BLOCK_SIZE,
+    ChapterDisplayCache,
+)
+from ebl.corpus.application.display_schemas import ChapterDisplaySchema
+from ebl.corpus.domain.chapter_display import ChapterDisplay
+from ebl.tests.factories.corpus import ChapterFactory, LineFactory, TextFactory
+
+CHAPTER = ChapterFactory.build(
+    lines=LineFactory.build_batch(BLOCK_SIZE + 2, manuscript_id=1)
+)
+CHAPTER_DISPLAY = ChapterDisplay.of_chapter(TextFactory.build(), CHAPTER)
+DUMP = ChapterDisplaySchema().dump(CHAPTER_DISPLAY)
+
+
+@pytest.fixture
+def chapter_display_cache(mongo_cache_repository, corpus, when) -> ChapterDisplayCache:
+    when(corpus).find_chapter_for_display(CHAPTER.id_).thenReturn(CHAPTER_DISPLAY)
+    return ChapterDisplayCache(ChapterCache(mongo_cache_repository), corpus)
+
+
+def test_find(chapter_display_cache, corpus) -> None:
+    assert chapter_display_cache.find(CHAPTER.id_) == DUMP
+    assert json.loads(chapter_display_cache.find_json(CHAPTER.id_)) == DUMP
+    verify(corpus, 1).find_chapter_for_display(CHAPTER.id_)
+
+
+def test_find_lines(chapter_display_cache, corpus) -> None:
+    lines = [BLOCK_SIZE + 1, 0, BLOCK_SIZE + 1, BLOCK_SIZE + 100]
+    expected = {**DUMP, "lines": [DUMP["lines"][0], DUMP["lines"][BLOCK_SIZE + 1]]}
+
+    assert chapter_display_cache.find_lines(CHAPTER.id_, lines) == expected
+    assert chapter_display_cache.find_lines(CHAPTER.id_, lines) == expected
+    verify(corpus, 1).find_chapter_for_display(CHAPTER.id_)
+
+
+def test_invalidate_lines(
+    chapter_display_cache, corpus, mongo_cache_repository
+) -> None:
+    chapter_display_cache.find_lines(CHAPTER.id_, [0, BLOCK_SIZE])
+    chapter_display_cache.invalidate(CHAPTER.id_, [BLOCK_SIZE])
+
+    assert mongo_cache_repository.has(f"{CHAPTER.id_} lines 0") is True
+    assert mongo_cache_repository.has(f"{CHAPTER.id_} lines 1") is False
+    assert mongo_cache_repository.has(f"{CHAPTER.id_} header") is False
+    assert mongo_cache_repository.has(str(CHAPTER.id_)) is False
+
+
+def test_invalidate_chapter(
+    chapter_display_cache, corpus, mongo_cache_repository
+) -> None:
+    chapter_display_cache.find_lines(CHAPTER.id_, [0, BLOCK_SIZE])
+    chapter_display_cache.invalidate(CHAPTER.id_)
+
+    assert mongo_cache_repository.count() == 0
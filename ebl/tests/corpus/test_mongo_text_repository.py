@@ -270,6 +270,13 @@ def test_finding_line_not_found(database, text_repository) -> None:
         text_repository.find_line(CHAPTER.id_, len(CHAPTER.lines))
 
 
+def test_finding_line_negative_number(database, text_repository) -> None:
+    when_chapter_in_collection(database)
+
+    with pytest.raises(NotFoundError):  # pyre-ignore[16]
+        text_repository.find_line(CHAPTER.id_, -1)
+
+
 def test_finding_line_chapter_not_found(database, text_repository) -> None:
     with pytest.raises(NotFoundError):  # pyre-ignore[16]
         text_repository.find_line(CHAPTER.id_, 0)
@@ -286,6 +293,23 @@ def test_updating_chapter(database, text_repository) -> None:
     assert text_repository.find_chapter(CHAPTER.id_) == updated_chapter
 
 
+def test_chapters_generation(text_repository) -> None:
+    generation = text_repository.get_chapters_generation()
+
+    text_repository.create_chapter(CHAPTER)
+    text_repository.update(CHAPTER.id_, CHAPTER)
+
+    assert text_repository.get_chapters_generation() == generation + 2
+
+
+def test_creating_chapter_increments_version(text_repository, versions) -> None:
+    version = versions.find(CHAPTERS_COLLECTION, str(CHAPTER.id_)).version
+
+    text_repository.create_chapter(CHAPTER)
+
+    assert versions.find(CHAPTERS_COLLECTION, str(CHAPTER.id_)).version == version + 1
+
+
 def test_updating_non_existing_chapter_raises_exception(text_repository):
     with pytest.raises(NotFoundError):
         text_repository.update(CHAPTER.id_, CHAPTER)
@@ -177,3 +177,12 @@ def test_update(word_repository, word):
     word_repository.update(updated_word)
 
     assert word_repository.query_by_id(word_id) == updated_word
+
+
+def test_update_increments_version(word_repository, versions, word):
+    word_id = word_repository.create(word)
+
+    word_repository.update(word)
+    word_repository.update(word)
+
+    assert versions.find(COLLECTION, word_id).version == 2
@@ -19,3 +19,22 @@ def test_get_image_as_guest(guest_client, file):
     result = guest_client.simulate_get(f"/images/{file.filename}")
 
     assert result.content == file.data
+
+
+def test_get_image_sets_last_modified(client, file):
+    result = client.simulate_get(f"/images/{file.filename}")
+
+    assert "Last-Modified" in result.headers
+
+
+def test_get_image_not_modified(client, file):
+    last_modified = client.simulate_get(f"/images/{file.filename}").headers[
+        "Last-Modified"
+    ]
+
+    result = client.simulate_get(
+        f"/images/{file.filename}", headers={"If-Modified-Since": last_modified}
+    )
+
+    assert result.status == falcon.HTTP_NOT_MODIFIED
+    assert result.content == b""
@@ -123,9 +123,9 @@ def test_update(
         old_annotations
     )
     image = create_test_photo("K.2")
-    when(fragment_repository).query_by_museum_number(fragment_number).thenReturn(
-        fragment
-    )
+    when(fragment_repository).query_fields_by_museum_number(
+        fragment_number, ["text"]
+    ).thenReturn(fragment)
     (
         when(photo_repository)
         .query_by_file_name(f"{annotations.fragment_number}.jpg")
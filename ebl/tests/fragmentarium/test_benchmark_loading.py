@@ -0,0 +1,16 @@
+from ebl.fragmentarium.benchmark_loading import ACCESS_PATTERNS, benchmark, to_text
+from ebl.tests.factories.fragment import FragmentFactory
+
+
+def test_benchmark(fragment_repository, when):
+    fragment = FragmentFactory.build()
+    when(fragment_repository).query_by_museum_number(fragment.number).thenReturn(
+        fragment
+    )
+    when(fragment_repository).query_by_museum_numbers(...).thenReturn([fragment])
+
+    results = benchmark(fragment_repository, [fragment.number])
+
+    assert list(results) == list(ACCESS_PATTERNS)
+    assert all(len(durations) == 1 for durations in results.values())
+    assert to_text(results).splitlines()[0] == "pattern\tmedian ms\tp95 ms"
@@ -0,0 +1,46 @@
+import gzip as gzip_module
+import json
+
+import falcon
+import pytest
+
+from ebl.fragmentarium.web.fragment_export import NDJSON, gzip, to_ndjson
+from ebl.tests.factories.fragment import TransliteratedFragmentFactory
+
+
+def test_to_ndjson():
+    assert b"".join(to_ndjson([{"a": 1}, {"b": "c"}])) == b'{"a": 1}\n{"b": "c"}\n'
+
+
+def test_gzip():
+    chunks = [b'{"a": 1}\n', b'{"b": "c"}\n']
+
+    assert gzip_module.decompress(b"".join(gzip(chunks))) == b"".join(chunks)
+
+
+def test_export(client, fragment_repository):
+    fragment = TransliteratedFragmentFactory.build()
+    fragment_repository.create(fragment)
+
+    result = client.simulate_get("/fragments/export", params={"fields": "signs"})
+
+    assert result.status == falcon.HTTP_OK
+    assert result.headers["Content-Type"] == NDJSON
+    assert [json.loads(line) for line in result.text.splitlines()] == [
+        {
+            "_id": str(fragment.number),
+            "museumNumber": {
+                "prefix": fragment.number.prefix,
+                "number": fragment.number.number,
+                "suffix": fragment.number.suffix,
+            },
+            "signs": fragment.signs,
+        }
+    ]
+
+
+@pytest.mark.parametrize("params", [{}, {"fields": "invalid"}])
+def test_export_invalid_fields(client, params):
+    result = client.simulate_get("/fragments/export", params=params)
+
+    assert result.status == falcon.HTTP_BAD_REQUEST
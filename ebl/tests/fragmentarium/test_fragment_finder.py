@@ -164,3 +164,42 @@ def test_find_folio(fragment_finder, folio_with_allowed_scope, file_repository,
     )
 
     assert fragment_finder.find_folio(folio) == folio_with_allowed_scope
+
+
+def test_find_many(
+    fragment_finder, fragment_repository, photo_repository, parallel_line_injector, when
+):
+    fragment = FragmentFactory.build()
+    number = fragment.number
+    (
+        when(fragment_repository)
+        .query_by_museum_numbers([number], None)
+        .thenReturn([fragment])
+    )
+    (when(photo_repository).query_if_file_exists(f"{number}.jpg").thenReturn(True))
+    expected_fragment = fragment.set_text(
+        parallel_line_injector.inject_transliteration(fragment.text)
+    )
+
+    assert fragment_finder.find_many([number]) == [(expected_fragment, True)]
+
+
+def test_find_joins(fragment_finder, fragment_repository, when):
+    fragment = FragmentFactory.build()
+    (
+        when(fragment_repository)
+        .query_by_museum_numbers([fragment.number], ["joins"])
+        .thenReturn([fragment])
+    )
+
+    assert fragment_finder.find_joins(fragment.number) == fragment.joins
+
+
+def test_find_joins_not_found(fragment_finder, fragment_repository, when):
+    number = MuseumNumber("unknown", "id")
+    when(fragment_repository).query_by_museum_numbers([number], ["joins"]).thenReturn(
+        []
+    )
+
+    with pytest.raises(NotFoundError):
+        fragment_finder.find_joins(number)
@@ -13,7 +13,11 @@ def test_find(fragment_repository, when, fragment_matcher):
     line_to_vec = (LineToVecEncoding.from_list((1, 2, 1, 1)),)
     number = MuseumNumber.of("BM.11")
     fragment = FragmentFactory.build(number=number, line_to_vec=line_to_vec)
-    (when(fragment_repository).query_by_museum_number(number).thenReturn(fragment))
+    (
+        when(fragment_repository)
+        .query_fields_by_museum_number(number, ["line_to_vec"])
+        .thenReturn(fragment)
+    )
     assert fragment_matcher._parse_candidate("BM.11") == line_to_vec
 
 
@@ -47,7 +51,7 @@ def test_line_to_vec(fragment_matcher, when):
 
     (
         when(fragment_matcher._fragment_repository)
-        .query_by_museum_number(MuseumNumber.of(parameters))
+        .query_fields_by_museum_number(MuseumNumber.of(parameters), ["line_to_vec"])
         .thenReturn(fragment_1)
     )
     (
@@ -79,7 +83,7 @@ def test_empty_line_to_vec(fragment_matcher, when):
 
     (
         when(fragment_matcher._fragment_repository)
-        .query_by_museum_number(MuseumNumber.of(parameters))
+        .query_fields_by_museum_number(MuseumNumber.of(parameters), ["line_to_vec"])
         .thenReturn(fragment_1)
     )
     (
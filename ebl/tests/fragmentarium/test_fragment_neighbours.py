@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from ebl.fragmentarium.domain.folios import Folio, Folios
+from ebl.fragmentarium.infrastructure.fragment_neighbours import (
+    FragmentNeighbours,
+    encode_order,
+)
+from ebl.tests.factories.fragment import FragmentFactory
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+MUSEUM_NUMBERS = [
+    "K.1a",
+    "K.1b",
+    "K.2",
+    "K.10",
+    "DT.1",
+    "Rm-II.1",
+    "1840.10",
+    "1841.9",
+    "1841.54",
+    "BM.0",
+    "N.1",
+    "1841-57.54",
+    "Asb.p",
+    "Asb.pq",
+    "Ashm-1878.1",
+    "U.0.a",
+    "U.0.2",
+    "X.0",
+]
+
+
+@pytest.fixture
+def neighbours(database) -> FragmentNeighbours:
+    return FragmentNeighbours(database)
+
+
+def test_encode_order():
+    numbers = [MuseumNumber.of(number) for number in MUSEUM_NUMBERS]
+
+    assert sorted(numbers, key=lambda number: encode_order(number.order)) == sorted(
+        numbers
+    )
+
+
+def test_insert_links_fragments_in_museum_number_order(fragment_repository, neighbours):
+    numbers = [MuseumNumber.of(number) for number in MUSEUM_NUMBERS]
+    shuffled = random.Random(0).sample(numbers, len(numbers))
+    for number in shuffled:
+        fragment_repository.create(FragmentFactory.build(number=number))
+
+    ordered = sorted(numbers)
+    for index, number in enumerate(ordered):
+        pager = fragment_repository.query_next_and_previous_fragment(number)
+        assert pager.previous == ordered[index - 1]
+        assert pager.next == ordered[(index + 1) % len(ordered)]
+
+
+def test_insert_links_folios(fragment_repository):
+    fragments = [
+        FragmentFactory.build(
+            number=MuseumNumber("X", str(index)),
+            folios=Folios((Folio("WGL", str(folio)),)),
+        )
+        for index, folio in [(1, 2), (2, 1), (3, 3)]
+    ]
+    fragment_repository.create_many(fragments)
+
+    assert fragment_repository.query_next_and_previous_folio(
+        "WGL", "1", MuseumNumber("X", "2")
+    ) == {
+        "previous": {"fragmentNumber": "X.3", "folioNumber": "3"},
+        "next": {"fragmentNumber": "X.1", "folioNumber": "2"},
+    }
+
+
+def test_rebuild(fragment_repository, neighbours, database):
+    numbers = [MuseumNumber("X", str(index)) for index in range(3)]
+    for number in numbers:
+        fragment_repository.create(
+            FragmentFactory.build(number=number, folios=Folios((Folio("WGL", "1"),)))
+        )
+    expected = list(database["fragment_neighbours"].find({}, sort=[("_id", 1)]))
+    database["fragment_neighbours"].insert_one({"_id": "stale", "sequence": "stale"})
+    database["fragment_neighbours"].update_many({}, {"$set": {"next": None}})
+
+    neighbours.rebuild()
+
+    assert [
+        {key: value for key, value in document.items() if key != "build"}
+        for document in database["fragment_neighbours"].find({}, sort=[("_id", 1)])
+    ] == expected
+
+
+def test_pager_falls_back_to_sort_key(fragment_repository, database):
+    for index in range(3):
+        fragment_repository.create(
+            FragmentFactory.build(number=MuseumNumber("X", str(index))),
+            sort_key=index,
+        )
+    database["fragment_neighbours"].delete_many({})
+
+    pager = fragment_repository.query_next_and_previous_fragment(MuseumNumber("X", "0"))
+
+    assert (pager.previous, pager.next) == (
+        MuseumNumber("X", "2"),
+        MuseumNumber("X", "1"),
+    )
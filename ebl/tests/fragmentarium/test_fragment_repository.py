@@ -10,7 +10,7 @@ from ebl.common.domain.scopes import Scope
 from ebl.common.query.query_result import QueryItem, QueryResult
 
 from ebl.dictionary.domain.word import WordId
-from ebl.errors import NotFoundError
+from ebl.errors import ConflictError, NotFoundError
 from ebl.fragmentarium.application.fragment_repository import FragmentRepository
 from ebl.fragmentarium.domain.record import RecordType
 from ebl.fragmentarium.infrastructure.queries import LATEST_TRANSLITERATION_LINE_LIMIT
@@ -44,6 +44,7 @@ from ebl.tests.factories.fragment import (
 from ebl.transliteration.domain.lark_parser import parse_atf_lark
 from ebl.transliteration.domain.line import ControlLine, EmptyLine
 from ebl.transliteration.domain.line_number import LineNumber
+from ebl.transliteration.application.museum_number_schema import MuseumNumberSchema
 from ebl.transliteration.domain.museum_number import MuseumNumber
 from ebl.transliteration.domain.normalized_akkadian import AkkadianWord
 from ebl.transliteration.domain.parallel_line import Labels, ParallelFragment
@@ -212,6 +213,42 @@ def test_museum_number_wildcard(fragment_repository, query, expected):
     assert fragment_repository.query({"number": query}) == expected_result
 
 
+def test_query_by_museum_numbers(database, fragment_repository):
+    fragments = [
+        FragmentFactory.build(number=MuseumNumber.of(number))
+        for number in ["X.1", "X.2", "X.3"]
+    ]
+    database[COLLECTION].insert_many(
+        [FragmentSchema(exclude=["joins"]).dump(fragment) for fragment in fragments]
+    )
+    numbers = [MuseumNumber.of(number) for number in ["X.3", "X.4", "X.1"]]
+
+    assert [
+        fragment.number
+        for fragment in fragment_repository.query_by_museum_numbers(numbers)
+    ] == [MuseumNumber.of("X.3"), MuseumNumber.of("X.1")]
+
+
+def test_query_by_museum_numbers_empty(fragment_repository):
+    assert fragment_repository.query_by_museum_numbers([]) == []
+
+
+def test_query_by_museum_numbers_with_projection(database, fragment_repository):
+    fragment = TransliteratedFragmentFactory.build()
+    database[COLLECTION].insert_one(FragmentSchema(exclude=["joins"]).dump(fragment))
+
+    assert fragment_repository.query_by_museum_numbers(
+        [fragment.number], ["signs", "notes"]
+    ) == [Fragment(fragment.number, signs=fragment.signs, notes=fragment.notes)]
+
+
+def test_query_by_museum_numbers_with_invalid_projection(fragment_repository):
+    with pytest.raises(ValueError):
+        fragment_repository.query_by_museum_numbers(
+            [MuseumNumber.of("X.1")], ["invalid"]
+        )
+
+
 def test_query_by_museum_number_joins(database, fragment_repository):
     museum_number = MuseumNumber("X", "1")
     first_join = Join(museum_number, is_in_fragmentarium=True)
@@ -294,6 +331,19 @@ def test_find_random_skips_restricted_fragments(fragment_repository):
     assert fragment_repository.query_random_by_transliterated() == []
 
 
+def test_find_random_after_transliteration_update(fragment_repository, user):
+    fragment = FragmentFactory.build()
+    fragment_repository.create(fragment)
+    assert fragment_repository.query_random_by_transliterated() == []
+
+    updated_fragment = fragment.update_transliteration(
+        TransliterationUpdate(parse_atf_lark("1. kur")), user
+    )
+    fragment_repository.update_field("transliteration", updated_fragment)
+
+    assert fragment_repository.query_random_by_transliterated() == [updated_fragment]
+
+
 def test_folio_pager_exception(fragment_repository):
     with pytest.raises(NotFoundError):
         museum_number = MuseumNumber.of("1841-07-26.54")
@@ -447,6 +497,103 @@ def test_update_script(fragment_repository: FragmentRepository):
     assert result == updated_fragment
 
 
+def test_update_field_returns_updated_fragment(database, fragment_repository):
+    fragment: Fragment = FragmentFactory.build(notes=Notes())
+    fragment_repository.create(fragment)
+    updated_fragment = fragment.set_notes("updated")
+
+    assert fragment_repository.update_field("notes", updated_fragment) == (
+        updated_fragment
+    )
+    assert "version" not in database[COLLECTION].find_one({"_id": str(fragment.number)})
+
+
+def test_update_field_checks_version(fragment_repository: FragmentRepository):
+    fragment: Fragment = FragmentFactory.build(notes=Notes())
+    fragment_repository.create(fragment)
+    version = fragment_repository.fetch_version(fragment.number)
+
+    fragment_repository.update_field("notes", fragment.set_notes("first"), version)
+
+    assert fragment_repository.fetch_version(fragment.number) == version + 1
+    with pytest.raises(ConflictError):
+        fragment_repository.update_field("notes", fragment.set_notes("second"), version)
+    assert (
+        fragment_repository.query_fields_by_museum_number(
+            fragment.number, ["notes"]
+        ).notes
+        == fragment.set_notes("first").notes
+    )
+
+
+def test_update_field_with_version_not_found(
+    fragment_repository: FragmentRepository, versions
+):
+    fragment = FragmentFactory.build()
+
+    with pytest.raises(NotFoundError):
+        fragment_repository.update_field("notes", fragment.set_notes("notes"), 0)
+    assert versions.find("fragments", str(fragment.number)).modified is None
+
+
+def test_bulk_update(fragment_repository: FragmentRepository):
+    fragments = [
+        FragmentFactory.build(number=MuseumNumber("X", str(index)), notes=Notes())
+        for index in range(2)
+    ]
+    fragment_repository.create_many(fragments)
+    updated_fragments = [
+        fragment.set_notes(f"Notes {index}").set_script(Script(Period.MIDDLE_ELAMITE))
+        for index, fragment in enumerate(fragments)
+    ]
+
+    assert fragment_repository.bulk_update(["notes"], updated_fragments) == []
+    assert [
+        (result.notes, result.script)
+        for result in fragment_repository.query_by_museum_numbers(
+            [fragment.number for fragment in fragments], ["notes", "script"]
+        )
+    ] == [
+        (updated_fragment.notes, fragment.script)
+        for fragment, updated_fragment in zip(fragments, updated_fragments)
+    ]
+    assert [
+        fragment_repository.fetch_version(fragment.number) for fragment in fragments
+    ] == [1, 1]
+
+
+def test_bulk_update_reports_missing_fragments(
+    fragment_repository: FragmentRepository,
+):
+    fragment = FragmentFactory.build(number=MuseumNumber("X", "1"))
+    missing_fragment = FragmentFactory.build(number=MuseumNumber("X", "2"))
+    fragment_repository.create(fragment)
+    updated_fragments = [
+        fragment.set_notes("Notes"),
+        missing_fragment.set_notes("Notes"),
+    ]
+
+    [(failed_fragment, error)] = fragment_repository.bulk_update(
+        ["notes"], updated_fragments
+    )
+
+    assert failed_fragment == updated_fragments[1]
+    assert isinstance(error, NotFoundError)
+    assert (
+        fragment_repository.query_fields_by_museum_number(
+            fragment.number, ["notes"]
+        ).notes
+        == updated_fragments[0].notes
+    )
+    assert fragment_repository.fetch_version(fragment.number) == 1
+    assert fragment_repository.fetch_version(missing_fragment.number) == 0
+
+
+def test_bulk_update_invalid_field(fragment_repository: FragmentRepository):
+    with pytest.raises(ValueError):
+        fragment_repository.bulk_update(["invalid"], [FragmentFactory.build()])
+
+
 def test_update_update_lemmatization_not_found(fragment_repository):
     transliterated_fragment = TransliteratedFragmentFactory.build()
     with pytest.raises(NotFoundError):
@@ -1150,3 +1297,38 @@ def test_fetch_fragment_signs(fragment_repository):
     assert sort_by_id(fragment_repository.fetch_fragment_signs()) == sort_by_id(
         expected
     )
+
+
+def test_export_transliterated_fragments(fragment_repository):
+    fragments = [
+        TransliteratedFragmentFactory.build(number=MuseumNumber("X", str(index)))
+        for index in range(5)
+    ]
+    fragment_repository.create_many(
+        [
+            *fragments,
+            FragmentFactory.build(number=MuseumNumber("X", "5")),
+            TransliteratedFragmentFactory.build(
+                number=MuseumNumber("X", "6"),
+                authorized_scopes=[Scope.READ_ITALIANNINEVEH_FRAGMENTS],
+            ),
+        ]
+    )
+
+    assert list(
+        fragment_repository.export_transliterated_fragments(
+            ["signs"], after="X.1", batch_size=2
+        )
+    ) == [
+        {
+            "_id": str(fragment.number),
+            "museumNumber": MuseumNumberSchema().dump(fragment.number),
+            "signs": fragment.signs,
+        }
+        for fragment in fragments[2:]
+    ]
+
+
+def test_export_transliterated_fragments_invalid_field(fragment_repository):
+    with pytest.raises(ValueError, match="Unexpected fragment fields invalid"):
+        fragment_repository.export_transliterated_fragments(["invalid"])
@@ -0,0 +1,199 @@
+import pytest
+
+from ebl.common.domain.scopes import Scope
+from ebl.fragmentarium.domain.transliteration_update import TransliterationUpdate
+from ebl.fragmentarium.infrastructure.fragment_statistics import FragmentStatistics
+from ebl.fragmentarium.reconcile_statistics import to_text
+from ebl.tests.factories.fragment import (
+    FragmentFactory,
+    TransliteratedFragmentFactory,
+)
+from ebl.transliteration.domain.lark_parser import parse_atf_lark
+from ebl.transliteration.domain.museum_number import MuseumNumber
+from ebl.transliteration.domain.text import Text
+
+
+@pytest.fixture
+def statistics(database) -> FragmentStatistics:
+    return FragmentStatistics(database)
+
+
+def test_statistics_are_updated_on_create(fragment_repository, statistics):
+    assert statistics.find() == {
+        "transliteratedFragments": 0,
+        "publicTransliteratedFragments": 0,
+        "lines": 0,
+    }
+    transliterated = TransliteratedFragmentFactory.build()
+
+    fragment_repository.create(transliterated)
+    fragment_repository.create_many(
+        [
+            FragmentFactory.build(),
+            TransliteratedFragmentFactory.build(
+                authorized_scopes=[Scope.READ_ITALIANNINEVEH_FRAGMENTS]
+            ),
+        ]
+    )
+
+    assert statistics.find() == {
+        "transliteratedFragments": 2,
+        "publicTransliteratedFragments": 1,
+        "lines": 2 * transliterated.text.number_of_lines,
+    }
+    assert statistics.reconcile() == {}
+
+
+def test_statistics_are_updated_on_transliteration(
+    fragment_repository, statistics, user
+):
+    fragment = FragmentFactory.build()
+    fragment_repository.create(fragment)
+    statistics.find()
+
+    transliterated = fragment.update_transliteration(
+        TransliterationUpdate(parse_atf_lark("1. kur\n2. ra")), user
+    )
+    fragment_repository.update_field("transliteration", transliterated)
+
+    assert statistics.find() == {
+        "transliteratedFragments": 1,
+        "publicTransliteratedFragments": 1,
+        "lines": 2,
+    }
+
+    fragment_repository.update_field(
+        "transliteration",
+        transliterated.update_transliteration(TransliterationUpdate(Text()), user),
+    )
+
+    assert statistics.find() == {
+        "transliteratedFragments": 0,
+        "publicTransliteratedFragments": 0,
+        "lines": 0,
+    }
+
+
+def test_statistics_are_updated_on_bulk_update(fragment_repository, statistics, user):
+    fragments = [
+        FragmentFactory.build(number=MuseumNumber("X", str(index)))
+        for index in range(3)
+    ]
+    fragment_repository.create_many(fragments)
+    statistics.find()
+
+    fragment_repository.bulk_update(
+        ["text", "signs", "record", "line_to_vec"],
+        [
+            fragment.update_transliteration(
+                TransliterationUpdate(parse_atf_lark("1. kur\n2. ra")), user
+            )
+            for fragment in fragments[:2]
+        ],
+    )
+
+    assert statistics.find() == {
+        "transliteratedFragments": 2,
+        "publicTransliteratedFragments": 2,
+        "lines": 4,
+    }
+    assert statistics.reconcile() == {}
+
+
+def test_statistics_skip_missing_fragments_on_bulk_update(
+    fragment_repository, statistics, user
+):
+    fragment = FragmentFactory.build(number=MuseumNumber("X", "1"))
+    fragment_repository.create(fragment)
+    statistics.find()
+
+    errors = fragment_repository.bulk_update(
+        ["text", "signs", "record", "line_to_vec"],
+        [
+            fragment.update_transliteration(
+                TransliterationUpdate(parse_atf_lark("1. kur\n2. ra")), user
+            )
+            for fragment in [fragment, FragmentFactory.build()]
+        ],
+    )
+
+    assert len(errors) == 1
+    assert statistics.find()["lines"] == 2
+    assert statistics.reconcile() == {}
+
+
+def test_statistics_are_exact_on_concurrent_bulk_update(
+    fragment_repository, statistics, user, when
+):
+    fragment = FragmentFactory.build(number=MuseumNumber("X", "1"))
+    fragment_repository.create(fragment)
+    statistics.find()
+    sources = statistics.find_sources({"_id": "X.1"})
+    fragment_repository.update_field(
+        "transliteration",
+        fragment.update_transliteration(
+            TransliterationUpdate(parse_atf_lark("1. kur\n2. ra\n3. ku")), user
+        ),
+    )
+    when(fragment_repository._statistics).find_sources(...).thenReturn(sources)
+
+    fragment_repository.bulk_update(
+        ["text", "signs", "record", "line_to_vec"],
+        [
+            fragment.update_transliteration(
+                TransliterationUpdate(parse_atf_lark("1. kur\n2. ra")), user
+            )
+        ],
+    )
+
+    assert statistics.find()["lines"] == 2
+    assert statistics.reconcile() == {}
+
+
+def test_bulk_update_is_written_when_counts_changed_to_the_same(
+    fragment_repository, statistics, user, when
+):
+    fragment = FragmentFactory.build(number=MuseumNumber("X", "1"))
+    fragment_repository.create(fragment)
+    statistics.find()
+    sources = statistics.find_sources({"_id": "X.1"})
+    transliteration = TransliterationUpdate(parse_atf_lark("1. kur\n2. ra"))
+    fragment_repository.update_field(
+        "transliteration", fragment.update_transliteration(transliteration, user)
+    )
+    when(fragment_repository._statistics).find_sources(...).thenReturn(sources)
+    updated_fragment = fragment.update_transliteration(transliteration, user)
+
+    assert (
+        fragment_repository.bulk_update(
+            ["text", "signs", "record", "line_to_vec"], [updated_fragment]
+        )
+        == []
+    )
+
+    assert (
+        fragment_repository.query_fields_by_museum_number(
+            fragment.number, ["record"]
+        ).record
+        == updated_fragment.record
+    )
+    assert statistics.find()["lines"] == 2
+    assert statistics.reconcile() == {}
+
+
+def test_reconcile_reports_drift(fragment_repository, statistics, database):
+    fragment_repository.create(TransliteratedFragmentFactory.build())
+    statistics.find()
+    database["statistics"].update_one(
+        {"_id": "fragments"}, {"$inc": {"transliteratedFragments": 3}}
+    )
+
+    assert statistics.reconcile() == {"transliteratedFragments": -3}
+    assert statistics.find()["transliteratedFragments"] == 1
+
+
+def test_to_text():
+    assert to_text({"lines": -2, "transliteratedFragments": 1}) == (
+        "lines\t-2\ntransliteratedFragments\t+1"
+    )
+    assert to_text({}) == "No drift."
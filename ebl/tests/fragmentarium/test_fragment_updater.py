@@ -1,9 +1,15 @@
 from freezegun import freeze_time
+from mockito import verify
 import pytest
 
-from ebl.errors import DataError, NotFoundError
+from ebl.errors import ConflictError, DataError, NotFoundError
 from ebl.fragmentarium.application.fragment_schema import FragmentSchema
-from ebl.fragmentarium.application.fragment_updater import FragmentUpdater
+from ebl.fragmentarium.application.fragment_updater import (
+    LOWEST_JOIN_FIELDS,
+    RESULT_FIELDS,
+    TRANSLITERATION_FIELDS,
+    FragmentUpdater,
+)
 from ebl.fragmentarium.domain.fragment import Fragment, Genre, NotLowestJoinError
 from ebl.fragmentarium.domain.joins import Join, Joins
 from ebl.transliteration.domain.museum_number import MuseumNumber
@@ -51,9 +57,17 @@ def test_update_transliteration(
     injected_fragment = transliterated_fragment.set_text(
         parallel_line_injector.inject_transliteration(transliterated_fragment.text)
     )
+    when(fragment_repository).fetch_version(number).thenReturn(0)
     (
         when(fragment_repository)
-        .query_by_museum_number(number)
+        .query_fields_by_museum_number(
+            number,
+            (
+                [*TRANSLITERATION_FIELDS, *RESULT_FIELDS]
+                if ignore_lowest_join
+                else [*LOWEST_JOIN_FIELDS, "archaeology"]
+            ),
+        )
         .thenReturn(transliterated_fragment)
     )
     when(changelog).create(
@@ -64,8 +78,8 @@ def test_update_transliteration(
     ).thenReturn()
     (
         when(fragment_repository)
-        .update_field("transliteration", transliterated_fragment)
-        .thenReturn()
+        .update_field("transliteration", transliterated_fragment, 0)
+        .thenReturn(transliterated_fragment)
     )
 
     result = fragment_updater.update_transliteration(
@@ -79,7 +93,7 @@ def test_update_update_transliteration_not_found(
     fragment_updater, user, fragment_repository, when
 ):
     number = "unknown.number"
-    (when(fragment_repository).query_by_museum_number(number).thenRaise(NotFoundError))
+    when(fragment_repository).fetch_version(number).thenRaise(NotFoundError)
 
     with pytest.raises(NotFoundError):
         fragment_updater.update_transliteration(
@@ -98,9 +112,10 @@ def test_update_update_transliteration_not_lowest_join(
         joins=Joins([[Join(MuseumNumber.of("X.1"), is_in_fragmentarium=True)]]),
     )
 
+    when(fragment_repository).fetch_version(number).thenReturn(0)
     (
         when(fragment_repository)
-        .query_by_museum_number(number)
+        .query_fields_by_museum_number(number, [*LOWEST_JOIN_FIELDS, "archaeology"])
         .thenReturn(transliterated_fragment)
     )
 
@@ -123,14 +138,19 @@ def test_update_genres(
     injected_fragment = updated_fragment.set_text(
         parallel_line_injector.inject_transliteration(updated_fragment.text)
     )
-    when(fragment_repository).query_by_museum_number(number).thenReturn(fragment)
+    when(fragment_repository).fetch_version(number).thenReturn(0)
+    when(fragment_repository).query_fields_by_museum_number(
+        number, ["genres", *RESULT_FIELDS]
+    ).thenReturn(fragment)
     when(changelog).create(
         "fragments",
         user.profile,
         {"_id": str(number), **SCHEMA.dump(fragment)},
         {"_id": str(number), **SCHEMA.dump(updated_fragment)},
     ).thenReturn()
-    when(fragment_repository).update_field("genres", updated_fragment).thenReturn()
+    when(fragment_repository).update_field("genres", updated_fragment, 0).thenReturn(
+        updated_fragment
+    )
 
     result = fragment_updater.update_genres(number, genres, user)
     assert result == (injected_fragment, False)
@@ -146,14 +166,19 @@ def test_update_date(
     injected_fragment = updated_fragment.set_text(
         parallel_line_injector.inject_transliteration(updated_fragment.text)
     )
-    when(fragment_repository).query_by_museum_number(number).thenReturn(fragment)
+    when(fragment_repository).fetch_version(number).thenReturn(0)
+    when(fragment_repository).query_fields_by_museum_number(
+        number, ["date", *RESULT_FIELDS]
+    ).thenReturn(fragment)
     when(changelog).create(
         "fragments",
         user.profile,
         {"_id": str(number), **SCHEMA.dump(fragment)},
         {"_id": str(number), **SCHEMA.dump(updated_fragment)},
     ).thenReturn()
-    when(fragment_repository).update_field("date", updated_fragment).thenReturn()
+    when(fragment_repository).update_field("date", updated_fragment, 0).thenReturn(
+        updated_fragment
+    )
 
     result = fragment_updater.update_date(number, date, user)
     assert result == (injected_fragment, False)
@@ -169,7 +194,10 @@ def test_update_dates_in_text(
     injected_fragment = updated_fragment.set_text(
         parallel_line_injector.inject_transliteration(updated_fragment.text)
     )
-    when(fragment_repository).query_by_museum_number(number).thenReturn(fragment)
+    when(fragment_repository).fetch_version(number).thenReturn(0)
+    when(fragment_repository).query_fields_by_museum_number(
+        number, ["dates_in_text", *RESULT_FIELDS]
+    ).thenReturn(fragment)
     when(changelog).create(
         "fragments",
         user.profile,
@@ -177,8 +205,8 @@ def test_update_dates_in_text(
         {"_id": str(number), **SCHEMA.dump(updated_fragment)},
     ).thenReturn()
     when(fragment_repository).update_field(
-        "dates_in_text", updated_fragment
-    ).thenReturn()
+        "dates_in_text", updated_fragment, 0
+    ).thenReturn(updated_fragment)
 
     result = fragment_updater.update_dates_in_text(number, dates_in_text, user)
     assert result == (injected_fragment, False)
@@ -194,9 +222,10 @@ def test_update_lemmatization(
     tokens[1][3] = LemmatizationToken(tokens[1][3].value, ("aklu I",))
     lemmatization = Lemmatization(tokens)
     lemmatized_fragment = transliterated_fragment.update_lemmatization(lemmatization)
+    when(fragment_repository).fetch_version(number).thenReturn(0)
     (
         when(fragment_repository)
-        .query_by_museum_number(number)
+        .query_fields_by_museum_number(number, ["text", *RESULT_FIELDS])
         .thenReturn(transliterated_fragment)
     )
     injected_fragment = lemmatized_fragment.set_text(
@@ -209,8 +238,8 @@ def test_update_lemmatization(
         {"_id": str(number), **SCHEMA.dump(lemmatized_fragment)},
     ).thenReturn()
     when(fragment_repository).update_field(
-        "lemmatization", lemmatized_fragment
-    ).thenReturn()
+        "lemmatization", lemmatized_fragment, 0
+    ).thenReturn(lemmatized_fragment)
 
     result = fragment_updater.update_lemmatization(number, lemmatization, user)
     assert result == (injected_fragment, False)
@@ -220,7 +249,7 @@ def test_update_update_lemmatization_not_found(
     fragment_updater, user, fragment_repository, when
 ):
     number = "K.1"
-    (when(fragment_repository).query_by_museum_number(number).thenRaise(NotFoundError))
+    when(fragment_repository).fetch_version(number).thenRaise(NotFoundError)
 
     with pytest.raises(NotFoundError):
         fragment_updater.update_lemmatization(
@@ -246,10 +275,13 @@ def test_update_references(
         parallel_line_injector.inject_transliteration(updated_fragment.text)
     )
     when(bibliography).find(reference.id).thenReturn(reference)
-    when(fragment_repository).query_by_museum_number(number).thenReturn(
-        fragment
+    when(fragment_repository).fetch_version(number).thenReturn(0)
+    when(fragment_repository).query_fields_by_museum_number(
+        number, ["references", *RESULT_FIELDS]
+    ).thenReturn(fragment)
+    when(fragment_repository).update_field(
+        "references", updated_fragment, 0
     ).thenReturn(updated_fragment)
-    when(fragment_repository).update_field("references", updated_fragment).thenReturn()
     when(changelog).create(
         "fragments",
         user.profile,
@@ -268,7 +300,6 @@ def test_update_references_invalid(
     number = fragment.number
     reference = ReferenceFactory.build()
     when(bibliography).find(reference.id).thenRaise(NotFoundError)
-    (when(fragment_repository).query_by_museum_number(number).thenReturn(fragment))
     references = (reference,)
 
     with pytest.raises(DataError):
@@ -282,7 +313,10 @@ def test_update_introduction(
     number = fragment.number
     introduction = "Test introduction"
     updated_fragment = fragment.set_introduction(introduction)
-    when(fragment_repository).query_by_museum_number(number).thenReturn(fragment)
+    when(fragment_repository).fetch_version(number).thenReturn(0)
+    when(fragment_repository).query_fields_by_museum_number(
+        number, ["introduction", *RESULT_FIELDS]
+    ).thenReturn(fragment)
     when(changelog).create(
         "fragments",
         user.profile,
@@ -290,8 +324,8 @@ def test_update_introduction(
         {"_id": str(number), **SCHEMA.dump(updated_fragment)},
     ).thenReturn()
     when(fragment_repository).update_field(
-        "introduction", updated_fragment
-    ).thenReturn()
+        "introduction", updated_fragment, 0
+    ).thenReturn(updated_fragment)
 
     result = fragment_updater.update_introduction(number, introduction, user)
     assert result == (updated_fragment, False)
@@ -304,14 +338,129 @@ def test_update_notes(
     number = fragment.number
     notes = "Test notes"
     updated_fragment = fragment.set_notes(notes)
-    when(fragment_repository).query_by_museum_number(number).thenReturn(fragment)
+    when(fragment_repository).fetch_version(number).thenReturn(0)
+    when(fragment_repository).query_fields_by_museum_number(
+        number, ["notes", *RESULT_FIELDS]
+    ).thenReturn(fragment)
     when(changelog).create(
         "fragments",
         user.profile,
         {"_id": str(number), **SCHEMA.dump(fragment)},
         {"_id": str(number), **SCHEMA.dump(updated_fragment)},
     ).thenReturn()
-    when(fragment_repository).update_field("notes", updated_fragment).thenReturn()
+    when(fragment_repository).update_field("notes", updated_fragment, 0).thenReturn(
+        updated_fragment
+    )
 
     result = fragment_updater.update_notes(number, notes, user)
     assert result == (updated_fragment, False)
+
+
+def test_update_conflict(fragment_updater, user, fragment_repository, changelog, when):
+    fragment = FragmentFactory.build()
+    number = fragment.number
+    updated_fragment = fragment.set_notes("Test notes")
+    when(fragment_repository).fetch_version(number).thenReturn(1)
+    when(fragment_repository).query_fields_by_museum_number(
+        number, ["notes", *RESULT_FIELDS]
+    ).thenReturn(fragment)
+    when(changelog).create(...).thenReturn()
+    when(fragment_repository).update_field("notes", updated_fragment, 1).thenRaise(
+        ConflictError
+    )
+
+    with pytest.raises(ConflictError):
+        fragment_updater.update_notes(number, "Test notes", user)
+    verify(changelog, times=0).create(...)
+
+
+@freeze_time("2018-09-07 15:41:24.032")
+def test_bulk_update_transliterations(
+    fragment_updater, user, fragment_repository, changelog, when
+):
+    fragment = FragmentFactory.build()
+    number = fragment.number
+    transliteration = TransliterationUpdate(parse_atf_lark("1. x x"), "X X")
+    updated_fragment = fragment.update_transliteration(transliteration, user)
+    when(changelog).create_many(
+        "fragments",
+        user.profile,
+        [
+            (
+                {"_id": str(number), **SCHEMA.dump(fragment)},
+                {"_id": str(number), **SCHEMA.dump(updated_fragment)},
+            )
+        ],
+    ).thenReturn([])
+    when(fragment_repository).bulk_update(
+        TRANSLITERATION_FIELDS, [updated_fragment]
+    ).thenReturn([])
+
+    assert (
+        fragment_updater.bulk_update_transliterations(
+            [(fragment, transliteration)], user
+        )
+        == []
+    )
+
+
+def test_bulk_update_collects_errors(
+    fragment_updater, user, fragment_repository, changelog, when
+):
+    fragment = FragmentFactory.build()
+    invalid_fragment = FragmentFactory.build()
+    updated_fragment = fragment.set_notes("Test notes")
+    error = DataError("Invalid notes.")
+
+    def update(fragment_: Fragment) -> Fragment:
+        if fragment_ == invalid_fragment:
+            raise error
+        return fragment_.set_notes("Test notes")
+
+    when(changelog).create_many(
+        "fragments",
+        user.profile,
+        [
+            (
+                {"_id": str(fragment.number), **SCHEMA.dump(fragment)},
+                {"_id": str(fragment.number), **SCHEMA.dump(updated_fragment)},
+            )
+        ],
+    ).thenReturn([])
+    when(fragment_repository).bulk_update(["notes"], [updated_fragment]).thenReturn([])
+
+    assert fragment_updater.bulk_update(
+        ["notes"], [(fragment, update), (invalid_fragment, update)], user
+    ) == [(invalid_fragment, error)]
+
+
+def test_bulk_update_logs_only_written_fragments(
+    fragment_updater, user, fragment_repository, changelog, when
+):
+    fragment = FragmentFactory.build()
+    missing_fragment = FragmentFactory.build()
+    updated_fragment = fragment.set_notes("Test notes")
+    updated_missing_fragment = missing_fragment.set_notes("Test notes")
+    error = NotFoundError(f"Fragment {missing_fragment.number} not found.")
+    when(fragment_repository).bulk_update(
+        ["notes"], [updated_fragment, updated_missing_fragment]
+    ).thenReturn([(updated_missing_fragment, error)])
+    when(changelog).create_many(
+        "fragments",
+        user.profile,
+        [
+            (
+                {"_id": str(fragment.number), **SCHEMA.dump(fragment)},
+                {"_id": str(fragment.number), **SCHEMA.dump(updated_fragment)},
+            )
+        ],
+    ).thenReturn([])
+
+    assert fragment_updater.bulk_update(
+        ["notes"],
+        [
+            (fragment, lambda fragment_: fragment_.set_notes("Test notes"))
+            for fragment in [fragment, missing_fragment]
+        ],
+        user,
+    ) == [(missing_fragment, error)]
@@ -0,0 +1,146 @@
+import attr
+import pytest
+
+from ebl.common.domain.scopes import Scope
+from ebl.fragmentarium.domain.record import Record, RecordEntry, RecordType
+from ebl.fragmentarium.infrastructure.fragment_views import FragmentViews
+from ebl.tests.factories.fragment import (
+    FragmentFactory,
+    TransliteratedFragmentFactory,
+)
+from ebl.transliteration.domain.museum_number import MuseumNumber
+
+
+def create_record(*entries) -> Record:
+    return Record(
+        tuple(RecordEntry(user, type_, date) for user, type_, date in entries)
+    )
+
+
+@pytest.fixture
+def views(database) -> FragmentViews:
+    return FragmentViews(database)
+
+
+def test_needs_revision(fragment_repository):
+    fragment = TransliteratedFragmentFactory.build(
+        record=create_record(
+            ("editor", RecordType.TRANSLITERATION, "2023-01-02"),
+            ("editor", RecordType.REVISION, "2023-01-03"),
+        )
+    )
+    fragment_repository.create(fragment)
+
+    [info] = fragment_repository.query_by_transliterated_not_revised_by_other()
+
+    assert (info["number"], info["editor"], info["edition_date"]) == (
+        fragment.number,
+        "editor",
+        "2023-01-02",
+    )
+
+
+def test_needs_revision_skips_revised_and_untransliterated_fragments(
+    fragment_repository,
+):
+    fragment_repository.create_many(
+        [
+            TransliteratedFragmentFactory.build(
+                record=create_record(
+                    ("editor", RecordType.TRANSLITERATION, "2023-01-02"),
+                    ("revisor", RecordType.REVISION, "2023-01-03"),
+                )
+            ),
+            FragmentFactory.build(
+                record=create_record(
+                    ("editor", RecordType.TRANSLITERATION, "2023-01-02")
+                )
+            ),
+        ]
+    )
+
+    assert fragment_repository.query_by_transliterated_not_revised_by_other() == []
+
+
+def test_needs_revision_is_sorted_by_edition_date(fragment_repository):
+    fragments = [
+        TransliteratedFragmentFactory.build(
+            number=MuseumNumber("X", str(day)),
+            record=create_record(
+                ("editor", RecordType.TRANSLITERATION, f"2023-01-0{day}")
+            ),
+        )
+        for day in [3, 1, 2]
+    ]
+    fragment_repository.create_many(fragments)
+
+    assert [
+        info["number"]
+        for info in fragment_repository.query_by_transliterated_not_revised_by_other()
+    ] == [MuseumNumber("X", str(day)) for day in [1, 2, 3]]
+
+
+def test_views_respect_scopes(fragment_repository):
+    scopes = [Scope.READ_ITALIANNINEVEH_FRAGMENTS]
+    fragment = TransliteratedFragmentFactory.build(authorized_scopes=scopes)
+    fragment_repository.create(fragment)
+
+    assert fragment_repository.query_by_transliterated_not_revised_by_other() == []
+    assert fragment_repository.query_latest().items == []
+    assert [
+        info["number"]
+        for info in fragment_repository.query_by_transliterated_not_revised_by_other(
+            scopes
+        )
+    ] == [fragment.number]
+    assert [
+        item.museum_number for item in fragment_repository.query_latest(scopes).items
+    ] == [fragment.number]
+
+
+def test_update_transliteration_updates_views(fragment_repository):
+    fragment = TransliteratedFragmentFactory.build(
+        record=create_record(("editor", RecordType.TRANSLITERATION, "2023-01-02"))
+    )
+    fragment_repository.create(fragment)
+    revised_fragment = attr.evolve(
+        fragment,
+        record=create_record(
+            ("editor", RecordType.TRANSLITERATION, "2023-01-02"),
+            ("revisor", RecordType.REVISION, "2023-01-03"),
+        ),
+    )
+
+    fragment_repository.update_field("transliteration", revised_fragment)
+
+    assert fragment_repository.query_by_transliterated_not_revised_by_other() == []
+
+
+def test_update_projection_keeps_views(fragment_repository):
+    fragment = TransliteratedFragmentFactory.build(
+        record=create_record(("editor", RecordType.TRANSLITERATION, "2023-01-02"))
+    )
+    fragment_repository.create(fragment)
+    projection = fragment_repository.query_fields_by_museum_number(
+        fragment.number, ["script"]
+    )
+
+    fragment_repository.update_field("script", projection.set_script(fragment.script))
+
+    [info] = fragment_repository.query_by_transliterated_not_revised_by_other()
+    assert (info["number"], info["editor"]) == (fragment.number, "editor")
+
+
+def test_rebuild(fragment_repository, views, database):
+    fragment = TransliteratedFragmentFactory.build()
+    fragment_repository.create(fragment)
+    expected = fragment_repository.query_latest()
+    database["latest_transliterations"].delete_many({})
+    database["fragments_needing_revision"].insert_one({"_id": "stale"})
+
+    views.rebuild()
+
+    assert fragment_repository.query_latest() == expected
+    assert [
+        document["_id"] for document in database["fragments_needing_revision"].find()
+    ] == [str(fragment.number)]
@@ -485,3 +485,18 @@ def test_query_latest(client, fragmentarium):
 
     assert result.status == falcon.HTTP_OK
     assert result.json == expected
+
+
+def test_search_fragments_by_numbers(client, fragmentarium):
+    first = FragmentFactory.build(number=MuseumNumber.of("X.1"))
+    second = FragmentFactory.build(number=MuseumNumber.of("X.2"))
+    fragmentarium.create(first)
+    fragmentarium.create(second)
+
+    result = client.simulate_get("/fragments", params={"numbers": "X.2,X.3,X.1"})
+
+    assert result.status == falcon.HTTP_OK
+    assert [fragment["museumNumber"] for fragment in result.json] == [
+        MuseumNumberSchema().dump(second.number),
+        MuseumNumberSchema().dump(first.number),
+    ]
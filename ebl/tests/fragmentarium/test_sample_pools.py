@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from ebl.common.domain.scopes import Scope
+from ebl.fragmentarium.infrastructure.queries import match_random
+from ebl.fragmentarium.infrastructure.sample_pools import SamplePools, find_pools
+from ebl.tests.factories.fragment import (
+    FragmentFactory,
+    TransliteratedFragmentFactory,
+)
+from ebl.transliteration.domain.museum_number import MuseumNumber
+from ebl.transliteration.infrastructure.collections import FRAGMENTS_COLLECTION
+
+
+class Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def sample_pools(database, clock) -> SamplePools:
+    return SamplePools(database, refresh_seconds=60, clock=clock)
+
+
+def create_transliterated(fragment_repository, number: str, **kwargs) -> str:
+    fragment = TransliteratedFragmentFactory.build(
+        number=MuseumNumber.of(number), **kwargs
+    )
+    fragment_repository.create(fragment)
+    return str(fragment.number)
+
+
+def test_pick(sample_pools, fragment_repository):
+    fragment_repository.create(FragmentFactory.build())
+    id_ = create_transliterated(fragment_repository, "Z.1")
+
+    assert sample_pools.pick("random", match_random()) == id_
+
+
+def test_pick_from_empty_pool(sample_pools):
+    assert sample_pools.pick("random", match_random()) is None
+
+
+def test_pools_are_kept_per_scopes(sample_pools, fragment_repository):
+    scopes = [Scope.READ_ITALIANNINEVEH_FRAGMENTS]
+    id_ = create_transliterated(fragment_repository, "Z.1", authorized_scopes=scopes)
+
+    assert sample_pools.pick("random", match_random()) is None
+    assert sample_pools.pick("random", match_random(scopes), scopes) == id_
+
+
+def test_pool_is_refreshed_after_timeout(sample_pools, fragment_repository, clock):
+    sample_pools.pick("random", match_random())
+    id_ = create_transliterated(fragment_repository, "Z.1")
+
+    assert sample_pools.pick("random", match_random()) is None
+
+    clock.time = 61
+
+    assert sample_pools.pick("random", match_random()) == id_
+
+
+def test_pool_is_refreshed_after_invalidate(sample_pools, fragment_repository):
+    sample_pools.pick("random", match_random())
+    id_ = create_transliterated(fragment_repository, "Z.1")
+
+    sample_pools.invalidate(["random"])
+
+    assert sample_pools.pick("random", match_random()) == id_
+
+
+def test_invalidate_only_affects_given_pools(sample_pools, fragment_repository):
+    sample_pools.pick("random", match_random())
+    create_transliterated(fragment_repository, "Z.1")
+
+    sample_pools.invalidate(["pioneers"])
+
+    assert sample_pools.pick("random", match_random()) is None
+
+
+def test_stale_pool_is_served_while_rebuilt(
+    sample_pools, fragment_repository, database
+):
+    id_ = create_transliterated(fragment_repository, "Z.1")
+    sample_pools.pick("random", match_random())
+    database[FRAGMENTS_COLLECTION].delete_one({"_id": id_})
+
+    sample_pools.invalidate(["random"])
+
+    assert sample_pools.pick("random", match_random()) == id_
+    for _ in range(100):
+        if sample_pools.pick("random", match_random()) is None:
+            break
+        time.sleep(0.01)
+    assert sample_pools.pick("random", match_random()) is None
+
+
+def test_find_pools():
+    assert find_pools(["notes"]) == ["pioneers"]
+    assert find_pools(["transliteration"]) == ["random", "pioneers"]
+    assert find_pools(["genres"]) == []
@@ -16,11 +16,16 @@ from ebl.io.fragments.importer import (
     validate_id,
     ensure_unique,
     write_to_db,
+    update_neighbours,
+    update_views,
     update_sort_keys,
 )
 from ebl.mongo_collection import MongoCollection
 
-from ebl.tests.factories.fragment import LemmatizedFragmentFactory
+from ebl.tests.factories.fragment import (
+    LemmatizedFragmentFactory,
+    TransliteratedFragmentFactory,
+)
 from ebl.transliteration.domain.museum_number import MuseumNumber
 
 
@@ -207,3 +212,40 @@ def test_update_sort_index(fragment, fragment_repository, fragments_collection):
     assert [("_sortKey", pymongo.ASCENDING)] in [
         index["key"] for index in fragments_collection.index_information().values()
     ]
+
+
+def test_update_neighbours(fragment, database, fragments_collection):
+    numbers = [3, 1, 2]
+    fragments_collection.insert_many(
+        [
+            {
+                "_id": f"X.{i}",
+                **FragmentSchema(exclude=["joins"]).dump(
+                    attr.evolve(fragment, number=MuseumNumber.of(f"X.{i}"))
+                ),
+            }
+            for i in numbers
+        ]
+    )
+
+    update_neighbours(database)
+
+    neighbours = database["fragment_neighbours"].find_one(
+        {"value.museumNumber.number": "1"}
+    )
+    assert neighbours["previous"]["museumNumber"]["number"] == "3"
+    assert neighbours["next"]["museumNumber"]["number"] == "2"
+
+
+def test_update_views(database, fragments_collection):
+    fragment = TransliteratedFragmentFactory.build()
+    fragments_collection.insert_one(
+        {
+            "_id": str(fragment.number),
+            **FragmentSchema(exclude=["joins"]).dump(fragment),
+        }
+    )
+
+    update_views(database)
+
+    assert database["latest_transliterations"].find_one()["_id"] == str(fragment.number)
@@ -13,3 +13,19 @@ def test_create(database, changelog, user, make_changelog_entry):
     entry_id = changelog.create(RESOURCE_TYPE, user.profile, OLD, NEW)
     expected = make_changelog_entry(RESOURCE_TYPE, RESOURCE_ID, OLD, NEW)
     assert database[COLLECTION].find_one({"_id": entry_id}, {"_id": 0}) == expected
+
+
+@freeze_time("2018-09-07 15:41:24.032")
+def test_create_many(database, changelog, user, make_changelog_entry):
+    other_old = {**OLD, "_id": "other"}
+    other_new = {**NEW, "_id": "other"}
+
+    changelog.create_many(
+        RESOURCE_TYPE, user.profile, [(OLD, NEW), (other_old, other_new)]
+    )
+
+    assert list(database[COLLECTION].find({}, {"_id": 0})) == [
+        make_changelog_entry(RESOURCE_TYPE, RESOURCE_ID, OLD, NEW),
+        make_changelog_entry(RESOURCE_TYPE, "other", other_old, other_new),
+    ]
+    assert changelog.create_many(RESOURCE_TYPE, user.profile, []) == []
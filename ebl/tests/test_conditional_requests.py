@@ -0,0 +1,72 @@
+import falcon
+import pytest
+from falcon import testing
+
+from ebl.conditional_requests import ConditionalRequestMiddleware
+
+RESOURCE_TYPE = "documents"
+
+
+class VersionedResource:
+    def __init__(self):
+        self.calls = 0
+
+    def get_version_id(self, _req, params):
+        return RESOURCE_TYPE, params["id_"]
+
+    def on_get(self, _req, resp, id_):
+        self.calls += 1
+        resp.media = {"id": id_}
+
+
+@pytest.fixture
+def resource():
+    return VersionedResource()
+
+
+@pytest.fixture
+def conditional_client(versions, resource):
+    api = falcon.App(middleware=[ConditionalRequestMiddleware(versions)])
+    api.add_route("/documents/{id_}", resource)
+    return testing.TestClient(api)
+
+
+def test_sets_etag(conditional_client):
+    result = conditional_client.simulate_get("/documents/1")
+
+    assert result.status == falcon.HTTP_OK
+    assert result.headers["ETag"]
+
+
+def test_not_modified(conditional_client, resource):
+    etag = conditional_client.simulate_get("/documents/1").headers["ETag"]
+
+    result = conditional_client.simulate_get(
+        "/documents/1", headers={"If-None-Match": etag}
+    )
+
+    assert result.status == falcon.HTTP_NOT_MODIFIED
+    assert result.headers["ETag"] == etag
+    assert resource.calls == 1
+
+
+def test_modified_after_increment(conditional_client, versions):
+    etag = conditional_client.simulate_get("/documents/1").headers["ETag"]
+    versions.increment(RESOURCE_TYPE, "1")
+
+    result = conditional_client.simulate_get(
+        "/documents/1", headers={"If-None-Match": etag}
+    )
+
+    assert result.status == falcon.HTTP_OK
+    assert result.headers["ETag"] != etag
+
+
+def test_etag_depends_on_query(conditional_client):
+    etag = conditional_client.simulate_get("/documents/1").headers["ETag"]
+
+    result = conditional_client.simulate_get(
+        "/documents/1", params={"lines": "1"}, headers={"If-None-Match": etag}
+    )
+
+    assert result.status == falcon.HTTP_OK
@@ -1,4 +1,5 @@
 import pytest
+from pymongo import DeleteOne, UpdateOne
 
 from ebl.errors import DuplicateError, NotFoundError
 from ebl.mongo_collection import MongoCollection
@@ -115,6 +116,23 @@ def test_update(collection):
     }
 
 
+def test_find_one_and_update(collection):
+    insert_id = collection.insert_one({"data": "payload"})
+
+    assert collection.find_one_and_update(
+        {"_id": insert_id}, {"$set": {"data": "updated payload"}}
+    ) == {"_id": insert_id, "data": "payload"}
+    assert collection.find_one_by_id(insert_id) == {
+        "_id": insert_id,
+        "data": "updated payload",
+    }
+
+
+def test_find_one_and_update_document_not_found(collection):
+    with pytest.raises(NotFoundError):
+        collection.find_one_and_update({}, {"$set": {"data": "not found"}})
+
+
 def test_update_many(collection):
     documents = [{"data": "payload"}, {"data": "payload2"}]
     insert_ids = collection.insert_many(documents)
@@ -153,3 +171,18 @@ def test_count(collection):
     collection.insert_one({"data": "another payload"})
 
     assert collection.count_documents({"data": "payload"}) == 2
+
+
+def test_bulk_write(collection):
+    insert_ids = collection.insert_many([{"data": "payload"}, {"data": "payload2"}])
+    collection.bulk_write(
+        [
+            UpdateOne({"_id": insert_ids[0]}, {"$set": {"data": "updated payload"}}),
+            DeleteOne({"_id": insert_ids[1]}),
+        ],
+        ordered=False,
+    )
+
+    assert list(collection.find_many({})) == [
+        {"_id": insert_ids[0], "data": "updated payload"}
+    ]
@@ -0,0 +1,45 @@
+from ebl.versions import Version
+
+RESOURCE_TYPE = "type"
+RESOURCE_ID = "id"
+
+
+def test_find_unversioned(versions):
+    assert versions.find(RESOURCE_TYPE, RESOURCE_ID) == Version(
+        RESOURCE_TYPE, RESOURCE_ID
+    )
+
+
+def test_increment(versions):
+    versions.increment(RESOURCE_TYPE, RESOURCE_ID)
+    versions.increment(RESOURCE_TYPE, RESOURCE_ID)
+
+    version = versions.find(RESOURCE_TYPE, RESOURCE_ID)
+    assert version.version == 2
+    assert version.modified is not None
+
+
+def test_increment_many(versions):
+    versions.increment(RESOURCE_TYPE, RESOURCE_ID)
+    versions.increment_many(RESOURCE_TYPE, [RESOURCE_ID, "other"])
+
+    assert versions.find(RESOURCE_TYPE, RESOURCE_ID).version == 2
+    assert versions.find(RESOURCE_TYPE, "other").version == 1
+
+
+def test_increment_if(versions):
+    assert versions.increment_if(RESOURCE_TYPE, RESOURCE_ID, 0) is True
+    assert versions.increment_if(RESOURCE_TYPE, RESOURCE_ID, 1) is True
+    assert versions.increment_if(RESOURCE_TYPE, RESOURCE_ID, 1) is False
+    assert versions.increment_if(RESOURCE_TYPE, RESOURCE_ID, 0) is False
+    assert versions.find(RESOURCE_TYPE, RESOURCE_ID).version == 2
+
+
+def test_etag_changes_with_version():
+    version = Version(RESOURCE_TYPE, RESOURCE_ID, 1)
+
+    assert version.create_etag("/uri") == version.create_etag("/uri")
+    assert version.create_etag("/uri") != version.create_etag("/other")
+    assert version.create_etag("/uri") != Version(
+        RESOURCE_TYPE, RESOURCE_ID, 2
+    ).create_etag("/uri")
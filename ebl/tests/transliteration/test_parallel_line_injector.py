@@ -1,5 +1,6 @@
 import attr
 import pytest
+from mockito import verify
 from ebl.errors import NotFoundError
 from ebl.tests.factories.fragment import TransliteratedFragmentFactory
 from ebl.tests.factories.ids import ChapterNameFactory
@@ -44,6 +45,21 @@ def test_inject_parallel_text_implicit_chapter(
     )
 
 
+def test_inject_transliterations_looks_up_repeated_parallels_once(
+    parallel_repository, parallel_line_injector, when
+):
+    line: ParallelFragment = ParallelFragmentFactory.build()
+    text = TransliteratedFragmentFactory.build().text
+    text = attr.evolve(text, lines=(line, line))
+    when(parallel_repository).fragment_exists(line.museum_number).thenReturn(True)
+
+    assert (
+        parallel_line_injector.inject_transliterations([text, text])
+        == [attr.evolve(text, lines=(attr.evolve(line, exists=True),) * 2)] * 2
+    )
+    verify(parallel_repository, 1).fragment_exists(line.museum_number)
+
+
 def test_inject_parallel_text_implicit_chapter_not_found(
     parallel_repository, parallel_line_injector, when
 ):
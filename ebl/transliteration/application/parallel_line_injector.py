@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from functools import singledispatchmethod
-from typing import Sequence, TypeVar
+from typing import Dict, List, Sequence, TypeVar, Union
 
 import attr
 
@@ -29,6 +29,42 @@ class ParallelRepository(ABC):
     def chapter_exists(self, text_id: TextId, chapter_name: ChapterName) -> bool: ...
 
 
+class BatchParallelRepository(ParallelRepository):
+    """Remembers the lookups of a batch so that repeated parallels are looked up once."""
+
+    def __init__(self, repository: ParallelRepository):
+        self._repository = repository
+        self._fragments: Dict[MuseumNumber, bool] = {}
+        self._implicit_chapters: Dict[TextId, Union[ChapterName, NotFoundError]] = {}
+        self._chapters: Dict[tuple, bool] = {}
+
+    def fragment_exists(self, museum_number: MuseumNumber) -> bool:
+        if museum_number not in self._fragments:
+            self._fragments[museum_number] = self._repository.fragment_exists(
+                museum_number
+            )
+        return self._fragments[museum_number]
+
+    def find_implicit_chapter(self, text_id: TextId) -> ChapterName:
+        if text_id not in self._implicit_chapters:
+            try:
+                self._implicit_chapters[text_id] = (
+                    self._repository.find_implicit_chapter(text_id)
+                )
+            except NotFoundError as error:
+                self._implicit_chapters[text_id] = error
+        result = self._implicit_chapters[text_id]
+        if isinstance(result, NotFoundError):
+            raise result
+        return result
+
+    def chapter_exists(self, text_id: TextId, chapter_name: ChapterName) -> bool:
+        key = (text_id, chapter_name)
+        if key not in self._chapters:
+            self._chapters[key] = self._repository.chapter_exists(text_id, chapter_name)
+        return self._chapters[key]
+
+
 class ParallelLineInjector:
     _repository: ParallelRepository
 
@@ -41,6 +77,13 @@ class ParallelLineInjector:
     def inject_transliteration(self, transliteration: Text) -> Text:
         return attr.evolve(transliteration, lines=self.inject(transliteration.lines))
 
+    def inject_transliterations(self, transliterations: Sequence[Text]) -> List[Text]:
+        injector = ParallelLineInjector(BatchParallelRepository(self._repository))
+        return [
+            injector.inject_transliteration(transliteration)
+            for transliteration in transliterations
+        ]
+
     @singledispatchmethod
     def _inject_line(self, line: T) -> T:
         return line
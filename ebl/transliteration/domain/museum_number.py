@@ -47,8 +47,7 @@ class MuseumNumber:
 
     def __lt__(self, other):
         return (
-            (*self._prefix_order, *self._number_order, *self._suffix_order)
-            < (*other._prefix_order, *other._number_order, *other._suffix_order)
+            self.order < other.order
             if isinstance(other, MuseumNumber)
             else NotImplemented
         )
@@ -70,6 +69,10 @@ class MuseumNumber:
             else NotImplemented
         )
 
+    @property
+    def order(self) -> tuple:
+        return (*self._prefix_order, *self._number_order, *self._suffix_order)
+
     @property
     def _prefix_order(self) -> Tuple[int, int, str]:
         return (
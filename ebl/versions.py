@@ -0,0 +1,91 @@
+import datetime
+import hashlib
+from typing import Iterable, Optional
+
+import attr
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from ebl.mongo_collection import MongoCollection
+
+COLLECTION = "versions"
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Version:
+    resource_type: str
+    resource_id: str
+    version: int = 0
+    modified: Optional[datetime.datetime] = None
+
+    def create_etag(self, *variant: str) -> str:
+        """Create a strong ETag for a representation of the resource."""
+        key = "\n".join(
+            [self.resource_type, self.resource_id, str(self.version), *variant]
+        )
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def create_id(resource_type: str, resource_id: str) -> str:
+    return f"{resource_type}/{resource_id}"
+
+
+def _create_increment() -> dict:
+    return {
+        "$inc": {"version": 1},
+        "$set": {"modified": datetime.datetime.now(datetime.timezone.utc)},
+    }
+
+
+class Versions:
+    """Counts the updates of documents so that clients can revalidate them."""
+
+    def __init__(self, database):
+        self._collection = MongoCollection(database, COLLECTION)
+
+    def find(self, resource_type: str, resource_id: str) -> Version:
+        document = next(
+            self._collection.find_many(
+                {"_id": create_id(resource_type, resource_id)}
+            ).limit(1),
+            None,
+        )
+        return (
+            Version(resource_type, resource_id)
+            if document is None
+            else Version(
+                resource_type,
+                resource_id,
+                document["version"],
+                document["modified"],
+            )
+        )
+
+    def increment(self, resource_type: str, resource_id: str) -> None:
+        self._collection.update_many(
+            {"_id": create_id(resource_type, resource_id)},
+            _create_increment(),
+            upsert=True,
+        )
+
+    def increment_if(self, resource_type: str, resource_id: str, version: int) -> bool:
+        """Increment the version only if it is still the given one."""
+        try:
+            result = self._collection.update_many(
+                {"_id": create_id(resource_type, resource_id), "version": version},
+                _create_increment(),
+                upsert=version == 0,
+            )
+        except DuplicateKeyError:
+            return False
+        return result.matched_count > 0 or result.upserted_id is not None
+
+    def increment_many(self, resource_type: str, resource_ids: Iterable[str]) -> None:
+        increment = _create_increment()
+        if requests := [
+            UpdateOne(
+                {"_id": create_id(resource_type, resource_id)}, increment, upsert=True
+            )
+            for resource_id in resource_ids
+        ]:
+            self._collection.bulk_write(requests, ordered=False)